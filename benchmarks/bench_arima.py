@@ -0,0 +1,71 @@
+"""
+Benchmark de la mise à jour incrémentale d'ARIMAStrategy par rapport à la ré-estimation à chaque date.
+
+Les paramètres étant figés entre deux ré-estimations, l'accélération se paie en précision : la corrélation
+des prévisions avec la ré-estimation à chaque date diminue quand refit_interval augmente (forecast_correlation).
+
+Usage : python -m benchmarks.bench_arima --bars 250 --refit-interval 20
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from strategies.arima import ARIMAStrategy
+from data.loader import load_market_data
+
+DEFAULT_DATA = "data/SP500_1d_2010-06-2029_2024-12-27.csv"
+
+def load_close(path: str) -> pd.DataFrame:
+    return load_market_data(path)[['close']]
+
+def run_forecasts(strategy: ARIMAStrategy, data: pd.DataFrame, start: int) -> tuple:
+    """
+    Appelle get_position sur chaque date à partir de start et renvoie les prévisions et le temps écoulé
+    """
+    forecasts = []
+    elapsed = time.perf_counter()
+    for i in range(start, len(data) + 1):
+        strategy.get_position(data.iloc[:i], 0.0)
+        forecasts.append(strategy.last_forecast)
+    elapsed = time.perf_counter() - elapsed
+    return np.array(forecasts), elapsed
+
+def benchmark(data: pd.DataFrame, bars: int, window_size: int, order: tuple, refit_interval: int) -> dict:
+    data = data.iloc[:window_size + 1 + bars]
+    start = window_size + 1
+
+    results = {}
+    forecasts = {}
+    for mode, interval in [('refit', None), ('incremental', refit_interval)]:
+        strategy = ARIMAStrategy(window_size=window_size, refit_interval=interval)
+        strategy.best_order = order
+        strategy.is_fitted = True
+        forecasts[mode], results[f'{mode}_seconds'] = run_forecasts(strategy, data, start)
+
+    difference = forecasts['incremental'] - forecasts['refit']
+    results.update({
+        'bars': bars,
+        'refit_interval': refit_interval,
+        'speedup': results['refit_seconds'] / results['incremental_seconds'],
+        'max_abs_forecast_diff': float(np.max(np.abs(difference))),
+        'forecast_std': float(np.std(forecasts['refit'])),
+        'forecast_correlation': float(np.corrcoef(forecasts['refit'], forecasts['incremental'])[0, 1]),
+        'sign_agreement': float(np.mean(np.sign(forecasts['refit']) == np.sign(forecasts['incremental'])))
+    })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--data', default=DEFAULT_DATA)
+    parser.add_argument('--bars', type=int, default=250)
+    parser.add_argument('--window-size', type=int, default=252)
+    parser.add_argument('--order', type=int, nargs=3, default=(1, 0, 1))
+    parser.add_argument('--refit-interval', type=int, default=20)
+    args = parser.parse_args()
+
+    results = benchmark(load_close(args.data), args.bars, args.window_size, tuple(args.order), args.refit_interval)
+    for name, value in results.items():
+        print(f"{name:>24}: {value:.6g}")
+
+if __name__ == '__main__':
+    main()
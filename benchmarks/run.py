@@ -0,0 +1,142 @@
+"""
+Exécute la suite de benchmarks sur les fichiers de data/ et sur des séries synthétiques de taille croissante,
+puis enregistre les temps au format JSON pour suivre les régressions et les courbes de passage à l'échelle.
+
+Usage : python -m benchmarks.run --sizes 10000 100000 1000000 --repeat 3 --compare benchmarks/results/<ancien>.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from benchmarks.suite import SYNTHETIC_SIZES, benchmark_cases, real_datasets, synthetic_datasets
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Chronomètre repeat appels de func et renvoie le minimum, la médiane, la moyenne et le maximum en secondes
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {
+        'min': min(times),
+        'median': float(np.median(times)),
+        'mean': float(np.mean(times)),
+        'max': max(times),
+        'repeat': repeat
+    }
+
+def git_revision() -> Dict[str, Optional[str]]:
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {'commit': git('rev-parse', 'HEAD'), 'dirty': bool(status) if status is not None else None}
+
+def environment() -> Dict[str, object]:
+    try:
+        import numba
+        numba_version = numba.__version__
+    except ImportError:
+        numba_version = None
+    return {
+        **git_revision(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'numba': numba_version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+def scaling_exponents(results: List[Dict[str, object]]) -> Dict[str, float]:
+    """
+    Pente de log(temps médian) en fonction de log(nombre de dates) sur les séries synthétiques :
+    environ 1 pour un coût linéaire
+    """
+    curves: Dict[str, List[tuple]] = {}
+    for entry in results:
+        if entry['dataset'].startswith('synthetic_') and 'seconds' in entry:
+            curves.setdefault(f"{entry['group']}.{entry['name']}", []).append(
+                (entry['bars'], entry['seconds']['median']))
+    return {
+        name: float(np.polyfit(np.log([bars for bars, _ in points]), np.log([t for _, t in points]), 1)[0])
+        for name, points in curves.items() if len(points) > 1
+    }
+
+def run_suite(datasets: Dict[str, pd.DataFrame], repeat: int, pattern: Optional[str] = None) -> List[Dict[str, object]]:
+    results = []
+    for case in benchmark_cases():
+        full_name = f'{case.group}.{case.name}'
+        if pattern is not None and pattern not in full_name:
+            continue
+        for dataset_name, data in datasets.items():
+            entry = {'group': case.group, 'name': case.name, 'dataset': dataset_name, 'bars': len(data)}
+            if case.max_bars is not None and len(data) > case.max_bars:
+                entry['skipped'] = f'more than {case.max_bars} bars'
+            else:
+                entry['seconds'] = measure(case.setup(data), repeat)
+                entry['bars_per_second'] = len(data) / entry['seconds']['min']
+                print(f"{full_name:<40} {dataset_name:<45} {entry['seconds']['median']:>10.4f} s")
+            results.append(entry)
+    return results
+
+def compare(results: List[Dict[str, object]], baseline_path: str) -> None:
+    """
+    Affiche le rapport des temps médians avec ceux d'un fichier de résultats précédent (> 1 : plus lent)
+    """
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    reference = {(entry['group'], entry['name'], entry['dataset'], entry['bars']): entry['seconds']['median']
+                 for entry in baseline['results'] if 'seconds' in entry}
+    print(f"\nComparison with {baseline_path} (commit {baseline['environment'].get('commit')})")
+    for entry in results:
+        key = (entry['group'], entry['name'], entry['dataset'], entry['bars'])
+        if 'seconds' in entry and key in reference:
+            ratio = entry['seconds']['median'] / reference[key]
+            print(f"{entry['group'] + '.' + entry['name']:<40} {entry['dataset']:<45} {ratio:>8.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='*', default=list(SYNTHETIC_SIZES),
+                        help="tailles des séries synthétiques")
+    parser.add_argument('--no-real-data', action='store_true', help="ignore les fichiers CSV de data/")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--filter', default=None, help="ne lance que les cas dont le nom contient ce texte")
+    parser.add_argument('--output', default=None, help="fichier JSON (par défaut benchmarks/results/<date>_<commit>.json)")
+    parser.add_argument('--compare', default=None, help="fichier JSON de référence")
+    args = parser.parse_args()
+
+    datasets = {} if args.no_real_data else real_datasets()
+    datasets.update(synthetic_datasets(args.sizes))
+
+    env = environment()
+    results = run_suite(datasets, args.repeat, args.filter)
+    report = {'environment': env, 'results': results, 'scaling': scaling_exponents(results)}
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = env['date'].replace(':', '').replace('-', '')
+        output = os.path.join(RESULTS_DIR, f"{stamp}_{(env['commit'] or 'unknown')[:10]}.json")
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare is not None:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""
+Cas de benchmark des chemins critiques : Backtester.run pour chaque stratégie fournie,
+Result.calculate_nav, le calcul des métriques et les callbacks de l'interface Dash.
+Chaque cas prépare ses objets une fois par jeu de données et renvoie la fonction chronométrée.
+"""
+import base64
+import glob
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from main.backtester import Backtester, FREQ_MAP
+from main.result import Result
+from strategies import (
+    MovingAverageCrossover,
+    RSIStrategy,
+    LinearTrendStrategy,
+    ARIMAStrategy,
+    CompiledMACrossover,
+    CompiledRSI
+)
+from data.loader import load_market_data
+
+try:
+    from dash_interface import app as dash_app
+except ImportError:
+    dash_app = None
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+SYNTHETIC_SIZES = (10_000, 100_000, 1_000_000)
+
+@dataclass
+class BenchmarkCase:
+    """
+    Cas de benchmark : setup(data) prépare les objets nécessaires et renvoie la fonction chronométrée.
+    Les jeux de données de plus de max_bars dates sont ignorés (cas trop lents pour être chronométrés).
+    """
+    group: str
+    name: str
+    setup: Callable[[pd.DataFrame], Callable[[], object]]
+    max_bars: Optional[int] = None
+
+def synthetic_ohlcv(bars: int, freq: str = 'h', seed: int = 0) -> pd.DataFrame:
+    """
+    Série OHLCV synthétique (mouvement brownien géométrique) de bars dates à la fréquence freq
+
+    Parameters
+    ----------
+    bars: int
+        nombre de dates
+    freq: str
+        fréquence des dates (horaire par défaut pour que 1M de dates reste dans les bornes de Timestamp)
+    seed: int
+        graine du générateur aléatoire
+
+    Returns
+    ----------
+    DataFrame
+        colonnes open, high, low, close et volume indexées par 'timestamp'
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.005, bars)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.002, bars)) * close
+    index = pd.date_range(start='2000-01-03', periods=bars, freq=freq, name='timestamp')
+
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.lognormal(10, 1, bars)
+    }, index=index)
+
+def real_datasets(data_dir: str = DATA_DIR) -> Dict[str, pd.DataFrame]:
+    """
+    Fichiers CSV de data/ (hors fichiers de test), chargés avec le cache du loader
+    """
+    paths = sorted(path for path in glob.glob(os.path.join(data_dir, '*.csv'))
+                   if not os.path.basename(path).startswith('test_'))
+    return {os.path.splitext(os.path.basename(path))[0]: load_market_data(path) for path in paths}
+
+def synthetic_datasets(sizes=SYNTHETIC_SIZES) -> Dict[str, pd.DataFrame]:
+    return {f'synthetic_{bars}': synthetic_ohlcv(bars) for bars in sizes}
+
+def rebalancing_frequency(data: pd.DataFrame) -> str:
+    """
+    Fréquence de rebalancement égale à l'écart médian entre deux dates (quotidienne à défaut),
+    pour que les stratégies utilisent leur version vectorisée
+    """
+    if len(data) < 2:
+        return 'D'
+    minutes = np.median(np.diff(data.index.values).astype('timedelta64[m]').astype(np.int64))
+    for name, freq in FREQ_MAP.items():
+        if Backtester._freq_to_minutes(freq) == minutes:
+            return name
+    return 'D'
+
+def _backtester(data: pd.DataFrame) -> Backtester:
+    return Backtester(data.copy(), rebalancing_frequency=rebalancing_frequency(data))
+
+def _run(strategy_factory: Callable[[], object]) -> Callable[[pd.DataFrame], Callable[[], object]]:
+    def setup(data: pd.DataFrame) -> Callable[[], object]:
+        backtester = _backtester(data)
+        return lambda: backtester.run(strategy_factory())
+    return setup
+
+def _run_compiled(strategy_factory: Callable[[], object]) -> Callable[[pd.DataFrame], Callable[[], object]]:
+    def setup(data: pd.DataFrame) -> Callable[[], object]:
+        backtester = _backtester(data)
+        # Compilation numba effectuée hors chronométrage
+        backtester.run_compiled(strategy_factory())
+        return lambda: backtester.run_compiled(strategy_factory())
+    return setup
+
+def _result(data: pd.DataFrame) -> Result:
+    return _backtester(data).run(MovingAverageCrossover())
+
+def _calculate_nav(data: pd.DataFrame) -> Callable[[], object]:
+    return _result(data).calculate_nav
+
+def _new_result(data: pd.DataFrame) -> Callable[[], Result]:
+    # Métriques et registre des transactions étant mémorisés, chaque répétition utilise un nouveau Result
+    # construit à partir des positions et de la NAV du backtest (calcul de la NAV hors chronométrage)
+    result = _result(data)
+    positions, nav = result.positions, result.nav.values
+    return lambda: Result(positions, result.data, result.initial_capital, result.commission,
+                          result.slippage, precomputed_nav=nav)
+
+def _all_metrics(data: pd.DataFrame) -> Callable[[], object]:
+    new_result = _new_result(data)
+    return lambda: new_result().get_all_metrics()
+
+def _essential_metrics(data: pd.DataFrame) -> Callable[[], object]:
+    new_result = _new_result(data)
+    return lambda: new_result().get_essential_metrics()
+
+def _upload_contents(data: pd.DataFrame) -> str:
+    return 'data:text/csv;base64,' + base64.b64encode(data.to_csv().encode()).decode()
+
+def _dash_store_data(data: pd.DataFrame) -> Callable[[], object]:
+    contents = _upload_contents(data)
+    return lambda: dash_app.store_data(contents, 'benchmark.csv')
+
+def _dash_state(data: pd.DataFrame) -> tuple:
+    stored_data = dash_app.store_data(_upload_contents(data), 'benchmark.csv')[1]
+    return stored_data, (10000, 0.1, 0.0, rebalancing_frequency(data))
+
+def _dash_metrics_table(data: pd.DataFrame) -> Callable[[], object]:
+    stored_data, settings = _dash_state(data)
+    def update():
+        # Cache vidé : le callback exécute les backtests comme lors d'un premier clic
+        dash_app.RESULT_CACHE.clear()
+        return dash_app.update_metrics_table(1, stored_data, 'all', ['MA Crossover', 'RSI'],
+                                             [20, 50, 14, 70, 30], *settings)
+    return update
+
+def _dash_strategy_graph(data: pd.DataFrame) -> Callable[[], object]:
+    stored_data, settings = _dash_state(data)
+    graph_id = {'type': 'strategy-graph', 'strategy': 'MA Crossover'}
+    def update():
+        dash_app.RESULT_CACHE.clear()
+        return dash_app.update_strategy_graph(1, 'nav', stored_data, ['MA Crossover'], [20, 50],
+                                              *settings, graph_id)
+    return update
+
+def benchmark_cases() -> List[BenchmarkCase]:
+    """
+    Liste des cas de benchmark ; les callbacks Dash ne sont inclus que si dash est installé
+    """
+    cases = [
+        BenchmarkCase('backtest', 'run[MA Crossover]', _run(MovingAverageCrossover)),
+        BenchmarkCase('backtest', 'run[RSI]', _run(RSIStrategy)),
+        BenchmarkCase('backtest', 'run[Linear Trend]', _run(LinearTrendStrategy)),
+        BenchmarkCase('backtest', 'run[ARIMA]',
+                      _run(lambda: ARIMAStrategy(refit_interval=20, order_cache_dir=None)), max_bars=2_000),
+        BenchmarkCase('backtest', 'run_compiled[MA Crossover]', _run_compiled(CompiledMACrossover)),
+        BenchmarkCase('backtest', 'run_compiled[RSI]', _run_compiled(CompiledRSI)),
+        BenchmarkCase('result', 'calculate_nav', _calculate_nav),
+        BenchmarkCase('result', 'get_essential_metrics', _essential_metrics),
+        BenchmarkCase('result', 'get_all_metrics', _all_metrics)
+    ]
+    if dash_app is not None:
+        cases += [
+            BenchmarkCase('dash', 'store_data', _dash_store_data),
+            BenchmarkCase('dash', 'update_metrics_table', _dash_metrics_table),
+            BenchmarkCase('dash', 'update_strategy_graph', _dash_strategy_graph)
+        ]
+    return cases
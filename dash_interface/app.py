@@ -1,7 +1,8 @@
-from dash import Dash, html, dcc, Input, Output, State, callback, ALL, MATCH, ctx #type: ignore
+from dash import Dash, html, dcc, Input, Output, State, callback, ALL, MATCH #type: ignore
 import dash_bootstrap_components as dbc #type: ignore
 import pandas as pd
 import plotly.graph_objects as go #type: ignore
+import atexit
 import base64
 import io
 
@@ -11,7 +12,10 @@ from strategies.RSI import rsi_strategy
 from strategies.arima import ARIMAStrategy
 from strategies.linear_trend import LinearTrendStrategy
 from main.backtester import Backtester
+from data.loader import read_market_data
 from dash_interface.layout import create_layout
+from dash_interface.cache import ResultCache, result_key
+from dash_interface.datastore import DatasetStore, DatasetExpiredError
 
 app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 app.title = "Backtesting Framework Interface"
@@ -24,10 +28,56 @@ STRATEGIES = {
     'Linear Trend': LinearTrendStrategy
 }
 
+STRATEGY_PARAMS = {
+    'MA Crossover': {'short_window': int, 'long_window': int},
+    'RSI': {'rsi_period': int, 'overbought': float, 'oversold': float},
+    'ARIMA': {'window_size': int, 'threshold': float},
+    'Linear Trend': {'window_size': int, 'trend_threshold': float}
+}
+
+RESULT_CACHE = ResultCache()
+# Set to True to record stage timings (Result.timings) for every backtest run from the interface
+PROFILE_BACKTESTS = False
+DATASET_STORE = DatasetStore()
+atexit.register(DATASET_STORE.close)
+
+def parse_strategy_params(selected_strategies, param_values):
+    """Maps the flat list of parameter inputs to the parameters of each selected strategy"""
+    strategies_params = {}
+    param_idx = 0
+    for strat_name in selected_strategies:
+        params = {}
+        for param_name, param_type in STRATEGY_PARAMS[strat_name].items():
+            params[param_name] = param_type(param_values[param_idx])
+            param_idx += 1
+        strategies_params[strat_name] = params
+    return strategies_params
+
+def run_strategy(stored_data, strat_name, strategy_params, initial_capital, commission, slippage, rebal_freq):
+    """Runs a backtest or returns the cached result of an identical configuration"""
+    key = result_key(stored_data['key'], strat_name, strategy_params, initial_capital, 
+                     commission, slippage, rebal_freq)
+    
+    def compute():
+        df = DATASET_STORE.get_frame(stored_data['key'])
+        strategy = STRATEGIES[strat_name](**strategy_params)
+        backtester = Backtester(
+            df,
+            initial_capital=initial_capital,
+            commission=commission/100,
+            slippage=slippage/100,
+            rebalancing_frequency=rebal_freq,
+            profile=PROFILE_BACKTESTS,
+            dataset_key=stored_data['key']
+        )
+        return backtester.run(strategy)
+    
+    return RESULT_CACHE.get_or_compute(key, compute)
+
 def parse_csv(contents):
     content_type, content_string = contents.split(',')
     decoded = base64.b64decode(content_string)
-    df = pd.read_csv(io.StringIO(decoded.decode('utf-8')), index_col=0, parse_dates=True)
+    df = read_market_data(io.StringIO(decoded.decode('utf-8')))
     return df
 
 @callback(
@@ -60,7 +110,7 @@ def store_data(contents, filename):
             ]),
             {
                 'filename': filename,
-                'data': df.to_json(date_format='iso', orient='split')
+                'key': DATASET_STORE.put(df)
             },
             price_fig
         ]
@@ -96,11 +146,22 @@ def update_rebalancing_frequencies(data_freq):
         'W': 'Weekly',
         'M': 'Monthly'
     }
+    # Calendar rules and the frequency of the periods they pick a date from
+    calendar_rules = {
+        'session_open': ('D', 'Session open'),
+        'session_close': ('D', 'Session close'),
+        'week_start': ('W', 'Week start'),
+        'week_end': ('W', 'Week end'),
+        'month_start': ('M', 'Month start'),
+        'month_end': ('M', 'Month end')
+    }
     
     try:
         start_idx = freq_order.index(data_freq)
         available_freqs = freq_order[start_idx:]
         options = [{'label': freq_labels[freq], 'value': freq} for freq in available_freqs]
+        options += [{'label': label, 'value': rule} for rule, (freq, label) in calendar_rules.items()
+                    if freq in available_freqs[1:]]
         return options, data_freq
     except ValueError:
         return [], None
@@ -133,7 +194,7 @@ def update_strategy_params(selected_strategies):
         elif strat_name == 'ARIMA':
             params = {
                 'window_size': 252,
-                'prediction_threshold': 0.001
+                'threshold': 0.001
             }
         else:
             params = {
@@ -218,7 +279,6 @@ def update_strategy_tabs(selected_strategies):
 def update_strategy_graph(n_clicks, graph_type, stored_data, selected_strategies, 
                         param_values, initial_capital, commission, slippage, rebal_freq, graph_id):
     """Update the chart of a strategy"""
-    ctx_id = ctx.triggered_id
     empty_fig = go.Figure()
     empty_fig.update_layout(
         title="Waiting for parameters",
@@ -231,58 +291,22 @@ def update_strategy_graph(n_clicks, graph_type, stored_data, selected_strategies
         return empty_fig
 
     try:
-        df = pd.read_json(io.StringIO(stored_data['data']), orient='split')
         current_strategy = graph_id['strategy']
+        strategy_params = parse_strategy_params(selected_strategies, param_values)[current_strategy]
+        result = run_strategy(stored_data, current_strategy, strategy_params, 
+                              initial_capital, commission, slippage, rebal_freq)
         
-        param_idx = 0
-        for strat in selected_strategies:
-            if strat == current_strategy:
-                break
-            if strat == 'MA Crossover':
-                param_idx += 2
-            elif strat == 'RSI':
-                param_idx += 3
-            elif strat == 'ARIMA':
-                param_idx += 2
-            elif strat == 'Linear Trend':
-                param_idx += 2
-
-        if current_strategy == 'MA Crossover':
-            strategy_params = {
-                'short_window': int(param_values[param_idx]),
-                'long_window': int(param_values[param_idx + 1])
-            }
-        elif current_strategy == 'RSI':
-            strategy_params = {
-                'rsi_period': int(param_values[param_idx]),
-                'overbought': float(param_values[param_idx + 1]),
-                'oversold': float(param_values[param_idx + 2])
-            }
-        elif current_strategy == 'ARIMA':
-            strategy_params = {
-                'window_size': int(param_values[param_idx]),
-                'prediction_threshold': float(param_values[param_idx + 1])
-            }
-        elif current_strategy == 'Linear Trend':
-            strategy_params = {
-                'window_size': int(param_values[param_idx]),
-                'trend_threshold': float(param_values[param_idx + 1])
-            }
-
-        strategy = STRATEGIES[current_strategy](**strategy_params)
-        backtester = Backtester(
-            df,
-            initial_capital=initial_capital,
-            commission=commission/100,
-            slippage=slippage/100,
-            rebalancing_frequency=rebal_freq
-        )
-        result = backtester.run(strategy)
-        
-        fig = create_strategy_summary(result, current_strategy, df, graph_type)
+        # The charts only need the closing prices: zero-copy view of the stored column
+        key = stored_data['key']
+        prices = pd.DataFrame({'close': DATASET_STORE.get_arrays(key, ['close'])['close']},
+                              index=DATASET_STORE.get_index(key))
+        fig = create_strategy_summary(result, current_strategy, prices, graph_type)
         fig.update_layout(template="plotly_white")
         return fig
 
+    except DatasetExpiredError as e:
+        empty_fig.update_layout(title=str(e))
+        return empty_fig
     except Exception as e:
         print(f"Error in update_strategy_graph: {e}")
         empty_fig.update_layout(title=f"Une erreur s'est produite")
@@ -307,46 +331,12 @@ def update_metrics_table(n_clicks, stored_data, stats_type, selected_strategies,
         return None
 
     try:
-        df = pd.read_json(io.StringIO(stored_data['data']), orient='split')
+        strategies_params = parse_strategy_params(selected_strategies, param_values)
         results = []
-        param_idx = 0
         
         for strat_name in selected_strategies:
-            if strat_name == 'MA Crossover':
-                strategy_params = {
-                    'short_window': int(param_values[param_idx]),
-                    'long_window': int(param_values[param_idx + 1])
-                }
-                param_idx += 2
-            elif strat_name == 'RSI':
-                strategy_params = {
-                    'rsi_period': int(param_values[param_idx]),
-                    'overbought': float(param_values[param_idx + 1]),
-                    'oversold': float(param_values[param_idx + 2])
-                }
-                param_idx += 3
-            elif strat_name == 'ARIMA':
-                strategy_params = {
-                    'window_size': int(param_values[param_idx]),
-                    'prediction_threshold': float(param_values[param_idx + 1])
-                }
-                param_idx += 2
-            else: 
-                strategy_params = {
-                    'window_size': int(param_values[param_idx]),
-                    'trend_threshold': float(param_values[param_idx + 1])
-                }
-                param_idx += 2
-            
-            strategy = STRATEGIES[strat_name](**strategy_params)
-            backtester = Backtester(
-                df,
-                initial_capital=initial_capital,
-                commission=commission/100,
-                slippage=slippage/100,
-                rebalancing_frequency=rebal_freq
-            )
-            result = backtester.run(strategy)
+            result = run_strategy(stored_data, strat_name, strategies_params[strat_name], 
+                                  initial_capital, commission, slippage, rebal_freq)
             results.append((strat_name, result))
         
         metrics_data = {}
@@ -384,6 +374,8 @@ def update_metrics_table(n_clicks, stored_data, stats_type, selected_strategies,
         
         return table
         
+    except DatasetExpiredError as e:
+        return html.Div(str(e), style={'color': 'red'})
     except Exception as e:
         print(f"Error in update_metrics_table: {e}")
         return html.Div(f"Erreur: {str(e)}", style={'color': 'red'})
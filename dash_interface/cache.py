@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import json
+import threading
+from main.result import Result
+
+def result_key(dataset_key: str, strategy_name: str, params: Dict[str, Any], initial_capital: float,
+               commission: float, slippage: float, rebalancing_frequency: str) -> str:
+    """Builds the cache key of a backtest configuration"""
+    config = {
+        'dataset': dataset_key,
+        'strategy': strategy_name,
+        'params': params,
+        'initial_capital': initial_capital,
+        'commission': commission,
+        'slippage': slippage,
+        'rebalancing_frequency': rebalancing_frequency
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+def result_nbytes(result: Result) -> int:
+    """Estimates the memory used by a Result, excluding the price data it shares with the data store"""
+    return result.nbytes
+
+class ResultCache:
+    """
+    Server-side LRU cache of backtest results shared by the Dash callbacks.
+    Entries are evicted when either the number of entries or the memory cap is exceeded,
+    and concurrent requests for the same configuration wait for a single computation.
+    """
+    def __init__(self, max_entries: int = 64, max_memory_mb: float = 512):
+        self.max_entries = max_entries
+        self.max_memory = max_memory_mb * 1024 ** 2
+        self._entries: "OrderedDict[str, Result]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._pending: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def memory(self) -> int:
+        return sum(self._sizes.values())
+
+    def get(self, key: str) -> Optional[Result]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: str, result: Result) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            self._sizes[key] = result_nbytes(result)
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.memory > self.max_memory):
+                evicted, _ = self._entries.popitem(last=False)
+                del self._sizes[evicted]
+
+    def get_or_compute(self, key: str, compute: Callable[[], Result]) -> Result:
+        """Returns the cached result or computes it once, even under concurrent callbacks"""
+        with self._lock:
+            key_lock = self._pending.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                result = self.get(key)
+                with self._lock:
+                    if result is not None:
+                        self.hits += 1
+                    else:
+                        self.misses += 1
+                if result is None:
+                    result = compute()
+                    self.put(key, result)
+        finally:
+            # Also released on hits and failed computations; waiting callers then read the cache or retry
+            with self._lock:
+                if self._pending.get(key) is key_lock:
+                    del self._pending[key]
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
@@ -0,0 +1,167 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from main.hashing import dataset_hash
+
+try:
+    import pyarrow as pa #type: ignore
+    import pyarrow.ipc as ipc #type: ignore
+except ImportError:
+    pa = None
+
+class DatasetExpiredError(KeyError):
+    """Raised for a dataset key that was evicted or written by another store"""
+    def __str__(self) -> str:
+        return self.args[0] if self.args else ''
+
+def _expired(key: str) -> DatasetExpiredError:
+    return DatasetExpiredError(f"Dataset {key[:12]} has expired, please upload the file again")
+
+class DatasetStore:
+    """
+    Server-side store of uploaded datasets keyed by their content hash.
+    Datasets are written once as Arrow IPC files and read back through memory maps, so callbacks
+    get zero-copy NumPy views instead of re-parsing JSON; without pyarrow they are kept in memory.
+    Each store writes to its own temporary directory (created under directory, the system temporary
+    directory by default), so server processes never delete each other's files.
+    Only the max_datasets most recently used datasets are kept: older ones are unmapped and their
+    files deleted, and close() deletes the directory of this store.
+    """
+    def __init__(self, directory: Optional[str] = None, max_datasets: int = 16):
+        self.directory = tempfile.mkdtemp(prefix='backtesting_datasets_', dir=directory) if pa is not None else None
+        self.max_datasets = max_datasets
+        self._tables: Dict[str, "pa.Table"] = {}
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._indexes: Dict[str, pd.Index] = {}
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.arrow")
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._tables or key in self._frames:
+            return True
+        return self.directory is not None and os.path.exists(self._path(key))
+
+    def _remove(self, key: str) -> None:
+        """Forgets a dataset and deletes its file; must be called with the lock held"""
+        self._recent.pop(key, None)
+        self._tables.pop(key, None)
+        self._frames.pop(key, None)
+        self._indexes.pop(key, None)
+        if self.directory is not None:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _touch(self, key: str) -> None:
+        """Marks a dataset as recently used and evicts the least recently used ones; lock held"""
+        self._recent[key] = None
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_datasets:
+            self._remove(next(iter(self._recent)))
+
+    def put(self, df: pd.DataFrame) -> str:
+        """Stores a dataset and returns its key"""
+        key = dataset_hash(df)
+        if self.directory is None:
+            with self._lock:
+                self._frames.setdefault(key, df)
+                self._touch(key)
+            return key
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            table = pa.Table.from_pandas(df, preserve_index=True)
+            # Written to a temporary file then renamed so that readers never see a partial file
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with pa.OSFile(tmp_path, 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, path)
+        with self._lock:
+            self._touch(key)
+        return key
+
+    def _table(self, key: str) -> "pa.Table":
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                if not os.path.exists(self._path(key)):
+                    raise _expired(key)
+                table = ipc.open_file(pa.memory_map(self._path(key), 'r')).read_all()
+                self._tables[key] = table
+            self._touch(key)
+            return table
+
+    def _frame(self, key: str) -> pd.DataFrame:
+        with self._lock:
+            if key not in self._frames:
+                raise _expired(key)
+            self._touch(key)
+            return self._frames[key]
+
+    def get_arrays(self, key: str, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Returns read-only NumPy views of the columns of a dataset (all by default), keyed by column name"""
+        if self.directory is None:
+            df = self._frame(key)
+            return {column: df[column].values for column in (columns or df.columns)}
+
+        table = self._table(key)
+        index_columns = table.schema.pandas_metadata['index_columns']
+        names = [name for name in table.column_names if name not in index_columns] if columns is None else columns
+        arrays = {}
+        for name in names:
+            column = table.column(name)
+            arrays[name] = (column.chunk(0).to_numpy(zero_copy_only=False) if column.num_chunks == 1
+                            else column.to_numpy())
+        return arrays
+
+    def get_index(self, key: str) -> pd.Index:
+        """Returns the index of a dataset, converted once per dataset"""
+        if self.directory is None:
+            return self._frame(key).index
+
+        table = self._table(key)
+        with self._lock:
+            index = self._indexes.get(key)
+        if index is None:
+            # Selecting the index columns lets pyarrow rebuild the index from the pandas metadata
+            index_columns = [name for name in table.schema.pandas_metadata['index_columns'] if isinstance(name, str)]
+            index = table.select(index_columns).to_pandas().index
+            with self._lock:
+                self._indexes[key] = index
+        return index
+
+    def get_frame(self, key: str) -> pd.DataFrame:
+        """Returns a dataset as a DataFrame whose numeric columns are backed by the memory map"""
+        if self.directory is None:
+            return self._frame(key)
+
+        return self._table(key).to_pandas(split_blocks=True)
+
+    def clear(self) -> None:
+        """Unmaps every dataset; the files are kept and can be read again"""
+        with self._lock:
+            self._tables.clear()
+            self._frames.clear()
+            self._indexes.clear()
+            self._recent.clear()
+
+    def close(self) -> None:
+        """Unmaps every dataset and deletes the directory of this store"""
+        with self._lock:
+            for key in list(self._recent):
+                self._remove(key)
+            if self.directory is not None:
+                shutil.rmtree(self.directory, ignore_errors=True)
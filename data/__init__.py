@@ -0,0 +1,21 @@
+from data.loader import (
+    load_market_data,
+    read_market_data,
+    iter_market_data,
+    normalize_columns,
+    parse_timestamps,
+    cache_path,
+    OHLCV_COLUMNS,
+    TIMESTAMP_FORMATS
+)
+
+__all__ = [
+    'load_market_data',
+    'read_market_data',
+    'iter_market_data',
+    'normalize_columns',
+    'parse_timestamps',
+    'cache_path',
+    'OHLCV_COLUMNS',
+    'TIMESTAMP_FORMATS'
+]
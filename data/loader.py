@@ -0,0 +1,242 @@
+from typing import IO, Iterator, Optional, Sequence, Union
+import logging
+import os
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow #type: ignore
+    import pyarrow.parquet #type: ignore
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+PathOrBuffer = Union[str, os.PathLike, IO]
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Noms de colonnes rencontrés dans les fichiers sources et leur équivalent normalisé
+COLUMN_ALIASES = {
+    'adj close': 'adj_close',
+    'adj_close': 'adj_close',
+    'date': 'timestamp',
+    'datetime': 'timestamp',
+    'time': 'timestamp',
+    'unnamed: 0': 'timestamp'
+}
+
+TIMESTAMP_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%Y-%m-%d %H:%M')
+
+CACHE_FORMATS = ('parquet', 'feather')
+
+def normalize_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise les noms de colonnes (minuscules, sans espaces superflus, alias usuels)
+
+    Parameters
+    ----------
+    data: DataFrame
+        données brutes
+
+    Returns
+    ----------
+    DataFrame
+        données dont les colonnes suivent le schéma open, high, low, close, volume
+    """
+    columns = []
+    for column in data.columns:
+        name = str(column).strip().lower()
+        columns.append(COLUMN_ALIASES.get(name, name))
+    return data.set_axis(columns, axis=1)
+
+def parse_timestamps(values: Sequence, formats: Sequence[str] = TIMESTAMP_FORMATS) -> pd.DatetimeIndex:
+    """
+    Convertit les dates avec des formats explicites, ce qui évite l'inférence de format
+    élément par élément de pandas
+
+    Parameters
+    ----------
+    values: Sequence
+        dates sous forme de chaînes de caractères
+    formats: Sequence[str]
+        formats essayés dans l'ordre
+
+    Returns
+    ----------
+    DatetimeIndex
+        dates converties
+    """
+    for timestamp_format in formats:
+        try:
+            return pd.DatetimeIndex(pd.to_datetime(values, format=timestamp_format))
+        except (ValueError, TypeError):
+            continue
+    return pd.DatetimeIndex(pd.to_datetime(values, format='ISO8601'))
+
+def read_market_data(source: PathOrBuffer, dtype: str = 'float64',
+                     timestamp_formats: Sequence[str] = TIMESTAMP_FORMATS) -> pd.DataFrame:
+    """
+    Lit un fichier CSV de données de marché et normalise son schéma : colonnes en minuscules,
+    index temporel nommé 'timestamp' et colonnes numériques converties au type demandé
+
+    Parameters
+    ----------
+    source: str, PathLike ou buffer
+        fichier CSV dont la première colonne contient les dates
+    dtype: str
+        type des colonnes numériques ('float32' ou 'float64')
+    timestamp_formats: Sequence[str]
+        formats de dates essayés dans l'ordre
+
+    Returns
+    ----------
+    DataFrame
+        données de marché indexées par date
+    """
+    _check_dtype(dtype)
+    return _normalize_frame(pd.read_csv(source, dtype={0: str}), dtype, timestamp_formats)
+
+def _check_dtype(dtype: str) -> None:
+    if np.dtype(dtype) not in (np.float32, np.float64):
+        raise ValueError("dtype must be 'float32' or 'float64'")
+
+def _normalize_frame(data: pd.DataFrame, dtype: str, timestamp_formats: Sequence[str]) -> pd.DataFrame:
+    data = normalize_columns(data)
+    index_column = 'timestamp' if 'timestamp' in data.columns else data.columns[0]
+    data.index = parse_timestamps(data.pop(index_column).values, timestamp_formats)
+    data.index.name = 'timestamp'
+
+    numeric_columns = data.select_dtypes(include='number').columns
+    data[numeric_columns] = data[numeric_columns].astype(dtype)
+
+    if 'close' not in data.columns:
+        raise ValueError("Market data must contain a 'close' column")
+    return data
+
+def iter_market_data(path: Union[str, os.PathLike], chunk_size: int = 100_000, dtype: str = 'float64',
+                     timestamp_formats: Sequence[str] = TIMESTAMP_FORMATS) -> Iterator[pd.DataFrame]:
+    """
+    Lit un fichier CSV ou Parquet de données de marché par blocs de chunk_size lignes, sans le charger
+    entièrement en mémoire ; chaque bloc suit le schéma de read_market_data.
+    Un fichier Parquet doit contenir une colonne 'timestamp' (comme les fichiers de cache) ou
+    avoir les dates en première colonne ; sa lecture nécessite pyarrow.
+
+    Parameters
+    ----------
+    path: str ou PathLike
+        fichier .csv ou .parquet
+    chunk_size: int
+        nombre de lignes par bloc
+    dtype: str
+        type des colonnes numériques ('float32' ou 'float64')
+    timestamp_formats: Sequence[str]
+        formats de dates essayés dans l'ordre
+
+    Returns
+    ----------
+    Iterator[DataFrame]
+        blocs successifs de données de marché indexées par date
+    """
+    _check_dtype(dtype)
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    if os.fspath(path).endswith('.parquet'):
+        if pyarrow is None:
+            raise ImportError("Reading Parquet files requires pyarrow")
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            chunk = pyarrow.Table.from_batches([batch]).to_pandas()
+            if 'timestamp' not in chunk.columns and isinstance(chunk.index, pd.DatetimeIndex):
+                chunk = chunk.reset_index(names='timestamp')
+            yield _normalize_frame(chunk, dtype, timestamp_formats)
+    else:
+        with pd.read_csv(path, dtype={0: str}, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                yield _normalize_frame(chunk, dtype, timestamp_formats)
+
+def cache_path(path: Union[str, os.PathLike], dtype: str = 'float64', cache_format: str = 'parquet') -> str:
+    """
+    Chemin du fichier de cache associé à un fichier CSV, placé à côté de celui-ci
+
+    Parameters
+    ----------
+    path: str ou PathLike
+        fichier CSV source
+    dtype: str
+        type des colonnes numériques
+    cache_format: str
+        'parquet' ou 'feather'
+
+    Returns
+    ----------
+    str
+        chemin du fichier de cache
+    """
+    root, _ = os.path.splitext(os.fspath(path))
+    return f"{root}.{np.dtype(dtype).name}.{cache_format}"
+
+def _read_cache(path: str, cache_format: str) -> pd.DataFrame:
+    if cache_format == 'parquet':
+        data = pd.read_parquet(path)
+    else:
+        data = pd.read_feather(path)
+    return data.set_index('timestamp')
+
+def _write_cache(data: pd.DataFrame, path: str, cache_format: str) -> None:
+    # Écriture dans un fichier temporaire puis renommage pour ne jamais laisser de cache partiel
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if cache_format == 'parquet':
+        data.reset_index().to_parquet(tmp_path, index=False)
+    else:
+        data.reset_index().to_feather(tmp_path)
+    os.replace(tmp_path, path)
+
+def load_market_data(path: Union[str, os.PathLike], dtype: str = 'float64', cache: bool = True,
+                     cache_format: str = 'parquet',
+                     timestamp_formats: Sequence[str] = TIMESTAMP_FORMATS) -> pd.DataFrame:
+    """
+    Charge un fichier CSV de données de marché au schéma normalisé (voir read_market_data).
+    Au premier chargement, un cache Parquet ou Feather est écrit à côté du CSV et les chargements
+    suivants le lisent directement ; il est ignoré dès que le CSV est plus récent.
+    Sans pyarrow, le cache est désactivé et le CSV est lu à chaque fois.
+
+    Parameters
+    ----------
+    path: str ou PathLike
+        fichier CSV dont la première colonne contient les dates
+    dtype: str
+        type des colonnes numériques ('float32' ou 'float64')
+    cache: bool
+        si True, le cache sur disque est lu et écrit
+    cache_format: str
+        'parquet' ou 'feather'
+    timestamp_formats: Sequence[str]
+        formats de dates essayés dans l'ordre
+
+    Returns
+    ----------
+    DataFrame
+        données de marché indexées par date
+    """
+    if cache_format not in CACHE_FORMATS:
+        raise ValueError(f"cache_format must be one of {', '.join(CACHE_FORMATS)}")
+
+    if not cache or pyarrow is None:
+        return read_market_data(path, dtype, timestamp_formats)
+
+    cached = cache_path(path, dtype, cache_format)
+    if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path):
+        try:
+            return _read_cache(cached, cache_format)
+        except (OSError, pyarrow.ArrowInvalid, ValueError) as error:
+            logger.warning("unreadable cache %s (%s), reading %s", cached, error, path,
+                           extra={'event': 'market_data_cache_error', 'path': str(cached)})
+
+    data = read_market_data(path, dtype, timestamp_formats)
+    try:
+        _write_cache(data, cached, cache_format)
+    except OSError:
+        pass
+    return data
@@ -1,14 +1,46 @@
 from .result import Result
+from .nav import compute_nav, compute_portfolio_nav
 from .backtester import (
     Backtester,
     FREQ_MAP
 )
+from .sweep import ParameterSweep
+from .batch import BatchResult, ma_crossover_batch
+from .portfolio import PortfolioBacktester, PortfolioResult, align_prices
+from .profiling import Profiler, profile_run
+from .scheduler import CALENDAR_RULES, rebalancing_points
+from .resampling import causal_resample, clear_resample_cache
+from .streaming import StreamingBacktester, StreamingResult
 
 __all__ = [
     # Result class and methods
     'Result',
+    'compute_nav',
+    'compute_portfolio_nav',
 
     # Backtester class and constants
     'Backtester',
-    'FREQ_MAP'
+    'FREQ_MAP',
+    'CALENDAR_RULES',
+    'rebalancing_points',
+    'causal_resample',
+    'clear_resample_cache',
+
+    # Out-of-core streaming backtests
+    'StreamingBacktester',
+    'StreamingResult',
+
+    # Parameter sweeps
+    'ParameterSweep',
+    'BatchResult',
+    'ma_crossover_batch',
+
+    # Multi-asset portfolios
+    'PortfolioBacktester',
+    'PortfolioResult',
+    'align_prices',
+
+    # Profiling
+    'Profiler',
+    'profile_run'
 ]
\ No newline at end of file
@@ -1,19 +1,29 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import copy
+import numpy as np
 import pandas as pd
 from strategies.strategy_constructor import Strategy
+from strategies.compiled import CompiledStrategy
 from main.result import Result
+from main.jit import run_event_loop
+from main.profiling import Profiler, DISABLED_PROFILER
+from main.scheduler import FREQ_MAP, resolve_rule, rebalancing_points
+from main.resampling import cached_causal_resample
+from main.hashing import dataset_hash
 
-FREQ_MAP = {
-    '1min': '1min',
-    '5min': '5min',
-    '15min': '15min',
-    '30min': '30min',
-    '1H': '1h',
-    '4H': '4h',
-    'D': 'D',
-    'W': 'W-MON', 
-    'M': 'M'
-}
+# Backtester et stratégie propres à chaque processus du walk-forward, transmis une seule fois par l'initialiseur
+_WORKER_BACKTESTER: Optional['Backtester'] = None
+_WORKER_STRATEGY: Optional[Strategy] = None
+
+def _init_walk_forward_worker(backtester: 'Backtester', strategy: Strategy) -> None:
+    global _WORKER_BACKTESTER, _WORKER_STRATEGY
+    _WORKER_BACKTESTER = backtester
+    _WORKER_STRATEGY = strategy
+
+def _run_walk_forward_fold(fold: Tuple[int, int, int]) -> np.ndarray:
+    return _WORKER_BACKTESTER._run_fold(_WORKER_STRATEGY, *fold)
 
 @dataclass
 class Backtester:
@@ -25,10 +35,13 @@ class Backtester:
     commission: float = 0.001
     slippage: float = 0.0
     rebalancing_frequency: str = 'D'
+    profile: bool = False
+    trace_memory: bool = False
+    dataset_key: Optional[str] = field(default=None, repr=False)
+    keep_arrays: bool = True
     
     def __post_init__(self):
-        if self.rebalancing_frequency not in FREQ_MAP:
-            raise ValueError(f"Frequency not available. Available frequencies: {', '.join(FREQ_MAP.keys())}")
+        rebal_freq, _ = resolve_rule(self.rebalancing_frequency)
             
         self.data.index = pd.to_datetime(self.data.index)
         
@@ -45,7 +58,7 @@ class Backtester:
             
         data_minutes = self._freq_to_minutes(self.data_frequency)
 
-        rebal_minutes = self._freq_to_minutes(FREQ_MAP[self.rebalancing_frequency])
+        rebal_minutes = self._freq_to_minutes(rebal_freq)
 
         if rebal_minutes < data_minutes:
             raise ValueError(f"La fréquence de rebalancement ({self.rebalancing_frequency}) ne peut pas être plus fine que la fréquence des données ({self.data_frequency})")
@@ -66,9 +79,11 @@ class Backtester:
             nombre de minutes par période
         """
         if 'min' in freq:
-            return int(freq.replace('min', ''))
-        elif 'h' in freq.lower(): 
-            return int(freq[0]) * 60
+            return int(freq.replace('min', '') or 1)
+        elif freq == 'T' or (freq.endswith('T') and freq[:-1].isdigit()):
+            return int(freq[:-1] or 1)
+        elif freq.lower().endswith('h'): 
+            return int(freq[:-1] or 1) * 60
         elif freq == 'D':
             return 1440  # 1440 min = 24h
         elif freq.startswith('W'):
@@ -78,30 +93,91 @@ class Backtester:
         else:
             return 0
 
-    @staticmethod
-    def _get_period_start(timestamp: pd.Timestamp, freq: str) -> pd.Timestamp:
+    def _dataset_key(self) -> str:
+        # Empreinte fournie (par exemple par ParameterSweep ou l'interface Dash) ou calculée à la première utilisation
+        if self.dataset_key is None:
+            self.dataset_key = dataset_hash(self.data)
+        return self.dataset_key
+    
+    def _profiler(self) -> Profiler:
+        return Profiler(trace_memory=self.trace_memory) if self.profile else DISABLED_PROFILER
+    
+    def _finalize(self, result: Result) -> Result:
+        # Sans keep_arrays, seules les métriques sont conservées (grands balayages de paramètres)
+        return result if self.keep_arrays else result.release_arrays()
+    
+    def _compute_positions(self, strategy: Strategy, data: pd.DataFrame,
+                           profiler: Profiler = DISABLED_PROFILER) -> List[float]:
         """
-        Identification du début de la période pour un timestamp donné
-
+        Calcule les positions d'une stratégie déjà estimée sur un historique donné
+        
         Parameters
         ----------
-        timestamp: Timestamp 
-            indice temporel
-        freq: float 
-            fréquence des données
+        strategy: Strategy 
+            stratégie backtestée
+        data: DataFrame
+            série de données historiques sur laquelle les positions sont calculées
+        profiler: Profiler
+            instrumentation des étapes et des appels de get_position
             
         Returns
         ----------
-        timestamp 
-            nouvel indice temporel pour rebalancer la position
+        list 
+            position à chaque date de data
         """
-
-        if freq == 'M':
-            return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        elif freq == 'W-MON':
-            return timestamp - pd.Timedelta(days=timestamp.dayofweek)
+        rebal_freq, _ = resolve_rule(self.rebalancing_frequency)
+        rebalancing = self._freq_to_minutes(rebal_freq) != self._freq_to_minutes(self.data_frequency)
+        
+        if rebalancing:
+            # Agrégats de la période en cours connus à chaque date, mémorisés pour les données complètes
+            dataset_key = self._dataset_key() if data is self.data else None
+            with profiler.stage('resample'):
+                resampled_data = cached_causal_resample(data, rebal_freq, dataset_key)
         else:
-            return timestamp.floor(freq)
+            resampled_data = data
+        
+        with profiler.stage('positions'):
+            return self._position_loop(strategy, data, resampled_data, rebalancing, profiler)
+    
+    def _position_loop(self, strategy: Strategy, data: pd.DataFrame, resampled_data: pd.DataFrame,
+                       rebalancing: bool, profiler: Profiler) -> List[float]:
+        """
+        Positions de la version vectorisée de la stratégie si elle existe, sinon de la boucle sur get_position
+        """
+        batch_positions = None
+        if not rebalancing:
+            batch_positions = strategy.generate_positions(data)
+            
+        if batch_positions is not None:
+            positions = batch_positions.reindex(data.index).astype(float).tolist()
+        elif rebalancing:
+            # La stratégie n'est appelée qu'aux dates de décision et sa position est conservée jusqu'à la suivante
+            points = rebalancing_points(data.index, self.rebalancing_frequency)
+            bounds = np.append(points, len(data)).tolist()
+            positions_array = np.zeros(len(data))
+            current_position = 0.0
+            
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                historical_data = resampled_data.iloc[:start + 1]
+                profiler.count('get_position_calls')
+                profiler.observe('history_rows', len(historical_data))
+                current_position = strategy.get_position(historical_data, current_position)
+                positions_array[start:end] = current_position
+            
+            positions = positions_array.tolist()
+        else:
+            positions = []
+            current_position = 0.0
+            
+            for timestamp in data.index:
+                historical_data = data.loc[:timestamp]
+                profiler.count('get_position_calls')
+                profiler.observe('history_rows', len(historical_data))
+                new_position = strategy.get_position(historical_data, current_position)
+                positions.append(new_position)
+                current_position = new_position
+        
+        return positions
     
     def run(self, strategy: Strategy) -> Result:
         """
@@ -122,45 +198,146 @@ class Backtester:
                 - La commission appliquée
                 - Le slippage appliqué
         """
-        strategy.fit(self.data)
+        profiler = self._profiler()
+        with profiler.stage('fit'):
+            strategy.fit(self.data)
+        positions = self._compute_positions(strategy, self.data, profiler)
         
-        rebal_freq = FREQ_MAP[self.rebalancing_frequency]
+        result = Result(
+            positions=positions,
+            data=self.data,
+            initial_capital=self.initial_capital,
+            commission=self.commission,
+            slippage=self.slippage,
+            profiler=profiler if profiler.enabled else None
+        )
+        profiler.log_summary()
+        return self._finalize(result)
+    
+    def run_compiled(self, strategy: CompiledStrategy) -> Result:
+        """
+        Exécute le backtest d'une stratégie compilée : les positions et la NAV sont calculées
+        dans une seule boucle compilée par numba (en Python pur si numba n'est pas installé).
+        Les positions et la NAV sont identiques à celles de run.
         
-        if self.rebalancing_frequency != self.data_frequency:
-            resampled_data = self.data.resample(rebal_freq).agg({'close': 'last','volume': 'sum'}).ffill()
-            resampled_data = resampled_data.reindex(self.data.index, method='ffill')
-        else:
-            resampled_data = self.data.copy()
+        Parameter
+        ----------
+        strategy: CompiledStrategy 
+            stratégie backtestée, écrite sous forme de noyau sur des tableaux NumPy
             
-        positions = []
-        current_position = 0.0
-        last_rebalancing_time = None
-        current_rebalancing_position = 0.0
-        
-        for timestamp in self.data.index:
-            if self.rebalancing_frequency != self.data_frequency:
-                period_start = self._get_period_start(timestamp, rebal_freq)
-                
-                if last_rebalancing_time != period_start:
-                    historical_data = resampled_data.loc[:timestamp]
-                    current_rebalancing_position = strategy.get_position(historical_data, current_position)
-                    last_rebalancing_time = period_start
-                
-                positions.append(current_rebalancing_position)
-                current_position = current_rebalancing_position
-            else:
-                historical_data = self.data.loc[:timestamp]
-                new_position = strategy.get_position(historical_data, current_position)
-                new_position = new_position
-                positions.append(new_position)
-                current_position = new_position
+        Returns
+        ----------
+        Result 
+            instance de la classe Result dont la NAV est celle de la boucle compilée
+        """
+        if not isinstance(strategy, CompiledStrategy):
+            raise TypeError("run_compiled requires a CompiledStrategy")
         
-        positions_df = pd.DataFrame({'position': positions,'timestamp': self.data.index}, index=self.data.index)
+        rebal_freq, _ = resolve_rule(self.rebalancing_frequency)
+        if self._freq_to_minutes(rebal_freq) != self._freq_to_minutes(self.data_frequency):
+            raise ValueError("run_compiled only supports rebalancing at the data frequency")
         
-        return Result(
-            positions=positions_df,
+        profiler = self._profiler()
+        with profiler.stage('fit'):
+            strategy.fit(self.data)
+        with profiler.stage('event_loop'):
+            positions, nav = run_event_loop(
+                type(strategy).kernel,
+                np.ascontiguousarray(self.data['close'].values, dtype=np.float64),
+                strategy.kernel_params(),
+                strategy.initial_state(),
+                float(self.initial_capital),
+                float(self.commission),
+                float(self.slippage)
+            )
+        
+        result = Result(
+            positions=positions,
             data=self.data,
             initial_capital=self.initial_capital,
             commission=self.commission,
+            slippage=self.slippage,
+            precomputed_nav=nav,
+            profiler=profiler if profiler.enabled else None
+        )
+        profiler.log_summary()
+        return self._finalize(result)
+    
+    def _run_fold(self, strategy: Strategy, train_start: int, test_start: int, test_end: int) -> np.ndarray:
+        """
+        Estime une copie de la stratégie sur la fenêtre d'entraînement puis calcule ses positions
+        sur la fenêtre de test, l'historique étant une vue sur les données du Backtester
+        
+        Parameters
+        ----------
+        strategy: Strategy 
+            stratégie backtestée (non modifiée)
+        train_start: int
+            indice du début de la fenêtre d'entraînement
+        test_start: int
+            indice du début de la fenêtre de test (fin exclue de l'entraînement)
+        test_end: int
+            indice de fin (exclue) de la fenêtre de test
+            
+        Returns
+        ----------
+        ndarray 
+            positions sur la fenêtre de test
+        """
+        fold_strategy = copy.deepcopy(strategy)
+        fold_strategy.fit(self.data.iloc[train_start:test_start])
+        positions = self._compute_positions(fold_strategy, self.data.iloc[train_start:test_end])
+        return np.asarray(positions[test_start - train_start:], dtype=float)
+    
+    def walk_forward(self, strategy: Strategy, train_size: int, test_size: int, anchored: bool = False,
+                     max_workers: Optional[int] = None) -> Result:
+        """
+        Exécute un backtest walk-forward : la stratégie est ré-estimée sur chaque fenêtre d'entraînement
+        et seules les positions hors échantillon des fenêtres de test sont conservées.
+        Chaque fenêtre repart d'une position nulle au début de son entraînement, ce qui rend
+        les fenêtres indépendantes et permet de les exécuter en parallèle.
+        
+        Parameters
+        ----------
+        strategy: Strategy 
+            stratégie backtestée
+        train_size: int
+            nombre de dates de la fenêtre d'entraînement (taille minimale si anchored)
+        test_size: int
+            nombre de dates de chaque fenêtre de test
+        anchored: bool
+            si True, la fenêtre d'entraînement commence toujours à la première date (fenêtre croissante),
+            sinon elle glisse avec la fenêtre de test
+        max_workers: int
+            nombre de processus (1 pour une exécution séquentielle, par défaut tous les cœurs)
+            
+        Returns
+        ----------
+        Result 
+            instance de la classe Result sur la période hors échantillon
+        """
+        if train_size < 1 or test_size < 1:
+            raise ValueError("train_size and test_size must be positive integers")
+        if train_size >= len(self.data):
+            raise ValueError("train_size must be smaller than the number of observations")
+        
+        folds = []
+        for test_start in range(train_size, len(self.data), test_size):
+            train_start = 0 if anchored else test_start - train_size
+            folds.append((train_start, test_start, min(test_start + test_size, len(self.data))))
+        
+        if max_workers == 1 or len(folds) == 1:
+            fold_positions = [self._run_fold(strategy, *fold) for fold in folds]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_walk_forward_worker,
+                                     initargs=(self, strategy)) as executor:
+                fold_positions = list(executor.map(_run_walk_forward_fold, folds))
+        
+        result = Result(
+            positions=np.concatenate(fold_positions),
+            data=self.data.iloc[train_size:],
+            initial_capital=self.initial_capital,
+            commission=self.commission,
             slippage=self.slippage
-        )
\ No newline at end of file
+        )
+        return self._finalize(result)
\ No newline at end of file
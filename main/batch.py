@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+import itertools
+import numpy as np
+import pandas as pd
+from strategies.moving_average import ma_crossover_position_matrix
+from main.nav import compute_nav
+from main.result import Result
+
+@dataclass
+class BatchResult:
+    """
+    Classe pour stocker les résultats d'un backtest évalué pour plusieurs jeux de paramètres à la fois
+    """
+    params: pd.DataFrame
+    positions: np.ndarray
+    nav: np.ndarray
+    data: pd.DataFrame
+    initial_capital: float
+    commission: float
+    slippage: float
+
+    def __post_init__(self):
+        if self.positions.shape != self.nav.shape:
+            raise ValueError("positions and nav attributes must share the same shape")
+        if self.positions.shape != (len(self.data), len(self.params)):
+            raise ValueError("positions must be a (n_dates, n_combinations) matrix")
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    def result(self, column: int) -> Result:
+        """
+        Construit l'objet Result d'une combinaison de paramètres
+
+        Parameters
+        ----------
+        column: int
+            indice de la combinaison dans params
+
+        Returns
+        ----------
+        Result
+            résultat du backtest pour cette combinaison
+        """
+        return Result(
+            positions=self.positions[:, column],
+            data=self.data,
+            initial_capital=self.initial_capital,
+            commission=self.commission,
+            slippage=self.slippage
+        )
+
+    def get_metrics(self, columns: Optional[Sequence[int]] = None, essential: bool = False) -> pd.DataFrame:
+        """
+        Calcule les métriques pour plusieurs combinaisons de paramètres
+
+        Parameters
+        ----------
+        columns: Sequence[int]
+            indices des combinaisons (toutes par défaut)
+        essential: bool
+            si True, seules les métriques essentielles sont calculées
+
+        Returns
+        ----------
+        DataFrame
+            une ligne par combinaison avec les paramètres puis les métriques
+        """
+        columns = range(len(self)) if columns is None else columns
+
+        rows = []
+        for column in columns:
+            result = self.result(column)
+            metrics = result.get_essential_metrics() if essential else result.get_all_metrics()
+            rows.append({**self.params.iloc[column].to_dict(), **metrics})
+
+        return pd.DataFrame(rows, index=pd.Index(list(columns), name='combination'))
+
+    def total_returns(self) -> pd.Series:
+        """
+        Rendement total de chaque combinaison, calculé directement sur la matrice de NAV
+
+        Returns
+        ----------
+        Series
+            rendement total (%) par combinaison
+        """
+        return pd.Series((self.nav[-1] / self.initial_capital - 1) * 100, index=self.params.index,
+                         name='Total Return (%)')
+
+def ma_crossover_batch(data: pd.DataFrame, short_windows: Sequence[int], long_windows: Sequence[int],
+                       grid: bool = True, initial_capital: float = 10000.0, commission: float = 0.001,
+                       slippage: float = 0.0, chunk_size: int = 1000) -> BatchResult:
+    """
+    Évalue la stratégie MA Crossover pour de nombreux couples de fenêtres en une passe vectorisée,
+    sans rebalancement (une décision à chaque date)
+
+    Parameters
+    ----------
+    data: DataFrame
+        série des données historiques avec un champ 'close'
+    short_windows: Sequence[int]
+        fenêtres des moyennes mobiles courtes
+    long_windows: Sequence[int]
+        fenêtres des moyennes mobiles longues
+    grid: bool
+        si True, toutes les combinaisons (courte, longue) sont évaluées, sinon les fenêtres
+        sont appariées deux à deux
+    initial_capital: float
+        capital initial
+    commission: float
+        commission appliquée
+    slippage: float
+        slippage appliqué
+    chunk_size: int
+        nombre de combinaisons traitées simultanément pour borner la mémoire intermédiaire
+
+    Returns
+    ----------
+    BatchResult
+        matrices des positions et des NAV (n_dates, n_combinaisons)
+    """
+    if grid:
+        pairs = list(itertools.product(short_windows, long_windows))
+    else:
+        if len(short_windows) != len(long_windows):
+            raise ValueError("short_windows and long_windows must share the same length when grid=False")
+        pairs = list(zip(short_windows, long_windows))
+
+    params = pd.DataFrame(pairs, columns=['short_window', 'long_window'])
+    prices = data['close'].values
+    # Rendements de Result.returns : prix manquants propagés
+    returns = data['close'].ffill().pct_change(fill_method=None).fillna(0).values
+
+    positions = np.empty((len(data), len(params)))
+    nav = np.empty((len(data), len(params)))
+    for start in range(0, len(params), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        positions[:, chunk] = ma_crossover_position_matrix(
+            prices,
+            params['short_window'].values[chunk],
+            params['long_window'].values[chunk]
+        )
+        nav[:, chunk] = compute_nav(returns, positions[:, chunk], initial_capital, commission, slippage)
+
+    return BatchResult(
+        params=params,
+        positions=positions,
+        nav=nav,
+        data=data,
+        initial_capital=initial_capital,
+        commission=commission,
+        slippage=slippage
+    )
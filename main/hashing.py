@@ -0,0 +1,21 @@
+import hashlib
+import pandas as pd
+
+def dataset_hash(data: pd.DataFrame) -> str:
+    """
+    Calcule une empreinte du contenu d'un DataFrame (index, colonnes et valeurs)
+
+    Parameters
+    ----------
+    data: DataFrame
+        série de données historiques
+
+    Returns
+    ----------
+    str
+        empreinte hexadécimale SHA-256
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(list(data.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,64 @@
+from typing import Callable, Tuple
+import numpy as np
+from strategies.compiled import NUMBA_AVAILABLE, njit
+
+# Pas de cache disque : l'index du cache référence le noyau reçu en argument et devient invalide
+# dès que le module du noyau est modifié
+@njit
+def run_event_loop(kernel: Callable, prices: np.ndarray, params: np.ndarray, state: np.ndarray,
+                   initial_capital: float, commission: float, slippage: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Boucle événementielle compilée : à chaque date, le noyau de la stratégie décide de la position
+    et la NAV est mise à jour dans la même itération, avec la convention de compute_nav
+    (rendement appliqué à la position décidée en i-2, coûts sur la variation entre i-2 et i-1)
+
+    Parameters
+    ----------
+    kernel: Callable
+        noyau (i, prices, params, state, current_position) -> position
+    prices: ndarray
+        prix de clôture
+    params: ndarray
+        paramètres de la stratégie
+    state: ndarray
+        état initial du noyau, mis à jour en place
+    initial_capital: float
+        capital initial
+    commission: float
+        commission appliquée
+    slippage: float
+        slippage appliqué
+
+    Returns
+    ----------
+    positions: ndarray
+        position à chaque date
+    nav: ndarray
+        NAV à chaque date, identique à compute_nav sur les mêmes positions
+    """
+    n = len(prices)
+    positions = np.zeros(n)
+    nav = np.empty(n)
+    position = 0.0
+    # Dernier prix connu : les prix manquants sont propagés comme dans Result (pct_change)
+    last_price = np.nan
+
+    for i in range(n):
+        position = kernel(i, prices, params, state, position)
+        positions[i] = position
+
+        if i == 0:
+            nav[i] = initial_capital
+        else:
+            price = prices[i] if prices[i] == prices[i] else last_price
+            asset_return = price / last_price - 1
+            if asset_return != asset_return:
+                asset_return = 0.0
+            held_position = positions[i - 2] if i >= 2 else 0.0
+            transaction_cost = abs(positions[i - 1] - held_position) * (commission + slippage)
+            nav[i] = nav[i - 1] * (1 + asset_return * held_position - transaction_cost)
+
+        if prices[i] == prices[i]:
+            last_price = prices[i]
+
+    return positions, nav
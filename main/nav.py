@@ -0,0 +1,99 @@
+from typing import Tuple
+import numpy as np
+
+def compute_nav(returns: np.ndarray, positions: np.ndarray, initial_capital: float,
+                commission: float, slippage: float) -> np.ndarray:
+    """
+    Calcule la NAV de manière vectorisée à partir des rendements de l'actif et des positions.
+    Reproduit exactement la boucle historique de Result.calculate_nav : à la date i, le rendement
+    est appliqué à la position décidée en i-2 et les coûts de transaction portent sur la variation
+    entre les positions décidées en i-2 et en i-1.
+
+    Parameters
+    ----------
+    returns: ndarray
+        rendements simples de l'actif (n_dates,), le premier étant ignoré
+    positions: ndarray
+        positions décidées à chaque date, (n_dates,) ou (n_dates, n_stratégies)
+    initial_capital: float
+        capital initial
+    commission: float
+        commission appliquée à chaque variation de position
+    slippage: float
+        slippage appliqué à chaque variation de position
+
+    Returns
+    ----------
+    ndarray
+        NAV de même forme que positions
+    """
+    positions = np.asarray(positions, dtype=float)
+    returns = np.asarray(returns, dtype=float)
+    if positions.ndim == 2 and returns.ndim == 1:
+        returns = returns[:, np.newaxis]
+
+    if len(positions) == 0:
+        return np.empty_like(positions)
+
+    previous_positions = np.zeros_like(positions)
+    previous_positions[1:] = positions[:-1]
+    held_positions = np.zeros_like(positions)
+    held_positions[2:] = positions[:-2]
+
+    transaction_costs = np.abs(previous_positions - held_positions) * (commission + slippage)
+
+    # Le premier facteur porte le capital initial pour que le produit cumulé soit évalué
+    # dans le même ordre que la boucle : nav[i] = nav[i-1] * facteur[i]
+    factors = 1 + returns * held_positions - transaction_costs
+    factors[0] = initial_capital
+
+    return np.cumprod(factors, axis=0)
+
+def compute_portfolio_nav(returns: np.ndarray, weights: np.ndarray, initial_capital: float,
+                          commission: float, slippage: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcule la NAV d'un portefeuille multi-actifs en une passe vectorisée, avec la même convention
+    de décalage que compute_nav : à la date i, les rendements des actifs sont appliqués aux poids
+    décidés en i-2 et les coûts portent sur la rotation entre les poids décidés en i-2 et en i-1.
+    Avec un seul actif, le résultat est identique à compute_nav.
+
+    Parameters
+    ----------
+    returns: ndarray
+        rendements simples des actifs (n_dates, n_actifs), la première ligne étant ignorée
+    weights: ndarray
+        poids décidés à chaque date (n_dates, n_actifs)
+    initial_capital: float
+        capital initial
+    commission: float
+        commission appliquée à chaque unité de poids échangée
+    slippage: float
+        slippage appliqué à chaque unité de poids échangée
+
+    Returns
+    ----------
+    nav: ndarray
+        NAV du portefeuille (n_dates,)
+    turnover: ndarray
+        rotation du portefeuille à chaque date, somme des variations absolues des poids (n_dates,)
+    """
+    weights = np.asarray(weights, dtype=float)
+    returns = np.asarray(returns, dtype=float)
+    if weights.shape != returns.shape or weights.ndim != 2:
+        raise ValueError("returns and weights must be (n_dates, n_assets) matrices of the same shape")
+
+    if len(weights) == 0:
+        return np.empty(0), np.empty(0)
+
+    previous_weights = np.zeros_like(weights)
+    previous_weights[1:] = weights[:-1]
+    held_weights = np.zeros_like(weights)
+    held_weights[2:] = weights[:-2]
+
+    turnover = np.abs(previous_weights - held_weights).sum(axis=1)
+    portfolio_returns = (returns * held_weights).sum(axis=1)
+
+    factors = 1 + portfolio_returns - turnover * (commission + slippage)
+    factors[0] = initial_capital
+
+    return np.cumprod(factors), turnover
@@ -0,0 +1,213 @@
+from dataclasses import dataclass
+from typing import Dict, Mapping, Sequence, Union
+import numpy as np
+import pandas as pd
+from stats import core_metrics, tail_metrics, performance_metrics
+from strategies.strategy_constructor import PortfolioStrategy
+from main.scheduler import resolve_rule, rebalancing_mask
+from main.nav import compute_portfolio_nav
+
+WeightsLike = Union[PortfolioStrategy, pd.DataFrame, np.ndarray, Mapping[str, float], Sequence[float]]
+
+def align_prices(data: Mapping[str, pd.DataFrame], column: str = 'close', join: str = 'outer',
+                 normalize_daily: bool = True) -> pd.DataFrame:
+    """
+    Aligne les prix de plusieurs actifs dans une matrice (dates en lignes, actifs en colonnes).
+    Les prix manquants après la première cotation d'un actif sont propagés ; avant, ils restent NaN.
+
+    Parameters
+    ----------
+    data: Mapping[str, DataFrame]
+        données historiques de chaque actif, avec un champ column
+    column: str
+        champ de prix utilisé
+    join: str
+        'outer' pour conserver toutes les dates, 'inner' pour les seules dates communes
+    normalize_daily: bool
+        si True, les horodatages des actifs ayant au plus une observation par jour sont ramenés
+        à minuit, pour aligner des séries quotidiennes dont l'heure de clôture diffère
+
+    Returns
+    ----------
+    DataFrame
+        matrice des prix alignés
+    """
+    if join not in ('outer', 'inner'):
+        raise ValueError("join must be 'outer' or 'inner'")
+    if not data:
+        raise ValueError("data must contain at least one asset")
+
+    for asset, asset_data in data.items():
+        if column not in asset_data.columns:
+            raise ValueError(f"data of asset {asset} must contain a '{column}' field")
+
+    series = {}
+    for asset, asset_data in data.items():
+        asset_prices = asset_data[column].copy()
+        asset_prices.index = pd.to_datetime(asset_prices.index)
+        if normalize_daily and asset_prices.index.normalize().is_unique:
+            asset_prices.index = asset_prices.index.normalize()
+        series[asset] = asset_prices
+
+    prices = pd.concat(series, axis=1, join=join)
+    return prices.sort_index().ffill().astype(float)
+
+@dataclass
+class PortfolioResult:
+    """
+    Classe pour stocker et analyser les résultats d'un backtest de portefeuille multi-actifs
+    """
+    weights: pd.DataFrame
+    prices: pd.DataFrame
+    initial_capital: float
+    commission: float
+    slippage: float
+
+    def __post_init__(self):
+        if self.weights.shape != self.prices.shape:
+            raise ValueError("weights and prices attributes must share the same shape")
+
+        self.returns = self.prices.pct_change(fill_method=None).fillna(0)
+
+        nav, turnover = compute_portfolio_nav(
+            self.returns.values,
+            self.weights.values,
+            self.initial_capital,
+            self.commission,
+            self.slippage
+        )
+        self.nav = pd.Series(nav, index=self.prices.index, dtype=float)
+        self.turnover = pd.Series(turnover, index=self.prices.index, dtype=float)
+        # Coûts en capital : la rotation est payée sur la NAV de la date précédente
+        self.costs = self.turnover * (self.commission + self.slippage) * self.nav.shift(1).fillna(0)
+
+        self.N = 252
+
+    def get_essential_metrics(self) -> Dict[str, float]:
+        """
+        Retourne les métriques essentielles du backtest de portefeuille
+
+        Returns
+        ----------
+        dict
+            dictionnaire avec le nom des métriques essentielles en clé et les métriques en valeurs
+        """
+        nav_returns = self.nav.pct_change().fillna(0)
+
+        return {
+            'Total Return (%)': (self.nav.iloc[-1] / self.initial_capital - 1) * 100,
+            'Annualized Return (%)': core_metrics.annualized_return(nav_returns, self.N) * 100,
+            'Volatility (%)': core_metrics.annualized_std(nav_returns, self.N) * 100,
+            'Sharpe Ratio': performance_metrics.sharpe_ratio(nav_returns, 0, self.N),
+            'Maximum Drawdown (%)': tail_metrics.max_drawdown(self.nav) * 100,
+            'Sortino Ratio': performance_metrics.sortino_ratio(nav_returns, 0, self.N),
+            'Annualized Turnover': self.turnover.mean() * self.N,
+            'Total Costs': self.costs.sum()
+        }
+
+    def asset_contributions(self) -> pd.DataFrame:
+        """
+        Contribution de chaque actif au rendement du portefeuille à chaque date, hors coûts
+
+        Returns
+        ----------
+        DataFrame
+            rendement de l'actif multiplié par le poids détenu (décidé deux dates plus tôt)
+        """
+        held_weights = self.weights.shift(2).fillna(0)
+        return self.returns * held_weights
+
+@dataclass
+class PortfolioBacktester:
+    """
+    Classe permettant de backtester des stratégies multi-actifs sur une matrice de prix alignée
+    """
+    data: Union[Mapping[str, pd.DataFrame], pd.DataFrame]
+    initial_capital: float = 10000.0
+    commission: float = 0.001
+    slippage: float = 0.0
+    rebalancing_frequency: str = 'D'
+    join: str = 'outer'
+    max_leverage: float = 1.0
+
+    def __post_init__(self):
+        resolve_rule(self.rebalancing_frequency)
+
+        if isinstance(self.data, pd.DataFrame):
+            self.prices = self.data.copy()
+            self.prices.index = pd.to_datetime(self.prices.index)
+            self.prices = self.prices.sort_index().ffill().astype(float)
+        else:
+            self.prices = align_prices(self.data, join=self.join)
+
+        self.assets = list(self.prices.columns)
+
+    def _rebalancing_mask(self) -> np.ndarray:
+        """
+        Indique les dates auxquelles le portefeuille est rebalancé (voir main.scheduler)
+        """
+        return rebalancing_mask(self.prices.index, self.rebalancing_frequency)
+
+    def _target_weights(self, weights: WeightsLike) -> pd.DataFrame:
+        """
+        Convertit les poids fournis en matrice (dates × actifs)
+        """
+        if isinstance(weights, PortfolioStrategy):
+            weights.fit(self.prices)
+            weights = weights.get_weights(self.prices)
+
+        if isinstance(weights, pd.DataFrame):
+            weights = weights.reindex(index=self.prices.index, columns=self.assets)
+        elif isinstance(weights, Mapping):
+            unknown = set(weights) - set(self.assets)
+            if unknown:
+                raise ValueError(f"Unknown assets: {', '.join(sorted(unknown))}")
+            weights = pd.DataFrame([[weights.get(asset, 0.0) for asset in self.assets]] * len(self.prices),
+                                   index=self.prices.index, columns=self.assets)
+        else:
+            weights = np.asarray(weights, dtype=float)
+            if weights.ndim == 1:
+                weights = np.broadcast_to(weights, self.prices.shape)
+            if weights.shape != self.prices.shape:
+                raise ValueError(f"weights must be a vector of {len(self.assets)} weights or a "
+                                 f"{self.prices.shape} matrix")
+            weights = pd.DataFrame(weights, index=self.prices.index, columns=self.assets)
+
+        # Un actif non coté ne peut pas être détenu
+        return weights.astype(float).fillna(0.0).where(self.prices.notna(), 0.0)
+
+    def run(self, weights: WeightsLike) -> PortfolioResult:
+        """
+        Exécute le backtest du portefeuille. Les poids sont décidés aux dates de rebalancement
+        et conservés jusqu'au rebalancement suivant ; comme les positions du Backtester, ce sont
+        des expositions cibles maintenues à chaque date (la dérive des poids n'est pas modélisée).
+
+        Parameters
+        ----------
+        weights: PortfolioStrategy, DataFrame, ndarray, dict ou liste
+            stratégie multi-actifs, matrice de poids (dates × actifs), ou vecteur de poids constants
+            (dict indexé par actif ou séquence dans l'ordre des colonnes)
+
+        Returns
+        ----------
+        PortfolioResult
+            instance de la classe PortfolioResult avec les poids, les prix, le capital initial,
+            la commission et le slippage
+        """
+        target_weights = self._target_weights(weights)
+
+        mask = self._rebalancing_mask()
+        if not mask.all():
+            target_weights = target_weights.where(pd.Series(mask, index=target_weights.index), axis=0).ffill()
+
+        gross_exposure = target_weights.abs().sum(axis=1)
+        if (gross_exposure > self.max_leverage + 1e-12).any():
+            raise ValueError(f"Gross exposure must not exceed max_leverage ({self.max_leverage})")
+
+        return PortfolioResult(
+            weights=target_weights,
+            prices=self.prices,
+            initial_capital=self.initial_capital,
+            commission=self.commission,
+            slippage=self.slippage
+        )
@@ -0,0 +1,196 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# Pics mémoire des mesures en cours (étapes et profile_run), mis à jour avant chaque remise à zéro
+# du pic de tracemalloc pour qu'une étape imbriquée n'efface pas le pic des mesures englobantes
+_peak_watchers: List[List[int]] = []
+
+def _watch_peak() -> List[int]:
+    """
+    Remet à zéro le pic de tracemalloc après l'avoir reporté dans les mesures en cours,
+    puis enregistre une nouvelle mesure
+    """
+    peak = tracemalloc.get_traced_memory()[1]
+    for watcher in _peak_watchers:
+        watcher[0] = max(watcher[0], peak)
+    tracemalloc.reset_peak()
+    watcher = [0]
+    _peak_watchers.append(watcher)
+    return watcher
+
+def _unwatch_peak(watcher: List[int]) -> int:
+    """
+    Termine une mesure et renvoie son pic
+    """
+    _peak_watchers.remove(watcher)
+    return max(watcher[0], tracemalloc.get_traced_memory()[1])
+
+class Profiler:
+    """
+    Instrumentation optionnelle d'un backtest : temps réel et temps CPU de chaque étape, compteurs
+    (appels de get_position, taille des historiques) et pic mémoire par étape si trace_memory.
+    Chaque étape terminée est aussi émise comme événement de log structuré (attributs event, stage, ...).
+    Désactivé, le profileur ne mesure rien et ses méthodes retournent immédiatement.
+    """
+    def __init__(self, enabled: bool = True, trace_memory: bool = False):
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.observations: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Mesure l'étape name ; les mesures d'une étape exécutée plusieurs fois sont cumulées
+
+        Parameters
+        ----------
+        name: str
+            nom de l'étape
+        """
+        if not self.enabled:
+            yield
+            return
+
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        watcher = _watch_peak() if self.trace_memory else None
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+
+            stage = self.stages.setdefault(name, {'wall_time': 0.0, 'cpu_time': 0.0, 'calls': 0})
+            stage['wall_time'] += wall
+            stage['cpu_time'] += cpu
+            stage['calls'] += 1
+
+            event = {'event': 'backtest_stage', 'stage': name, 'wall_time': wall, 'cpu_time': cpu}
+            if self.trace_memory:
+                peak = _unwatch_peak(watcher)
+                stage['peak_memory'] = max(stage.get('peak_memory', 0), peak)
+                event['peak_memory'] = peak
+                if started_tracing:
+                    tracemalloc.stop()
+
+            logger.info("stage=%s wall_time=%.6fs cpu_time=%.6fs", name, wall, cpu, extra=event)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float) -> None:
+        """
+        Enregistre une valeur (par exemple la taille d'un historique) dont on suit le nombre, la somme et le maximum
+        """
+        if not self.enabled:
+            return
+        observation = self.observations.get(name)
+        if observation is None:
+            self.observations[name] = {'count': 1, 'total': value, 'max': value}
+        else:
+            observation['count'] += 1
+            observation['total'] += value
+            observation['max'] = max(observation['max'], value)
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Returns
+        ----------
+        dict
+            'stages' (temps réel, temps CPU, nombre d'appels et pic mémoire de chaque étape),
+            'counters' et 'observations' (nombre, somme, moyenne et maximum)
+        """
+        observations = {
+            name: {**values, 'mean': values['total'] / values['count']}
+            for name, values in self.observations.items()
+        }
+        return {
+            'stages': {name: dict(values) for name, values in self.stages.items()},
+            'counters': dict(self.counters),
+            'observations': observations
+        }
+
+    def log_summary(self) -> None:
+        if self.enabled:
+            summary = ' '.join(f"{name}={stage['wall_time']:.6f}s" for name, stage in self.stages.items())
+            logger.info("backtest profile %s", summary, extra={'event': 'backtest_profile', **self.report()})
+
+DISABLED_PROFILER = Profiler(enabled=False)
+
+@contextmanager
+def profile_run(output_dir: str, name: str = 'backtest', sort: str = 'cumulative',
+                limit: int = 30, trace_memory: bool = True) -> Iterator[cProfile.Profile]:
+    """
+    Exécute le bloc sous cProfile (et tracemalloc si trace_memory) puis enregistre les rapports :
+    <name>.prof (lisible par pstats ou snakeviz), <name>.txt (fonctions les plus coûteuses)
+    et <name>.memory.txt (lignes allouant le plus de mémoire et pic mémoire)
+
+    Parameters
+    ----------
+    output_dir: str
+        dossier des rapports
+    name: str
+        préfixe des fichiers
+    sort: str
+        clé de tri des statistiques de cProfile
+    limit: int
+        nombre de lignes des rapports texte
+    trace_memory: bool
+        si True, les allocations sont suivies avec tracemalloc
+
+    Returns
+    ----------
+    Profile
+        profileur cProfile actif dans le bloc
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, name)
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    # Les étapes remettent le pic à zéro : celui du bloc est suivi comme une mesure englobante
+    watcher = _watch_peak() if trace_memory else None
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(f'{base}.prof')
+
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats(sort).print_stats(limit)
+        with open(f'{base}.txt', 'w') as file:
+            file.write(text.getvalue())
+
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            current = tracemalloc.get_traced_memory()[0]
+            peak = _unwatch_peak(watcher)
+            if started_tracing:
+                tracemalloc.stop()
+            with open(f'{base}.memory.txt', 'w') as file:
+                file.write(f'current: {current} bytes\npeak: {peak} bytes\n\n')
+                for statistic in snapshot.statistics('lineno')[:limit]:
+                    file.write(f'{statistic}\n')
+
+        logger.info("profile reports written to %s", output_dir,
+                    extra={'event': 'profile_reports', 'path': base})
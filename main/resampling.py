@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import threading
+import numpy as np
+import pandas as pd
+from main.scheduler import period_keys
+
+# Colonnes agrégées déjà calculées (tableaux en lecture seule), indexées par (empreinte du jeu de données, fréquence)
+_CACHE: "OrderedDict[Tuple[str, str], Dict[str, np.ndarray]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+MAX_CACHE_ENTRIES = 32
+MAX_CACHE_MEMORY_MB = 256
+
+def period_ids(index: pd.DatetimeIndex, freq: str) -> np.ndarray:
+    """
+    Numéro de la période de chaque date (0 pour la première période), l'index étant trié
+    """
+    keys = period_keys(pd.DatetimeIndex(index), freq)
+    changes = np.ones(len(keys), dtype=np.int64)
+    changes[1:] = keys[1:] != keys[:-1]
+    return np.cumsum(changes) - 1
+
+def _resampled_columns(data: pd.DataFrame, freq: str) -> Dict[str, np.ndarray]:
+    """
+    Colonnes open, high, low, close et, si elle existe, volume de causal_resample
+    """
+    ids = period_ids(data.index, freq)
+    starts = np.flatnonzero(np.diff(ids, prepend=-1))
+    close = data['close'].ffill()
+
+    def column(name: str) -> pd.Series:
+        return data[name] if name in data.columns else close
+
+    # Maxima cumulés par période des plus hauts et des opposés des plus bas, en un seul groupby
+    extremes = pd.DataFrame({'high': column('high').values, 'low': -column('low').values}).groupby(ids).cummax()
+
+    columns = {
+        'open': column('open').values[starts][ids],
+        'high': extremes['high'].values,
+        'low': -extremes['low'].values,
+        'close': close.values
+    }
+    if 'volume' in data.columns:
+        volume = data['volume'].fillna(0).values
+        cumulative = np.cumsum(volume)
+        columns['volume'] = cumulative - (cumulative[starts] - volume[starts])[ids]
+    return columns
+
+def _assemble(data: pd.DataFrame, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    # Chaque appel reçoit sa propre copie : modifier le résultat ne touche ni data ni le cache
+    resampled = data.copy()
+    for name, values in columns.items():
+        resampled[name] = values
+    return resampled
+
+def causal_resample(data: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """
+    Agrégats OHLCV de la période en cours calculés en une passe vectorisée, sans information future :
+    à chaque date, open est la première ouverture de la période, high et low les extrêmes atteints
+    depuis le début de la période, close le dernier prix connu et volume le volume cumulé depuis
+    le début de la période. Les colonnes open, high et low absentes sont déduites de close ;
+    les autres colonnes sont conservées telles quelles.
+
+    Parameters
+    ----------
+    data: DataFrame
+        série de données historiques avec au moins une colonne 'close', indexée par des dates triées
+    freq: str
+        fréquence pandas des périodes (voir main.scheduler.period_keys)
+
+    Returns
+    ----------
+    DataFrame
+        agrégats partiels de la période à chaque date, même index que data
+    """
+    return _assemble(data, _resampled_columns(data, freq))
+
+def _cache_memory() -> int:
+    return sum(values.nbytes for columns in _CACHE.values() for values in columns.values())
+
+def cached_causal_resample(data: pd.DataFrame, freq: str, dataset_key: Optional[str]) -> pd.DataFrame:
+    """
+    causal_resample mémorisé par (dataset_key, freq) : les backtests successifs sur les mêmes données
+    et la même fréquence (par exemple ceux d'un ParameterSweep) réutilisent les agrégats.
+    Seules les colonnes agrégées sont mémorisées, en lecture seule ; le cache garde les derniers agrégats
+    utilisés dans la limite de MAX_CACHE_ENTRIES entrées et MAX_CACHE_MEMORY_MB Mo. Sans dataset_key
+    rien n'est mémorisé.
+
+    Parameters
+    ----------
+    data: DataFrame
+        série de données historiques
+    freq: str
+        fréquence pandas des périodes
+    dataset_key: str
+        empreinte de data (voir main.hashing.dataset_hash)
+
+    Returns
+    ----------
+    DataFrame
+        agrégats partiels de la période à chaque date, nouvelle copie à chaque appel
+    """
+    if dataset_key is None:
+        return causal_resample(data, freq)
+
+    key = (dataset_key, freq)
+    with _CACHE_LOCK:
+        columns = _CACHE.get(key)
+        if columns is not None:
+            _CACHE.move_to_end(key)
+
+    if columns is None:
+        columns = _resampled_columns(data, freq)
+        for values in columns.values():
+            values.setflags(write=False)
+        with _CACHE_LOCK:
+            _CACHE[key] = columns
+            while len(_CACHE) > 1 and (len(_CACHE) > MAX_CACHE_ENTRIES
+                                       or _cache_memory() > MAX_CACHE_MEMORY_MB * 1024 ** 2):
+                _CACHE.popitem(last=False)
+    return _assemble(data, columns)
+
+def clear_resample_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
@@ -1,71 +1,190 @@
-from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Union
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
-from stats import core_metrics, tail_metrics, performance_metrics
+from stats.metrics_engine import compute_metrics, ESSENTIAL_METRICS, ADDITIONAL_METRICS
+from stats import rolling, drawdowns, bootstrap, trades
+from main.nav import compute_nav
+from main.profiling import Profiler, DISABLED_PROFILER
 import plotly.graph_objects as go #type: ignore
 from plotly.subplots import make_subplots #type: ignore
 import seaborn as sns
 
-@dataclass
+PositionsLike = Union[pd.DataFrame, pd.Series, np.ndarray, Sequence[float]]
+
+def compact_positions(positions: np.ndarray) -> np.ndarray:
+    """
+    Stocke les positions sur le plus petit type sans perte : int8 pour des positions entières
+    (-1, 0 ou 1), float32 si elles y sont représentables exactement, float64 sinon
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    for dtype in (np.int8, np.float32):
+        compact = positions.astype(dtype)
+        if np.array_equal(compact, positions):
+            return compact
+    return positions
+
 class Result:
     """
-    Classe pour stocker et analyser les résultats d'un backtest
+    Classe pour stocker et analyser les résultats d'un backtest.
+    Les prix et l'index sont des références partagées vers data (aucune copie) ; seules les positions
+    (int8 ou float32 lorsque c'est sans perte) et la NAV (au type des prix de clôture par défaut) sont stockées.
+    Les séries pandas positions, returns et nav sont construites à chaque accès (les rendements de l'actif
+    sont calculés une seule fois), et release_arrays
+    libère les tableaux par date en ne conservant que les métriques.
     """
-    positions: pd.DataFrame
-    data: pd.DataFrame
-    initial_capital: float
-    commission: float
-    slippage: float
-    
-    def __post_init__(self):
+    def __init__(self, positions: PositionsLike, data: pd.DataFrame, initial_capital: float,
+                 commission: float, slippage: float, precomputed_nav: Optional[np.ndarray] = None,
+                 profiler: Optional[Profiler] = None, dtype: Optional[str] = None):
         """
-        Initialise les calculs de base après la création de l'instance
+        Parameters
+        ----------
+        positions: DataFrame, Series ou ndarray
+            position décidée à chaque date (colonne 'position' pour un DataFrame)
+        data: DataFrame
+            série de données historiques avec au moins une colonne 'close', référencée sans copie
+        initial_capital: float
+            capital initial
+        commission: float
+            commission appliquée à chaque variation de position
+        slippage: float
+            slippage appliqué à chaque variation de position
+        precomputed_nav: ndarray
+            NAV déjà calculée (par exemple par la boucle compilée du Backtester)
+        profiler: Profiler
+            instrumentation des calculs de Result
+        dtype: str
+            type de stockage de la NAV ('float32' ou 'float64'), par défaut celui des prix de clôture
         """
-        if not isinstance(self.positions, pd.DataFrame) or 'position' not in self.positions.columns:
-            raise ValueError("positions attribute must be a DataFrame with a 'position' field")
+        if isinstance(positions, pd.DataFrame):
+            if 'position' not in positions.columns:
+                raise ValueError("positions attribute must be a DataFrame with a 'position' field")
+            positions = positions['position']
+        positions = np.asarray(positions, dtype=np.float64)
             
-        if not isinstance(self.data, pd.DataFrame) or 'close' not in self.data.columns:
+        if not isinstance(data, pd.DataFrame) or 'close' not in data.columns:
             raise ValueError("data attribute must be a DataFrame with a 'close' field")
             
-        if len(self.positions) != len(self.data):
+        if len(positions) != len(data):
             raise ValueError("positions and data attributes must share the same length")
             
-        if not (-1 <= self.positions['position']).all() or not (self.positions['position'] <= 1).all():
+        if not (-1 <= positions).all() or not (positions <= 1).all():
             raise ValueError("Positions must belong to [-1,1]")
         
-        self.data.index = pd.to_datetime(self.data.index)
-        self.positions.index = pd.to_datetime(self.positions.index)
-        
-        self.returns = self.data['close'].pct_change().fillna(0)
-        
-        self.calculate_nav()
+        if dtype is None:
+            dtype = 'float32' if data['close'].dtype == np.float32 else 'float64'
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise ValueError("dtype must be 'float32' or 'float64'")
         
+        data.index = pd.to_datetime(data.index)
+        self._data = data
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+        self.profiler = profiler
+        self.dtype = dtype
         self.N = 252
+        self._positions = compact_positions(positions)
+        self._returns: Optional[np.ndarray] = None
+        self._trades = None
+        self._metrics: Dict[str, float] = {}
+        self._trade_statistics = None
         
-    def calculate_nav(self):
+        if precomputed_nav is None:
+            with self._stage('calculate_nav'):
+                self.calculate_nav(positions)
+        else:
+            if len(precomputed_nav) != len(data):
+                raise ValueError("precomputed_nav and data attributes must share the same length")
+            self._nav = np.asarray(precomputed_nav, dtype=dtype)
+    
+    def _arrays(self) -> None:
+        if self._data is None:
+            raise ValueError("Per-bar arrays were released with release_arrays; only metrics are available")
+    
+    @property
+    def data(self) -> pd.DataFrame:
+        self._arrays()
+        return self._data
+    
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return self.data.index
+    
+    @property
+    def positions(self) -> pd.DataFrame:
         """
-        Calcule la série de NAV en tenant compte des positions, commissions et slippage
+        Positions décidées à chaque date (colonne 'position'), construites à partir du tableau compact
         """
-
-        self.nav = pd.Series(index=self.data.index, dtype=float)
-        self.nav.iloc[0] = self.initial_capital
-        
-        prev_position = 0
+        self._arrays()
+        return pd.DataFrame({'position': self._positions.astype(np.float64)}, index=self._data.index)
+    
+    @property
+    def returns(self) -> pd.Series:
+        """
+        Rendements de l'actif, les prix manquants étant propagés ; calculés une seule fois
+        """
+        self._arrays()
+        if self._returns is None:
+            self._returns = self._data['close'].ffill().pct_change(fill_method=None).fillna(0).values
+        return pd.Series(self._returns, index=self._data.index, name='close', copy=False)
+    
+    @property
+    def nav(self) -> pd.Series:
+        self._arrays()
+        return pd.Series(self._nav, index=self._data.index, copy=False)
+    
+    @property
+    def nbytes(self) -> int:
+        """
+        Mémoire propre du résultat en octets (positions, NAV, rendements et registre des transactions),
+        hors données partagées
+        """
+        if self._data is None:
+            return 0
+        nbytes = self._positions.nbytes + self._nav.nbytes
+        nbytes += self._returns.nbytes if self._returns is not None else 0
+        return nbytes + (self._trades.nbytes if self._trades is not None else 0)
         
-        for i in range(1, len(self.nav)):
-            current_position = self.positions['position'].iloc[i-1]
-            
-            ret = self.returns.iloc[i] * prev_position
-            
-            if current_position != prev_position:
-                transaction_cost = abs(current_position - prev_position) * (self.commission + self.slippage)
-            else:
-                transaction_cost = 0
-                
-            self.nav.iloc[i] = self.nav.iloc[i-1] * (1 + ret - transaction_cost)
-            
-            prev_position = current_position
+    def calculate_nav(self, positions: Optional[np.ndarray] = None):
+        """
+        Calcule la série de NAV en tenant compte des positions, commissions et slippage ;
+        les métriques et le registre des transactions mémorisés sont recalculés au prochain accès
+        """
+        self._arrays()
+        nav = compute_nav(
+            self.returns.values,
+            self._positions if positions is None else positions,
+            self.initial_capital,
+            self.commission,
+            self.slippage
+        )
+        self._nav = nav.astype(self.dtype, copy=False)
+        self._metrics = {}
+        self._trade_statistics = None
+        self._trades = None
+    
+    def release_arrays(self, all_metrics: bool = True) -> 'Result':
+        """
+        Calcule et conserve les métriques puis libère les tableaux par date (positions, NAV, registre
+        des transactions et référence aux données) : utile pour garder des milliers de résultats en mémoire.
+        Les méthodes nécessitant les séries lèvent ensuite une ValueError.
+
+        Parameters
+        ----------
+        all_metrics: bool
+            si True, toutes les métriques sont conservées, sinon seulement les métriques essentielles
+
+        Returns
+        ----------
+        Result
+            le résultat lui-même
+        """
+        if self._data is not None:
+            self._compute_metrics(essential=not all_metrics)
+            self.trade_statistics()
+            self._data = self._positions = self._nav = self._returns = self._trades = None
+        return self
         
     def get_essential_metrics(self) -> Dict[str, float]:
         """
@@ -76,20 +195,7 @@ class Result:
         dict
             dictionnaire avec le nom des métriques essentielles en clé et les métriques en valeurs
         """
-        nav_returns = self.nav.pct_change().fillna(0)
-        
-        positions_series = pd.Series(self.positions['position'].values, index=self.data.index)
-        
-        return {
-            'Total Return (%)': (self.nav.iloc[-1] / self.initial_capital - 1) * 100,
-            'Annualized Return (%)': core_metrics.annualized_return(nav_returns, self.N) * 100,
-            'Volatility (%)': core_metrics.annualized_std(nav_returns, self.N) * 100,
-            'Sharpe Ratio': performance_metrics.sharpe_ratio(nav_returns, 0, self.N),
-            'Maximum Drawdown (%)': tail_metrics.max_drawdown(self.nav) * 100,
-            'Sortino Ratio': performance_metrics.sortino_ratio(nav_returns, 0, self.N),
-            'Number of Trades': core_metrics.count_trades(positions_series),
-            'Winning Trades (%)': core_metrics.winning_trades_percentage(positions_series,self.returns) * 100
-        }
+        return self._compute_metrics(essential=True)
         
     def get_all_metrics(self) -> Dict[str, float]:
         """
@@ -100,26 +206,172 @@ class Result:
         dict
             dictionnaire avec le nom de toutes les métriques en clé et les métriques en valeurs
         """
+        return self._compute_metrics(essential=False)
+    
+    @property
+    def timings(self) -> Dict[str, dict]:
+        """
+        Mesures des étapes du backtest et des calculs de Result (vide si le profilage n'est pas activé)
 
-        nav_returns = self.nav.pct_change().fillna(0)
-        
-        metrics = self.get_essential_metrics()
+        Returns
+        ----------
+        dict
+            'stages' (temps réel, temps CPU et pic mémoire de chaque étape), 'counters' et 'observations'
+        """
+        return self.profiler.report() if self.profiler is not None else {}
+    
+    def _stage(self, name: str):
+        return (self.profiler or DISABLED_PROFILER).stage(name)
+    
+    def _compute_metrics(self, essential: bool) -> Dict[str, float]:
+        # Métriques mémorisées : toujours disponibles après release_arrays
+        names = ESSENTIAL_METRICS if essential else ESSENTIAL_METRICS + ADDITIONAL_METRICS
+        if all(name in self._metrics for name in names):
+            return {name: self._metrics[name] for name in names}
         
-        additional_metrics = {
-            'CAGR (%)': core_metrics.annualized_cagr(nav_returns, self.N) * 100,
-            'Skewness': tail_metrics.skewness(nav_returns),
-            'Kurtosis': tail_metrics.kurtosis(nav_returns),
-            'Adjusted Sharpe Ratio': performance_metrics.adjusted_sharpe_ratio(nav_returns, 0, self.N),
-            'Calmar Ratio': performance_metrics.calmar_ratio(nav_returns, self.nav, self.N),
-            'Pain Ratio': performance_metrics.pain_ratio(nav_returns, self.nav, self.N),
-            'VaR Ratio': performance_metrics.var_ratio(nav_returns, self.N),
-            'CVaR Ratio': performance_metrics.cvar_ratio(nav_returns, self.N),
-            'Gain to Pain Ratio': performance_metrics.gain_to_pain_ratio(nav_returns)
-        }
+        trade_stats = self.trade_statistics()
+        with self._stage('metrics'):
+            self._metrics.update(compute_metrics(
+                self._nav,
+                self._positions,
+                self.returns.values,
+                self.initial_capital,
+                self.N,
+                essential=essential,
+                trade_stats=trade_stats
+            ))
+        return {name: self._metrics[name] for name in names}
+    
+    def trades(self) -> np.ndarray:
+        """
+        Retourne le registre des transactions du backtest, construit une seule fois
+
+        Returns
+        ----------
+        ndarray
+            tableau structuré avec pour chaque transaction les dates et prix d'entrée et de sortie,
+            le sens, la taille, la durée de détention, le P&L brut et net et les coûts
+        """
+        if self._trades is None:
+            with self._stage('trades'):
+                self._trades = trades.trade_ledger(
+                    self._positions,
+                    self.data['close'].values,
+                    self._nav,
+                    self._data.index,
+                    self.commission,
+                    self.slippage
+                )
+        return self._trades
+    
+    def trade_statistics(self) -> Dict[str, float]:
+        """
+        Retourne les statistiques des transactions du backtest
+
+        Returns
+        ----------
+        dict
+            nombre de transactions, taux de transactions gagnantes, profit factor,
+            durée moyenne de détention (en périodes) et espérance de P&L par transaction
+        """
+        if self._trade_statistics is None:
+            self._trade_statistics = trades.trade_statistics(self.trades())
+        return dict(self._trade_statistics)
+    
+    def rolling_metrics(self, window: int = 63) -> pd.DataFrame:
+        """
+        Calcule les métriques glissantes du backtest en O(n)
+
+        Parameters
+        ----------
+        window: int
+            taille de la fenêtre glissante (par défaut 63 périodes)
+
+        Returns
+        ----------
+        DataFrame
+            volatilité, ratios de Sharpe et de Sortino, skewness, kurtosis et drawdown glissants à chaque date
+        """
+        nav_returns = self.nav.pct_change().fillna(0)
+        moments = rolling.rolling_moments(nav_returns, window)
         
-        metrics.update(additional_metrics)
+        return pd.DataFrame({
+            'Volatility (%)': moments['std'] * np.sqrt(self.N) * 100,
+            'Sharpe Ratio': moments['mean'] * self.N / (moments['std'] * np.sqrt(self.N)),
+            'Sortino Ratio': rolling.rolling_sortino_ratio(nav_returns, window, 0, self.N),
+            'Skewness': moments['skewness'],
+            'Kurtosis': moments['kurtosis'],
+            'Drawdown (%)': rolling.rolling_drawdown(self.nav, window) * 100
+        }, index=self.nav.index)
+    
+    def worst_drawdowns(self, n: int = 5) -> pd.DataFrame:
+        """
+        Retourne les n pires épisodes de drawdown du backtest
 
-        return metrics
+        Parameters
+        ----------
+        n: int
+            nombre d'épisodes (par défaut 5)
+
+        Returns
+        ----------
+        DataFrame
+            dates du plus haut, du creux et du retour au plus haut, profondeur et durées de chaque épisode
+        """
+        return drawdowns.worst_drawdowns(self.nav, n)
+    
+    def max_drawdown_duration(self) -> float:
+        """
+        Retourne la durée du plus long épisode de drawdown
+
+        Returns
+        ----------
+        float
+            durée en années
+        """
+        return drawdowns.max_drawdown_duration(self.nav) / self.N
+    
+    def bootstrap_metrics(self, method: str = 'stationary', n_paths: int = 1000, block_size: float = 20,
+                          confidence: float = 0.95, seed: Optional[int] = None,
+                          max_workers: Optional[int] = 1) -> pd.DataFrame:
+        """
+        Intervalles de confiance des principales métriques par rééchantillonnage des rendements de la NAV
+
+        Parameters
+        ----------
+        method: str
+            'stationary', 'block' ou 'trades' (voir stats.bootstrap.bootstrap_metrics)
+        n_paths: int
+            nombre de trajectoires simulées
+        block_size: float
+            longueur (moyenne pour le bootstrap stationnaire) des blocs
+        confidence: float
+            niveau de confiance des intervalles
+        seed: int
+            graine du générateur aléatoire
+        max_workers: int
+            nombre de processus (1 pour une exécution séquentielle, None pour tous les cœurs)
+
+        Returns
+        ----------
+        DataFrame
+            valeur observée, moyenne, écart-type et bornes de l'intervalle de confiance de chaque métrique
+        """
+        nav_returns = self.nav.pct_change().fillna(0)
+        # Le rendement de la date i est obtenu avec la position décidée en i-2
+        held_positions = self.positions['position'].shift(2).fillna(0).values
+        
+        return bootstrap.bootstrap_metrics(
+            nav_returns,
+            method=method,
+            n_paths=n_paths,
+            block_size=block_size,
+            positions=held_positions,
+            confidence=confidence,
+            N=self.N,
+            seed=seed,
+            max_workers=max_workers
+        )
     
     def plot(self, what: str = 'nav', backend: str = 'matplotlib'):
         """
@@ -245,12 +497,14 @@ class Result:
             raise ValueError("At least one Result object must be provided")
             
         if metrics is None:
-            all_metrics = results[0].get_essential_metrics()
-            metrics = list(all_metrics.keys())
+            metrics = ESSENTIAL_METRICS
+        
+        # Les métriques complémentaires ne sont calculées que si elles sont demandées
+        essential = set(metrics).issubset(ESSENTIAL_METRICS)
         
         comparison = {}
         for i, result in enumerate(results, 1):
-            all_metrics = result.get_all_metrics()
+            all_metrics = result._compute_metrics(essential=essential)
             comparison[f'Strategy {i}'] = {metric: all_metrics[metric] for metric in metrics}
             
         return pd.DataFrame(comparison)
\ No newline at end of file
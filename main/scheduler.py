@@ -0,0 +1,108 @@
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+FREQ_MAP = {
+    '1min': '1min',
+    '5min': '5min',
+    '15min': '15min',
+    '30min': '30min',
+    '1H': '1h',
+    '4H': '4h',
+    'D': 'D',
+    'W': 'W-MON',
+    'M': 'M'
+}
+
+# Règles calendaires : période et date retenue dans la période (première ou dernière date disponible)
+CALENDAR_RULES = {
+    'month_start': ('M', 'first'),
+    'month_end': ('M', 'last'),
+    'week_start': ('W-MON', 'first'),
+    'week_end': ('W-MON', 'last'),
+    'session_open': ('D', 'first'),
+    'session_close': ('D', 'last')
+}
+
+REBALANCING_RULES = list(FREQ_MAP) + list(CALENDAR_RULES)
+
+def resolve_rule(rebalancing_frequency: str) -> Tuple[str, str]:
+    """
+    Fréquence pandas et date retenue dans chaque période pour une fréquence de FREQ_MAP
+    (première date de la période) ou une règle calendaire de CALENDAR_RULES
+
+    Parameters
+    ----------
+    rebalancing_frequency: str
+        fréquence de rebalancement
+
+    Returns
+    ----------
+    freq: str
+        fréquence pandas des périodes
+    anchor: str
+        'first' ou 'last'
+    """
+    if rebalancing_frequency in FREQ_MAP:
+        return FREQ_MAP[rebalancing_frequency], 'first'
+    if rebalancing_frequency in CALENDAR_RULES:
+        return CALENDAR_RULES[rebalancing_frequency]
+    raise ValueError(f"Frequency not available. Available frequencies: {', '.join(REBALANCING_RULES)}")
+
+def period_keys(index: pd.DatetimeIndex, freq: str) -> np.ndarray:
+    """
+    Identifiant de la période de chaque date, calculé en une opération sur tout l'index :
+    début du mois, lundi 00:00 de la semaine ou arrondi inférieur à la fréquence
+
+    Parameters
+    ----------
+    index: DatetimeIndex
+        dates
+    freq: str
+        fréquence pandas des périodes
+
+    Returns
+    ----------
+    ndarray
+        entier identique pour toutes les dates d'une même période
+    """
+    if freq == 'M':
+        return index.to_period('M').asi8
+    elif freq == 'W-MON':
+        return (index.normalize() - pd.to_timedelta(index.dayofweek, unit='D')).asi8
+    elif freq == 'D':
+        return index.normalize().asi8
+    else:
+        return index.floor(freq).asi8
+
+def rebalancing_points(index: pd.DatetimeIndex, rebalancing_frequency: str) -> np.ndarray:
+    """
+    Indices des dates de décision : première (ou dernière pour les règles de fin de période)
+    date disponible de chaque période
+
+    Parameters
+    ----------
+    index: DatetimeIndex
+        dates triées
+    rebalancing_frequency: str
+        fréquence de FREQ_MAP ou règle calendaire de CALENDAR_RULES
+
+    Returns
+    ----------
+    ndarray
+        indices croissants des dates de décision
+    """
+    freq, anchor = resolve_rule(rebalancing_frequency)
+    if len(index) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    keys = period_keys(pd.DatetimeIndex(index), freq)
+    changes = keys[1:] != keys[:-1]
+    if anchor == 'first':
+        return np.flatnonzero(np.concatenate([[True], changes]))
+    return np.flatnonzero(np.concatenate([changes, [True]]))
+
+def rebalancing_mask(index: pd.DatetimeIndex, rebalancing_frequency: str) -> np.ndarray:
+    mask = np.zeros(len(index), dtype=bool)
+    mask[rebalancing_points(index, rebalancing_frequency)] = True
+    return mask
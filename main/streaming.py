@@ -0,0 +1,257 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Union
+import os
+import numpy as np
+import pandas as pd
+from strategies.strategy_constructor import Strategy
+from stats.metrics_engine import ESSENTIAL_METRICS
+from data.loader import iter_market_data
+
+class StreamingMetrics:
+    """
+    Métriques essentielles de compute_metrics mises à jour bloc par bloc avec une mémoire constante :
+    moyenne et somme des carrés des écarts des rendements de la NAV (fusion des blocs par la formule de Chan),
+    somme des carrés des rendements négatifs, plus haut courant de la NAV, drawdown maximal,
+    nombre de transactions et transactions gagnantes du registre des transactions.
+    """
+    def __init__(self, initial_capital: float, N: int = 252):
+        self.initial_capital = initial_capital
+        self.N = N
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.downside_squares = 0.0
+        self.peak = -np.inf
+        self.max_drawdown = np.inf
+        self.last_nav = np.nan
+        self.n_trades = 0
+        self.winning_trades = 0
+
+    def update(self, nav: np.ndarray) -> None:
+        """
+        Intègre un bloc de NAV
+
+        Parameters
+        ----------
+        nav: ndarray
+            NAV à chaque date du bloc
+        """
+        n = len(nav)
+        if n == 0:
+            return
+
+        # Rendements de la NAV comme nav_returns : nul à la première date du backtest
+        returns = np.empty(n)
+        returns[0] = nav[0] / self.last_nav - 1 if self.count > 0 else 0.0
+        returns[1:] = nav[1:] / nav[:-1] - 1
+        returns[np.isnan(returns)] = 0.0
+
+        chunk_mean = returns.mean()
+        chunk_m2 = np.sum((returns - chunk_mean) ** 2)
+        delta = chunk_mean - self.mean
+        total = self.count + n
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.downside_squares += np.sum(returns[returns < 0] ** 2)
+
+        peaks = np.maximum(np.maximum.accumulate(nav), self.peak)
+        self.max_drawdown = min(self.max_drawdown, (nav / peaks - 1).min())
+        self.peak = peaks[-1]
+        self.last_nav = nav[-1]
+
+    def add_trade(self, net_pnl: float) -> None:
+        self.n_trades += 1
+        self.winning_trades += net_pnl > 0
+
+    def essential_metrics(self) -> Dict[str, float]:
+        """
+        Returns
+        ----------
+        dict
+            métriques essentielles, avec les mêmes clés que Result.get_essential_metrics
+        """
+        T = self.count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(np.float64(self.m2) / (T - 1)) if T > 1 else np.float64(np.nan)
+            annual_return = np.float64(self.mean) * self.N
+            volatility = std * np.sqrt(self.N)
+            downside_std = np.sqrt(np.float64(self.downside_squares) / T) * np.sqrt(self.N)
+
+            metrics = {
+                'Total Return (%)': (self.last_nav / self.initial_capital - 1) * 100,
+                'Annualized Return (%)': annual_return * 100,
+                'Volatility (%)': volatility * 100,
+                'Sharpe Ratio': annual_return / volatility,
+                'Maximum Drawdown (%)': self.max_drawdown * 100,
+                'Sortino Ratio': annual_return / downside_std,
+                'Number of Trades': self.n_trades,
+                'Winning Trades (%)': self.winning_trades / self.n_trades * 100 if self.n_trades > 0 else 0.0
+            }
+        return {name: metrics[name] for name in ESSENTIAL_METRICS}
+
+@dataclass
+class StreamingResult:
+    """
+    Résultat d'un backtest en flux : métriques essentielles et, si elles ont été conservées,
+    séries des positions et de la NAV
+    """
+    metrics: Dict[str, float]
+    n_bars: int
+    positions: Optional[pd.Series] = field(default=None, repr=False)
+    nav: Optional[pd.Series] = field(default=None, repr=False)
+
+    def get_essential_metrics(self) -> Dict[str, float]:
+        return dict(self.metrics)
+
+@dataclass
+class StreamingBacktester:
+    """
+    Classe permettant de backtester une stratégie incrémentale sur un fichier CSV ou Parquet lu par blocs
+    ordonnés dans le temps, avec une mémoire bornée par la taille des blocs. L'état de la stratégie,
+    les deux dernières positions, le dernier prix, la NAV et la transaction en cours sont conservés
+    d'un bloc à l'autre : positions et NAV sont identiques à celles de Backtester.run lorsque le
+    rebalancement se fait à la fréquence des données.
+    """
+    source: Union[str, os.PathLike]
+    initial_capital: float = 10000.0
+    commission: float = 0.001
+    slippage: float = 0.0
+    chunk_size: int = 100_000
+    dtype: str = 'float64'
+    N: int = 252
+
+    def iter_chunks(self, strategy: Strategy, metrics: Optional[StreamingMetrics] = None) -> Iterator[pd.DataFrame]:
+        """
+        Exécute le backtest bloc par bloc
+
+        Parameters
+        ----------
+        strategy: Strategy
+            stratégie disposant d'une méthode update(price, current_position) (StreamingMACrossover,
+            StreamingRSI) ; fit est appelée avec le premier bloc
+        metrics: StreamingMetrics
+            accumulateur mis à jour avec chaque bloc (métriques et registre des transactions)
+
+        Returns
+        ----------
+        Iterator[DataFrame]
+            pour chaque bloc, colonnes close, position et nav indexées par date
+        """
+        if not callable(getattr(strategy, 'update', None)):
+            raise TypeError("Streaming backtests require a strategy with an update(price, current_position) "
+                            "method, such as StreamingMACrossover or StreamingRSI")
+
+        cost_rate = self.commission + self.slippage
+        # Positions décidées aux deux dates précédentes, dernier prix connu et dernière NAV
+        previous_position, held_position = 0.0, 0.0
+        last_price = np.nan
+        last_nav = np.nan
+        last_timestamp = None
+        # Transaction en cours : position exécutée, capital engagé à l'entrée et valeur courante
+        trade_position, trade_capital, trade_value = 0.0, np.nan, np.nan
+
+        for chunk in iter_market_data(self.source, self.chunk_size, self.dtype):
+            if len(chunk) == 0:
+                continue
+            if not chunk.index.is_monotonic_increasing or (
+                    last_timestamp is not None and chunk.index[0] <= last_timestamp):
+                raise ValueError("Streaming backtests require strictly time-ordered data")
+
+            first_chunk = last_timestamp is None
+            if first_chunk:
+                strategy.fit(chunk)
+
+            close = chunk['close'].values
+            n = len(close)
+
+            positions = np.empty(n)
+            current_position = previous_position
+            for i, price in enumerate(close.tolist()):
+                current_position = strategy.update(price, current_position)
+                positions[i] = current_position
+
+            # Rendements de close.pct_change().fillna(0) avec le dernier prix connu du bloc précédent
+            prices = pd.Series(np.concatenate([[last_price], close.astype(np.float64)])).ffill().values
+            returns = prices[1:] / prices[:-1] - 1
+            returns[np.isnan(returns)] = 0.0
+
+            # Décalages de compute_nav prolongés par les positions du bloc précédent
+            previous_positions = np.concatenate([[previous_position], positions[:-1]])
+            held_positions = np.concatenate([[held_position, previous_position], positions[:-2]])[:n]
+
+            factors = 1 + returns * held_positions - np.abs(previous_positions - held_positions) * cost_rate
+            factors[0] = self.initial_capital if first_chunk else last_nav * factors[0]
+            nav = np.cumprod(factors)
+
+            if metrics is not None:
+                metrics.update(nav)
+                # Croissance de la position en place entre la date précédente et chaque date (voir trade_ledger)
+                growth = 1 + held_positions * returns
+                previous_navs = np.concatenate([[last_nav], nav[:-1]])
+                changes = np.flatnonzero(previous_positions != held_positions)
+
+                start = 0
+                for change in changes.tolist():
+                    trade_value *= np.prod(growth[start:change + 1])
+                    new_position = previous_positions[change]
+                    if np.sign(new_position) == np.sign(trade_position):
+                        # Ajustement de taille : seule la variation est facturée
+                        trade_value *= 1 - abs(new_position - trade_position) * cost_rate
+                    else:
+                        if trade_position != 0:
+                            metrics.add_trade(trade_value * (1 - abs(trade_position) * cost_rate) - trade_capital)
+                        trade_capital = previous_navs[change] * growth[change]
+                        trade_value = trade_capital * (1 - abs(new_position) * cost_rate)
+                    trade_position = new_position
+                    start = change + 1
+                trade_value *= np.prod(growth[start:])
+
+            previous_position = positions[-1]
+            held_position = positions[-2] if n > 1 else previous_positions[-1]
+            last_price = prices[-1]
+            last_nav = nav[-1]
+            last_timestamp = chunk.index[-1]
+
+            yield pd.DataFrame({'close': close, 'position': positions, 'nav': nav}, index=chunk.index)
+
+        # Transaction encore ouverte à la dernière date : valorisée sans coût de sortie
+        if metrics is not None and trade_position != 0:
+            metrics.add_trade(trade_value - trade_capital)
+
+    def run(self, strategy: Strategy, keep_series: bool = False) -> StreamingResult:
+        """
+        Exécute le backtest en flux et calcule les métriques essentielles de manière incrémentale
+
+        Parameters
+        ----------
+        strategy: Strategy
+            stratégie incrémentale backtestée
+        keep_series: bool
+            si True, les séries des positions et de la NAV sont conservées (mémoire proportionnelle
+            au nombre de dates)
+
+        Returns
+        ----------
+        StreamingResult
+            métriques essentielles, nombre de dates et séries éventuelles
+        """
+        metrics = StreamingMetrics(self.initial_capital, self.N)
+        positions, nav = [], []
+        n_bars = 0
+
+        for chunk in self.iter_chunks(strategy, metrics):
+            n_bars += len(chunk)
+            if keep_series:
+                positions.append(chunk['position'])
+                nav.append(chunk['nav'])
+
+        if n_bars == 0:
+            raise ValueError("No market data to backtest")
+
+        return StreamingResult(
+            metrics=metrics.essential_metrics(),
+            n_bars=n_bars,
+            positions=pd.concat(positions) if keep_series else None,
+            nav=pd.concat(nav) if keep_series else None
+        )
@@ -0,0 +1,191 @@
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import itertools
+import threading
+import numpy as np
+import pandas as pd
+from strategies.strategy_constructor import get_strategy_parameters
+from main.backtester import Backtester
+from main.hashing import dataset_hash
+
+# Données de prix propres à chaque processus, transmises une seule fois par l'initialiseur du pool
+_WORKER_DATA: Optional[pd.DataFrame] = None
+
+def _init_worker(data: pd.DataFrame) -> None:
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+def _run_combination(strategy_class: type, params: Dict[str, Any],
+                     backtester_params: Dict[str, Any]) -> Dict[str, float]:
+    backtester = Backtester(_WORKER_DATA, **backtester_params)
+    result = backtester.run(strategy_class(**params))
+    return result.get_all_metrics()
+
+@dataclass
+class ParameterSweep:
+    """
+    Classe permettant d'explorer les paramètres d'une stratégie en parallélisant les backtests
+    """
+    data: pd.DataFrame
+    strategy_class: type
+    initial_capital: float = 10000.0
+    commission: float = 0.001
+    slippage: float = 0.0
+    rebalancing_frequency: str = 'D'
+    max_workers: Optional[int] = None
+
+    def __post_init__(self):
+        self.parameters = get_strategy_parameters(self.strategy_class)
+        self._cancel_event = threading.Event()
+
+        # Empreinte partagée par tous les backtests pour réutiliser les agrégats rééchantillonnés
+        self.dataset_key = dataset_hash(self.data)
+        # Valide les paramètres du backtest une fois pour toutes avant de lancer les processus
+        Backtester(self.data, **self._backtester_params())
+
+    def _backtester_params(self) -> Dict[str, Any]:
+        return {
+            'initial_capital': self.initial_capital,
+            'commission': self.commission,
+            'slippage': self.slippage,
+            'rebalancing_frequency': self.rebalancing_frequency,
+            'dataset_key': self.dataset_key
+        }
+
+    def _check_parameters(self, names: Sequence[str]) -> None:
+        unknown = set(names) - set(self.parameters)
+        if unknown:
+            raise ValueError(f"Unknown parameters for {self.strategy_class.__name__}: {', '.join(sorted(unknown))}. "
+                             f"Available parameters: {', '.join(self.parameters)}")
+
+    def grid(self, param_grid: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+        """
+        Construit toutes les combinaisons d'une grille de paramètres
+
+        Parameters
+        ----------
+        param_grid: dict
+            nom des paramètres en clé et liste des valeurs à tester en valeurs
+
+        Returns
+        ----------
+        list
+            liste des combinaisons de paramètres
+        """
+        self._check_parameters(param_grid.keys())
+        names = list(param_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+    def random(self, param_distributions: Dict[str, Any], n_iter: int = 10,
+               seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Tire aléatoirement des combinaisons de paramètres
+
+        Parameters
+        ----------
+        param_distributions: dict
+            nom des paramètres en clé et, en valeurs, soit une liste de valeurs possibles,
+            soit un tuple (min, max) pour un tirage uniforme (entier si les bornes sont entières)
+        n_iter: int
+            nombre de combinaisons tirées
+        seed: int
+            graine du générateur aléatoire
+
+        Returns
+        ----------
+        list
+            liste des combinaisons de paramètres
+        """
+        self._check_parameters(param_distributions.keys())
+        rng = np.random.default_rng(seed)
+
+        combinations = []
+        for _ in range(n_iter):
+            params = {}
+            for name, distribution in param_distributions.items():
+                if isinstance(distribution, tuple):
+                    low, high = distribution
+                    if isinstance(low, (int, np.integer)) and isinstance(high, (int, np.integer)):
+                        params[name] = int(rng.integers(low, high, endpoint=True))
+                    else:
+                        params[name] = float(rng.uniform(low, high))
+                else:
+                    params[name] = distribution[rng.integers(len(distribution))]
+            combinations.append(params)
+        return combinations
+
+    def cancel(self) -> None:
+        """
+        Interrompt le balayage en cours : les backtests non démarrés sont annulés
+        et run() renvoie les résultats déjà obtenus
+        """
+        self._cancel_event.set()
+
+    def run(self, param_grid: Optional[Dict[str, Sequence]] = None,
+            param_distributions: Optional[Dict[str, Any]] = None, n_iter: int = 10,
+            seed: Optional[int] = None,
+            progress_callback: Optional[Callable[[int, int], None]] = None) -> pd.DataFrame:
+        """
+        Exécute un backtest par combinaison de paramètres (grille ou tirage aléatoire)
+
+        Parameters
+        ----------
+        param_grid: dict
+            grille de paramètres (voir grid)
+        param_distributions: dict
+            distributions des paramètres pour une recherche aléatoire (voir random)
+        n_iter: int
+            nombre de combinaisons pour la recherche aléatoire
+        seed: int
+            graine du générateur aléatoire
+        progress_callback: Callable
+            fonction appelée avec (nombre de backtests terminés, nombre total) après chaque backtest
+
+        Returns
+        ----------
+        DataFrame
+            une ligne par combinaison avec les paramètres puis toutes les métriques du backtest
+        """
+        if (param_grid is None) == (param_distributions is None):
+            raise ValueError("Exactly one of param_grid or param_distributions must be provided")
+
+        if param_grid is not None:
+            combinations = self.grid(param_grid)
+        else:
+            combinations = self.random(param_distributions, n_iter, seed)
+
+        self._cancel_event.clear()
+        backtester_params = self._backtester_params()
+        total = len(combinations)
+        metrics = {}
+
+        if self.max_workers == 1:
+            _init_worker(self.data)
+            for i, params in enumerate(combinations):
+                if self._cancel_event.is_set():
+                    break
+                metrics[i] = _run_combination(self.strategy_class, params, backtester_params)
+                if progress_callback is not None:
+                    progress_callback(len(metrics), total)
+        else:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                           initargs=(self.data,))
+            try:
+                futures = {
+                    executor.submit(_run_combination, self.strategy_class, params, backtester_params): i
+                    for i, params in enumerate(combinations)
+                }
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    metrics[futures[future]] = future.result()
+                    if progress_callback is not None:
+                        progress_callback(len(metrics), total)
+                    if self._cancel_event.is_set():
+                        break
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        rows = [{**combinations[i], **metrics[i]} for i in sorted(metrics)]
+        return pd.DataFrame(rows, index=pd.Index(sorted(metrics), name='combination'))
@@ -14,6 +14,9 @@ setup(
     extras_require={
         'dev': [
             'pytest',
+        ],
+        'jit': [
+            'numba',
         ]
     },
 )
\ No newline at end of file
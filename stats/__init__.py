@@ -34,6 +34,43 @@ from stats.performance_metrics import (
     calculate_alpha_beta
 )
 
+from stats.rolling import (
+    rolling_moments,
+    rolling_volatility,
+    rolling_sharpe_ratio,
+    rolling_sortino_ratio,
+    rolling_skewness,
+    rolling_kurtosis,
+    rolling_max,
+    rolling_drawdown
+)
+
+from stats.drawdowns import (
+    drawdown_episodes,
+    worst_drawdowns,
+    max_drawdown_duration
+)
+
+from stats.bootstrap import (
+    stationary_bootstrap_indices,
+    block_bootstrap_indices,
+    trade_permutation_indices,
+    bootstrap_metrics
+)
+
+from stats.trades import (
+    TRADE_DTYPE,
+    trade_ledger,
+    trade_returns,
+    trade_statistics
+)
+
+from stats.metrics_engine import (
+    compute_metrics,
+    ESSENTIAL_METRICS,
+    ADDITIONAL_METRICS
+)
+
 __all__ = [
     # Core metrics
     'calculate_returns',
@@ -66,5 +103,37 @@ __all__ = [
     'cvar_ratio',
     'hit_rate',
     'gain_to_pain_ratio',
-    'calculate_alpha_beta'
+    'calculate_alpha_beta',
+    
+    # Rolling metrics
+    'rolling_moments',
+    'rolling_volatility',
+    'rolling_sharpe_ratio',
+    'rolling_sortino_ratio',
+    'rolling_skewness',
+    'rolling_kurtosis',
+    'rolling_max',
+    'rolling_drawdown',
+    
+    # Drawdown analytics
+    'drawdown_episodes',
+    'worst_drawdowns',
+    'max_drawdown_duration',
+    
+    # Bootstrap confidence intervals
+    'stationary_bootstrap_indices',
+    'block_bootstrap_indices',
+    'trade_permutation_indices',
+    'bootstrap_metrics',
+    
+    # Trade ledger
+    'TRADE_DTYPE',
+    'trade_ledger',
+    'trade_returns',
+    'trade_statistics',
+    
+    # Metrics engine
+    'compute_metrics',
+    'ESSENTIAL_METRICS',
+    'ADDITIONAL_METRICS'
 ]
\ No newline at end of file
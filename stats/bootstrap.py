@@ -0,0 +1,264 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from stats.metrics_engine import return_statistics, drawdown, calmar_drawdown
+
+BOOTSTRAP_METHODS = ('stationary', 'block', 'trades')
+
+BOOTSTRAP_METRICS = [
+    'Total Return (%)',
+    'Annualized Return (%)',
+    'Volatility (%)',
+    'Sharpe Ratio',
+    'Sortino Ratio',
+    'Maximum Drawdown (%)',
+    'Calmar Ratio'
+]
+
+# Rendements et segments de transactions propres à chaque processus, transmis une seule fois par l'initialiseur
+_WORKER_RETURNS: Optional[np.ndarray] = None
+_WORKER_SEGMENTS: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+def _init_worker(returns: np.ndarray, segments: Optional[Tuple[np.ndarray, np.ndarray]]) -> None:
+    global _WORKER_RETURNS, _WORKER_SEGMENTS
+    _WORKER_RETURNS = returns
+    _WORKER_SEGMENTS = segments
+
+def stationary_bootstrap_indices(n: int, n_paths: int, mean_block_size: float,
+                                 rng: np.random.Generator) -> np.ndarray:
+    """
+    Indices du bootstrap stationnaire de Politis et Romano : les blocs ont une longueur aléatoire
+    géométrique de moyenne mean_block_size et la série est parcourue de manière circulaire
+
+    Parameters
+    ----------
+    n: int
+        longueur de la série
+    n_paths: int
+        nombre de trajectoires
+    mean_block_size: float
+        longueur moyenne des blocs
+    rng: Generator
+        générateur aléatoire
+
+    Returns
+    ----------
+    ndarray
+        matrice des indices (n, n_paths)
+    """
+    new_block = rng.random((n, n_paths)) < 1 / mean_block_size
+    new_block[0] = True
+    block_starts = rng.integers(0, n, size=(n, n_paths))
+
+    # Date de début du bloc courant pour chaque date et chaque trajectoire
+    steps = np.arange(n)[:, np.newaxis]
+    block_begin = np.maximum.accumulate(np.where(new_block, steps, 0), axis=0)
+    start_values = np.take_along_axis(block_starts, block_begin, axis=0)
+    return (start_values + steps - block_begin) % n
+
+def block_bootstrap_indices(n: int, n_paths: int, block_size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Indices du bootstrap par blocs circulaires de longueur fixe block_size
+
+    Parameters
+    ----------
+    n: int
+        longueur de la série
+    n_paths: int
+        nombre de trajectoires
+    block_size: int
+        longueur des blocs
+    rng: Generator
+        générateur aléatoire
+
+    Returns
+    ----------
+    ndarray
+        matrice des indices (n, n_paths)
+    """
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_blocks, n_paths))
+    offsets = np.arange(block_size)
+    indices = (starts[:, np.newaxis, :] + offsets[np.newaxis, :, np.newaxis]) % n
+    return indices.reshape(n_blocks * block_size, n_paths)[:n]
+
+def trade_segments(positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Découpe la série en segments de position constante (une transaction ou une période sans position)
+
+    Parameters
+    ----------
+    positions: ndarray
+        position détenue à chaque date
+
+    Returns
+    ----------
+    starts: ndarray
+        indice de début de chaque segment
+    lengths: ndarray
+        longueur de chaque segment
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if len(positions) == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    starts = np.flatnonzero(np.concatenate([[True], positions[1:] != positions[:-1]]))
+    lengths = np.diff(np.append(starts, len(positions)))
+    return starts, lengths
+
+def trade_permutation_indices(segments: Tuple[np.ndarray, np.ndarray], n_paths: int,
+                              rng: np.random.Generator) -> np.ndarray:
+    """
+    Indices de trajectoires obtenues en permutant aléatoirement l'ordre des segments de transactions,
+    les rendements de chaque segment restant contigus
+
+    Parameters
+    ----------
+    segments: tuple
+        débuts et longueurs des segments (voir trade_segments)
+    n_paths: int
+        nombre de trajectoires
+    rng: Generator
+        générateur aléatoire
+
+    Returns
+    ----------
+    ndarray
+        matrice des indices (n, n_paths)
+    """
+    starts, lengths = segments
+    n = int(lengths.sum())
+    order = np.argsort(rng.random((n_paths, len(starts))), axis=1)
+
+    # Segments de toutes les trajectoires mis bout à bout, trajectoire par trajectoire
+    flat_starts = starts[order].ravel()
+    flat_lengths = lengths[order].ravel()
+    flat_offsets = np.concatenate([[0], np.cumsum(flat_lengths)[:-1]])
+    indices = np.repeat(flat_starts - flat_offsets, flat_lengths) + np.arange(n * n_paths)
+    return indices.reshape(n_paths, n).T
+
+def path_metrics(returns: np.ndarray, N: int, calmar_window: Optional[int] = 756) -> Dict[str, np.ndarray]:
+    """
+    Calcule les métriques colonne par colonne sur une matrice de rendements (n_dates, n_trajectoires),
+    avec les fonctions vectorisées de compute_metrics
+
+    Parameters
+    ----------
+    returns: ndarray
+        rendements de la NAV de chaque trajectoire
+    N: int
+        nombre de périodes par an
+    calmar_window: int
+        nombre de dates utilisées pour le drawdown maximal du ratio de Calmar (toutes si None)
+
+    Returns
+    ----------
+    dict
+        nom des métriques en clé et valeurs de chaque trajectoire en valeurs
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _, _, annual_return, volatility, downside_std = return_statistics(returns, N)
+        growth = np.cumprod(1 + returns, axis=0)
+        drawdowns = drawdown(growth)
+
+        return {
+            'Total Return (%)': (growth[-1] - 1) * 100,
+            'Annualized Return (%)': annual_return * 100,
+            'Volatility (%)': volatility * 100,
+            'Sharpe Ratio': annual_return / volatility,
+            'Sortino Ratio': annual_return / downside_std,
+            'Maximum Drawdown (%)': drawdowns.min(axis=0) * 100,
+            'Calmar Ratio': -annual_return / calmar_drawdown(growth, drawdowns, calmar_window)
+        }
+
+def _run_chunk(method: str, n_paths: int, block_size: float, N: int,
+               seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    n = len(_WORKER_RETURNS)
+    if method == 'stationary':
+        indices = stationary_bootstrap_indices(n, n_paths, block_size, rng)
+    elif method == 'block':
+        indices = block_bootstrap_indices(n, n_paths, int(block_size), rng)
+    else:
+        indices = trade_permutation_indices(_WORKER_SEGMENTS, n_paths, rng)
+    return path_metrics(_WORKER_RETURNS[indices], N)
+
+def bootstrap_metrics(returns: pd.Series, method: str = 'stationary', n_paths: int = 1000,
+                      block_size: float = 20, positions: Optional[pd.Series] = None,
+                      confidence: float = 0.95, N: int = 252, seed: Optional[int] = None,
+                      chunk_memory_mb: float = 64, max_workers: Optional[int] = 1) -> pd.DataFrame:
+    """
+    Intervalles de confiance des métriques par rééchantillonnage des rendements de la NAV.
+    Les trajectoires sont générées par paquets dont la matrice des rendements (n_dates, trajectoires)
+    occupe au plus chunk_memory_mb Mo, pour borner la mémoire quelle que soit la longueur de la série,
+    éventuellement répartis sur un pool de processus ; le résultat ne dépend que de seed et de chunk_memory_mb.
+
+    Parameters
+    ----------
+    returns: Series
+        rendements de la NAV
+    method: str
+        'stationary' (bootstrap stationnaire), 'block' (blocs circulaires de longueur fixe)
+        ou 'trades' (permutation de l'ordre des transactions, positions requises)
+    n_paths: int
+        nombre de trajectoires simulées
+    block_size: float
+        longueur (moyenne pour le bootstrap stationnaire) des blocs
+    positions: Series
+        position détenue à chaque date, utilisée pour découper les transactions
+    confidence: float
+        niveau de confiance des intervalles
+    N: int
+        nombre de périodes par an
+    seed: int
+        graine du générateur aléatoire
+    chunk_memory_mb: float
+        taille en Mo de la matrice des rendements d'un paquet de trajectoires (la mémoire intermédiaire
+        en est un petit multiple)
+    max_workers: int
+        nombre de processus (1 pour une exécution séquentielle, None pour tous les cœurs)
+
+    Returns
+    ----------
+    DataFrame
+        une ligne par métrique avec la valeur observée, la moyenne, l'écart-type et les bornes
+        de l'intervalle de confiance des trajectoires simulées
+    """
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"method must be one of {', '.join(BOOTSTRAP_METHODS)}")
+    if method == 'trades' and positions is None:
+        raise ValueError("positions are required for the trades method")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must belong to ]0,1[")
+
+    values = np.ascontiguousarray(returns, dtype=np.float64)
+    segments = trade_segments(np.asarray(positions)) if method == 'trades' else None
+
+    # Nombre de trajectoires par paquet : une colonne de la matrice des rendements occupe n * 8 octets
+    chunk_size = max(1, int(chunk_memory_mb * 1024 ** 2 // (max(len(values), 1) * values.itemsize)))
+    chunks = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    arguments = [(method, size, block_size, N, chunk_seed) for size, chunk_seed in zip(chunks, seeds)]
+
+    if max_workers == 1 or len(chunks) == 1:
+        _init_worker(values, segments)
+        results: List[Dict[str, np.ndarray]] = [_run_chunk(*args) for args in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(values, segments)) as executor:
+            results = list(executor.map(_run_chunk, *zip(*arguments)))
+
+    observed = path_metrics(values[:, np.newaxis], N)
+    alpha = (1 - confidence) / 2
+
+    rows = {}
+    for metric in BOOTSTRAP_METRICS:
+        simulated = np.concatenate([result[metric] for result in results])
+        rows[metric] = {
+            'observed': observed[metric][0],
+            'mean': np.nanmean(simulated),
+            'std': np.nanstd(simulated, ddof=1),
+            'lower': np.nanquantile(simulated, alpha),
+            'upper': np.nanquantile(simulated, 1 - alpha)
+        }
+    return pd.DataFrame(rows).T
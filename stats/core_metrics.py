@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+from stats.trades import trade_returns
 
 def calculate_returns(prices: pd.Series) -> pd.Series:
     return prices.pct_change()
@@ -30,14 +31,10 @@ def correlation(returns1: pd.Series, returns2: pd.Series) -> float:
     return returns1.corr(returns2)
 
 def count_trades(positions: pd.Series) -> int:
-    return int((positions.diff() != 0).sum())
-
-def winning_trades_percentage(positions: pd.Series, returns: pd.Series) -> float:
-    trades = positions.diff() != 0
-    
-    trade_returns = returns[trades]
-    trade_positions = positions[trades]
-    
-    winning_trades = (trade_returns * trade_positions) > 0
-    
-    return winning_trades.mean() if len(winning_trades) > 0 else 0.0
\ No newline at end of file
+    # Transactions du registre : plages de positions exécutées de même sens non nul
+    return len(trade_returns(np.asarray(positions), np.zeros(len(positions))))
+
+def winning_trades_percentage(positions: pd.Series, returns: pd.Series, commission: float = 0.0,
+                              slippage: float = 0.0) -> float:
+    net_returns = trade_returns(np.asarray(positions), np.asarray(returns), commission, slippage)
+    return float(np.mean(net_returns > 0)) if len(net_returns) > 0 else 0.0
\ No newline at end of file
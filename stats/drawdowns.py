@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from stats.tail_metrics import drawdown
+
+EPISODE_COLUMNS = ['peak', 'trough', 'recovery', 'depth', 'length', 'time_to_trough']
+
+def drawdown_episodes(nav: pd.Series) -> pd.DataFrame:
+    """
+    Identifie tous les épisodes de drawdown par encodage des plages consécutives de dates en drawdown.
+    Un épisode commence au dernier plus haut avant la baisse (peak), atteint son creux (trough) et
+    se termine à la première date où la NAV revient à ce plus haut (recovery, NaT si l'épisode est en cours).
+
+    Parameters
+    ----------
+    nav: Series
+        NAV
+
+    Returns
+    ----------
+    DataFrame
+        un épisode par ligne avec les dates du plus haut, du creux et du retour au plus haut,
+        la profondeur (drawdown au creux, négatif), la durée en nombre de périodes entre le plus haut
+        et le retour (ou la dernière date) et le nombre de périodes entre le plus haut et le creux
+    """
+    drawdowns = drawdown(nav).values
+    index = nav.index
+    n = len(drawdowns)
+
+    in_drawdown = np.zeros(n + 2, dtype=np.int8)
+    in_drawdown[1:-1] = drawdowns < 0
+    changes = np.diff(in_drawdown)
+    starts = np.flatnonzero(changes == 1)
+    ends = np.flatnonzero(changes == -1)
+
+    if len(starts) == 0:
+        return pd.DataFrame({column: [] for column in EPISODE_COLUMNS})
+
+    # Dates en drawdown, dans l'ordre, et numéro de l'épisode auquel chacune appartient
+    lengths = ends - starts
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    run_ids = np.repeat(np.arange(len(starts)), lengths)
+    members = np.flatnonzero(drawdowns < 0)
+
+    depths = np.minimum.reduceat(drawdowns[members], offsets[:-1])
+
+    at_trough = drawdowns[members] == depths[run_ids]
+    _, first = np.unique(run_ids[at_trough], return_index=True)
+    troughs = members[at_trough][first]
+
+    peaks = np.maximum(starts - 1, 0)
+    recovered = ends < n
+    last = np.where(recovered, ends, n - 1)
+
+    recovery = pd.Series(index[np.minimum(ends, n - 1)]).where(recovered)
+
+    return pd.DataFrame({
+        'peak': index[peaks],
+        'trough': index[troughs],
+        'recovery': recovery.values,
+        'depth': depths,
+        'length': last - peaks,
+        'time_to_trough': troughs - peaks
+    })
+
+def worst_drawdowns(nav: pd.Series, n: int = 5) -> pd.DataFrame:
+    """
+    Les n épisodes de drawdown les plus profonds
+
+    Parameters
+    ----------
+    nav: Series
+        NAV
+    n: int
+        nombre d'épisodes
+
+    Returns
+    ----------
+    DataFrame
+        épisodes (voir drawdown_episodes) triés du plus profond au moins profond
+    """
+    episodes = drawdown_episodes(nav)
+    return episodes.iloc[np.argsort(episodes['depth'].values, kind='stable')[:n]].reset_index(drop=True)
+
+def max_drawdown_duration(nav: pd.Series) -> int:
+    """
+    Durée du plus long épisode de drawdown, en nombre de périodes entre le plus haut et le retour
+    à ce plus haut (ou la dernière date si l'épisode est en cours)
+
+    Parameters
+    ----------
+    nav: Series
+        NAV
+
+    Returns
+    ----------
+    int
+        nombre de périodes
+    """
+    episodes = drawdown_episodes(nav)
+    return int(episodes['length'].max()) if len(episodes) > 0 else 0
@@ -0,0 +1,163 @@
+import numpy as np
+from typing import Dict, Optional, Tuple
+from stats.trades import trade_returns
+
+ESSENTIAL_METRICS = [
+    'Total Return (%)',
+    'Annualized Return (%)',
+    'Volatility (%)',
+    'Sharpe Ratio',
+    'Maximum Drawdown (%)',
+    'Sortino Ratio',
+    'Number of Trades',
+    'Winning Trades (%)'
+]
+
+ADDITIONAL_METRICS = [
+    'CAGR (%)',
+    'Skewness',
+    'Kurtosis',
+    'Adjusted Sharpe Ratio',
+    'Calmar Ratio',
+    'Pain Ratio',
+    'VaR Ratio',
+    'CVaR Ratio',
+    'Gain to Pain Ratio'
+]
+
+def nav_returns(nav: np.ndarray) -> np.ndarray:
+    returns = np.zeros(len(nav))
+    returns[1:] = nav[1:] / nav[:-1] - 1
+    returns[np.isnan(returns)] = 0.0
+    return returns
+
+def drawdown(nav: np.ndarray) -> np.ndarray:
+    return nav / np.maximum.accumulate(nav, axis=0) - 1
+
+def return_statistics(returns: np.ndarray, N: int) -> Tuple[np.ndarray, ...]:
+    """
+    Statistiques des rendements calculées colonne par colonne, pour un vecteur de rendements
+    ou une matrice (n_dates, n_trajectoires)
+
+    Returns
+    ----------
+    deviations: ndarray
+        écarts des rendements à leur moyenne
+    std: ndarray
+        écart-type (ddof=1)
+    annual_return: ndarray
+        rendement moyen annualisé
+    volatility: ndarray
+        écart-type annualisé
+    downside_std: ndarray
+        écart-type annualisé des rendements négatifs (par rapport à 0)
+    """
+    T = len(returns)
+    mean = returns.mean(axis=0)
+    deviations = returns - mean
+    std = np.sqrt(np.sum(deviations ** 2, axis=0) / (T - 1)) if T > 1 else mean * np.nan
+    downside_std = np.sqrt(np.sum(np.minimum(returns, 0) ** 2, axis=0) / T) * np.sqrt(N)
+    return deviations, std, mean * N, std * np.sqrt(N), downside_std
+
+def calmar_drawdown(nav: np.ndarray, drawdowns: np.ndarray, calmar_window: Optional[int]) -> np.ndarray:
+    """
+    Drawdown maximal du ratio de Calmar, sur les calmar_window dernières dates (toutes si None)
+    """
+    if calmar_window is None or calmar_window >= len(nav):
+        return drawdowns.min(axis=0)
+    return drawdown(nav[-calmar_window:]).min(axis=0)
+
+def compute_metrics(nav: np.ndarray, positions: np.ndarray, asset_returns: np.ndarray,
+                    initial_capital: float, N: int, essential: bool = False,
+                    calmar_window: Optional[int] = 756,
+                    trade_stats: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """
+    Calcule les métriques d'un backtest en une passe : les rendements de la NAV, leurs moments,
+    la série des drawdowns et le quantile de la VaR sont calculés une seule fois sur des tableaux
+    NumPy, puis tous les ratios en sont déduits. Donne les mêmes valeurs que les fonctions de stats.
+
+    Parameters
+    ----------
+    nav: ndarray
+        NAV à chaque date
+    positions: ndarray
+        position à chaque date
+    asset_returns: ndarray
+        rendements de l'actif à chaque date
+    initial_capital: float
+        capital initial
+    N: int
+        nombre de périodes par an
+    essential: bool
+        si True, seules les métriques essentielles sont calculées
+    calmar_window: int
+        nombre de dates utilisées pour le drawdown maximal du ratio de Calmar (toutes si None)
+    trade_stats: dict
+        statistiques du registre des transactions (voir stats.trades.trade_statistics), dont sont tirés
+        le nombre de transactions et le taux de transactions gagnantes ; à défaut, ils sont déduits
+        des positions et des rendements de l'actif sans coûts, comme count_trades et winning_trades_percentage
+
+    Returns
+    ----------
+    dict
+        nom des métriques en clé (dans l'ordre de Result.get_all_metrics) et métriques en valeurs
+    """
+    nav = np.asarray(nav, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+    asset_returns = np.asarray(asset_returns, dtype=np.float64)
+
+    returns = nav_returns(nav)
+    T = len(returns)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        deviations, std, annual_return, volatility, downside_std = return_statistics(returns, N)
+        sharpe = annual_return / volatility
+
+        drawdowns = drawdown(nav)
+
+        # Nombre de transactions et taux de gain décrivent les mêmes transactions (celles du registre)
+        if trade_stats is None:
+            net_returns = trade_returns(positions, asset_returns)
+            n_trades = len(net_returns)
+            win_rate = (np.mean(net_returns > 0) if n_trades > 0 else 0.0) * 100
+        else:
+            n_trades = int(trade_stats['Number of Trades'])
+            win_rate = trade_stats['Win Rate (%)']
+
+        metrics = {
+            'Total Return (%)': (nav[-1] / initial_capital - 1) * 100,
+            'Annualized Return (%)': annual_return * 100,
+            'Volatility (%)': volatility * 100,
+            'Sharpe Ratio': sharpe,
+            'Maximum Drawdown (%)': drawdowns.min() * 100,
+            'Sortino Ratio': annual_return / downside_std,
+            'Number of Trades': n_trades,
+            'Winning Trades (%)': win_rate
+        }
+
+        if essential:
+            return metrics
+
+        standardized = deviations / std
+        skew = (T / ((T-1)*(T-2))) * np.sum(standardized ** 3)
+        kurt = (T*(T+1) / ((T-1)*(T-2)*(T-3))) * np.sum(standardized ** 4) - 3 * (T-1)**2 / ((T-2)*(T-3))
+
+        var = np.percentile(returns, 5)
+        cvar = returns[returns <= var].mean()
+
+        gains = returns[returns > 0].sum()
+        pains = -returns[returns < 0].sum()
+
+        metrics.update({
+            'CAGR (%)': (np.prod(1 + returns) ** (1 / (T / N)) - 1) * 100,
+            'Skewness': skew,
+            'Kurtosis': kurt,
+            'Adjusted Sharpe Ratio': sharpe * (1 + skew*sharpe/6 - (kurt-3)*sharpe**2/24),
+            'Calmar Ratio': -annual_return / calmar_drawdown(nav, drawdowns, calmar_window),
+            'Pain Ratio': annual_return / -drawdowns.mean(),
+            'VaR Ratio': -annual_return / (N * var),
+            'CVaR Ratio': -annual_return / (N * cvar),
+            'Gain to Pain Ratio': gains / pains if pains != 0 else np.inf
+        })
+
+    return metrics
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    cumsum = np.concatenate([[0.0], np.cumsum(values)])
+    sums = np.full(len(values), np.nan)
+    if window <= len(values):
+        sums[window - 1:] = cumsum[window:] - cumsum[:len(values) - window + 1]
+    return sums
+
+def _check_window(window: int) -> None:
+    if window < 2:
+        raise ValueError("window must be at least 2")
+
+def rolling_moments(returns: pd.Series, window: int) -> pd.DataFrame:
+    """
+    Moyenne, écart-type, skewness et kurtosis glissants calculés en O(n) à partir des sommes
+    cumulées des puissances des rendements (centrés sur leur moyenne globale pour limiter
+    les erreurs d'arrondi). Skewness et kurtosis suivent les formules de tail_metrics.
+    Comme pandas, une fenêtre de valeurs toutes égales a un écart-type et une skewness nuls
+    et une kurtosis de -3 ; une variance inférieure à l'erreur d'arrondi des sommes cumulées
+    est ramenée à 0 (skewness et kurtosis indéterminées, NaN).
+
+    Parameters
+    ----------
+    returns: Series
+        rendements
+    window: int
+        taille de la fenêtre glissante
+
+    Returns
+    ----------
+    DataFrame
+        colonnes mean, std, skewness et kurtosis, NaN tant que la fenêtre n'est pas remplie
+    """
+    _check_window(window)
+    values = np.asarray(returns, dtype=np.float64)
+    center = values.mean() if len(values) > 0 else 0.0
+    centered = values - center
+
+    T = window
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mu = _window_sums(centered, T) / T
+        raw2 = _window_sums(centered ** 2, T) / T
+        raw3 = _window_sums(centered ** 3, T) / T
+        raw4 = _window_sums(centered ** 4, T) / T
+
+        # Borne de l'erreur d'arrondi de raw2 - mu ** 2, proportionnelle à la somme cumulée des carrés
+        tolerance = np.full(len(values), np.nan)
+        if T <= len(values):
+            tolerance[T - 1:] = 16 * np.finfo(np.float64).eps * np.cumsum(centered ** 2)[T - 1:] / T
+
+        m2 = raw2 - mu ** 2
+        negligible = m2 <= tolerance
+        m2[negligible] = 0.0
+        m3 = raw3 - 3 * mu * raw2 + 2 * mu ** 3
+        m4 = raw4 - 4 * mu * raw3 + 6 * mu ** 2 * raw2 - 3 * mu ** 4
+
+        std = np.sqrt(m2 * T / (T - 1))
+        skew = (T / ((T-1)*(T-2))) * T * m3 / std ** 3 if T > 2 else np.full(len(values), np.nan)
+        if T > 3:
+            kurt = (T*(T+1) / ((T-1)*(T-2)*(T-3))) * T * m4 / std ** 4 - 3 * (T-1)**2 / ((T-2)*(T-3))
+        else:
+            kurt = np.full(len(values), np.nan)
+        skew[negligible] = np.nan
+        kurt[negligible] = np.nan
+
+        # Fenêtres constantes (plus haut égal au plus bas) : conventions de Series.rolling
+        constant = np.asarray(rolling_max(pd.Series(values), T)) == -np.asarray(rolling_max(pd.Series(-values), T))
+        mu[constant] = values[constant] - center
+        std[constant] = 0.0
+        if T > 2:
+            skew[constant] = 0.0
+        if T > 3:
+            kurt[constant] = -3.0
+
+    return pd.DataFrame({'mean': mu + center, 'std': std, 'skewness': skew, 'kurtosis': kurt},
+                        index=getattr(returns, 'index', None))
+
+def rolling_volatility(returns: pd.Series, window: int, N: int) -> pd.Series:
+    return rolling_moments(returns, window)['std'] * np.sqrt(N)
+
+def rolling_sharpe_ratio(returns: pd.Series, window: int, risk_free_rate: float, N: int) -> pd.Series:
+    moments = rolling_moments(returns, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (moments['mean'] - risk_free_rate/N) * N / (moments['std'] * np.sqrt(N))
+
+def rolling_sortino_ratio(returns: pd.Series, window: int, target_return: float, N: int) -> pd.Series:
+    _check_window(window)
+    values = np.asarray(returns, dtype=np.float64)
+    downside = np.where(values < target_return, values - target_return, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = _window_sums(values, window) / window
+        downside_std = np.sqrt(np.maximum(_window_sums(downside ** 2, window), 0.0) / window) * np.sqrt(N)
+        sortino = (mean * N - target_return) / downside_std
+    return pd.Series(sortino, index=getattr(returns, 'index', None))
+
+def rolling_skewness(returns: pd.Series, window: int) -> pd.Series:
+    return rolling_moments(returns, window)['skewness']
+
+def rolling_kurtosis(returns: pd.Series, window: int) -> pd.Series:
+    return rolling_moments(returns, window)['kurtosis']
+
+def rolling_max(values: pd.Series, window: int) -> pd.Series:
+    """
+    Maximum glissant en O(n) par l'algorithme de van Herk / Gil-Werman : la série est découpée
+    en blocs de la taille de la fenêtre, dont on calcule les maxima cumulés de gauche à droite et
+    de droite à gauche ; chaque fenêtre chevauche au plus deux blocs et son maximum s'obtient en
+    combinant un suffixe et un préfixe. Les NaN sont ignorés.
+
+    Parameters
+    ----------
+    values: Series
+        série de valeurs
+    window: int
+        taille de la fenêtre glissante
+
+    Returns
+    ----------
+    Series
+        maximum sur les window dernières valeurs, NaN tant que la fenêtre n'est pas remplie
+    """
+    if window < 1:
+        raise ValueError("window must be a positive integer")
+    data = np.asarray(values, dtype=np.float64)
+    n = len(data)
+    result = np.full(n, np.nan)
+
+    if window <= n:
+        n_blocks = -(-n // window)
+        padded = np.full(n_blocks * window, -np.inf)
+        padded[:n] = np.where(np.isnan(data), -np.inf, data)
+        blocks = padded.reshape(n_blocks, window)
+
+        prefix = np.maximum.accumulate(blocks, axis=1).ravel()
+        suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+        ends = np.arange(window - 1, n)
+        starts = ends - window + 1
+        result[window - 1:] = np.maximum(suffix[starts], prefix[ends])
+        result[np.isneginf(result)] = np.nan
+
+    return pd.Series(result, index=getattr(values, 'index', None))
+
+def rolling_drawdown(nav: pd.Series, window: int) -> pd.Series:
+    """
+    Drawdown par rapport au plus haut des window dernières valeurs de la NAV
+
+    Parameters
+    ----------
+    nav: Series
+        NAV
+    window: int
+        taille de la fenêtre glissante
+
+    Returns
+    ----------
+    Series
+        drawdown glissant (négatif ou nul)
+    """
+    peaks = rolling_max(nav, window)
+    return pd.Series(np.asarray(nav, dtype=np.float64) / peaks.values - 1, index=peaks.index)
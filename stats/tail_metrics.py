@@ -47,15 +47,10 @@ def max_drawdown(nav: pd.Series, window: Optional[int] = None) -> float:
     return drawdown(nav).min()
 
 def drawdown_duration(nav: pd.Series) -> float:
-    rolling_max = nav.expanding().max()
-    drawdowns = nav / rolling_max - 1
-    
-    is_drawdown = drawdowns < 0
+    drawdowns = drawdown(nav)
     
-    duration = 0
-    for i in range(len(is_drawdown)-1, -1, -1):
-        if not is_drawdown.iloc[i]:
-            break
-        duration += 1
+    # Nombre de dates consécutives en drawdown à la fin de la série
+    not_in_drawdown = np.flatnonzero(~(drawdowns.values < 0))
+    duration = len(drawdowns) - 1 - not_in_drawdown[-1] if len(not_in_drawdown) > 0 else len(drawdowns)
     
     return duration / 252
\ No newline at end of file
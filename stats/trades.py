@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+TRADE_DTYPE = np.dtype([
+    ('entry_time', 'datetime64[ns]'),
+    ('exit_time', 'datetime64[ns]'),
+    ('side', np.int8),
+    ('size', np.float32),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('holding_period', np.int32),
+    ('gross_pnl', np.float64),
+    ('costs', np.float64),
+    ('net_pnl', np.float64),
+    ('is_open', np.bool_)
+])
+
+def _trade_runs(positions: np.ndarray, asset_returns: np.ndarray, commission: float,
+                slippage: float) -> Dict[str, np.ndarray]:
+    """
+    Découpe les positions exécutées en transactions (plages consécutives de même sens non nul) et
+    compose leur croissance. Une variation de taille sans changement de sens ajuste la transaction
+    en cours et ne coûte que la variation, comme dans compute_nav.
+    """
+    positions = np.nan_to_num(np.asarray(positions, dtype=np.float64))
+    asset_returns = np.nan_to_num(np.asarray(asset_returns, dtype=np.float64))
+    n = len(positions)
+    rate = commission + slippage
+
+    # Position en place à la clôture de chaque date
+    executed = np.zeros(n)
+    executed[1:] = positions[:-1]
+    side = np.sign(executed)
+
+    # Facteur de croissance de la date t à t+1 obtenu avec la position en place en t
+    # (1 à la dernière date, qui n'a pas de rendement suivant)
+    growth = np.ones(n)
+    growth[:-1] = 1 + executed[:-1] * asset_returns[1:]
+
+    # Coût des ajustements de taille à l'intérieur d'une transaction
+    adjustments = np.ones(n)
+    adjusted = np.flatnonzero((executed[1:] != executed[:-1]) & (side[1:] == side[:-1])) + 1
+    adjustments[adjusted] = 1 - np.abs(executed[adjusted] - executed[adjusted - 1]) * rate
+
+    starts = np.flatnonzero(np.concatenate([[True], side[1:] != side[:-1]]))
+    ends = np.append(starts[1:], n)
+    run_growth = np.multiply.reduceat(growth, starts)
+    run_adjustments = np.multiply.reduceat(adjustments, starts)
+
+    held = side[starts] != 0
+    starts, ends = starts[held], ends[held]
+    run_growth, run_adjustments = run_growth[held], run_adjustments[held]
+    is_open = ends == n
+
+    entry_rate = np.abs(executed[starts]) * rate
+    exit_rate = np.where(is_open, 0.0, np.abs(executed[ends - 1]) * rate)
+
+    return {
+        'executed': executed,
+        'growth': growth,
+        'starts': starts,
+        'exits': np.where(is_open, n - 1, ends),
+        'is_open': is_open,
+        'run_growth': run_growth,
+        # Valeur nette de sortie par unité de capital engagé à l'entrée
+        'net_growth': (1 - entry_rate) * run_growth * run_adjustments * (1 - exit_rate)
+    }
+
+def trade_returns(positions: np.ndarray, asset_returns: np.ndarray, commission: float = 0.0,
+                  slippage: float = 0.0) -> np.ndarray:
+    """
+    Rendement net de chaque transaction du registre, sans avoir besoin des prix ni de la NAV
+
+    Parameters
+    ----------
+    positions: ndarray
+        position décidée à chaque date
+    asset_returns: ndarray
+        rendements de l'actif à chaque date (le premier étant ignoré)
+    commission: float
+        commission appliquée
+    slippage: float
+        slippage appliqué
+
+    Returns
+    ----------
+    ndarray
+        rendement net de chaque transaction, dans l'ordre du registre
+    """
+    if len(positions) < 2:
+        return np.empty(0)
+    return _trade_runs(positions, asset_returns, commission, slippage)['net_growth'] - 1
+
+def trade_ledger(positions: np.ndarray, close: np.ndarray, nav: np.ndarray, index: pd.DatetimeIndex,
+                 commission: float, slippage: float) -> np.ndarray:
+    """
+    Construit le registre des transactions en une passe vectorisée sur les positions et les prix.
+    Avec la convention de compute_nav, la position décidée en i est exécutée à la clôture de i+1 :
+    une transaction est une plage de dates consécutives où la position exécutée garde le même sens non nul.
+    Le P&L brut compose les rendements de l'actif sur la durée de la transaction comme la NAV ;
+    les coûts valent size * (commission + slippage) à l'entrée et à la sortie (sauf transaction en cours),
+    plus la variation de taille à chaque ajustement de la position en cours.
+
+    Parameters
+    ----------
+    positions: ndarray
+        position décidée à chaque date
+    close: ndarray
+        prix de clôture (les prix manquants sont propagés)
+    nav: ndarray
+        NAV à chaque date, utilisée comme capital engagé à l'entrée
+    index: DatetimeIndex
+        dates
+    commission: float
+        commission appliquée
+    slippage: float
+        slippage appliqué
+
+    Returns
+    ----------
+    ndarray
+        tableau structuré (TRADE_DTYPE) avec une transaction par ligne (size est la taille à l'entrée) ;
+        une transaction encore ouverte à la dernière date est valorisée au dernier prix et marquée is_open
+    """
+    prices = pd.Series(np.asarray(close, dtype=np.float64)).ffill().values
+    nav = np.asarray(nav, dtype=np.float64)
+    times = pd.DatetimeIndex(index).values.astype('datetime64[ns]')
+
+    if len(prices) < 2:
+        return np.empty(0, dtype=TRADE_DTYPE)
+
+    asset_returns = np.zeros(len(prices))
+    asset_returns[1:] = prices[1:] / prices[:-1] - 1
+    asset_returns[np.isnan(asset_returns)] = 0.0
+
+    runs = _trade_runs(positions, asset_returns, commission, slippage)
+    starts, exits, executed = runs['starts'], runs['exits'], runs['executed']
+
+    capital = nav[starts - 1] * runs['growth'][starts - 1]
+    gross_pnl = capital * (runs['run_growth'] - 1)
+
+    ledger = np.empty(len(starts), dtype=TRADE_DTYPE)
+    ledger['entry_time'] = times[starts]
+    ledger['exit_time'] = times[exits]
+    ledger['side'] = np.sign(executed[starts])
+    ledger['size'] = np.abs(executed[starts])
+    ledger['entry_price'] = prices[starts]
+    ledger['exit_price'] = prices[exits]
+    ledger['holding_period'] = exits - starts
+    ledger['gross_pnl'] = gross_pnl
+    ledger['net_pnl'] = capital * (runs['net_growth'] - 1)
+    ledger['costs'] = gross_pnl - ledger['net_pnl']
+    ledger['is_open'] = runs['is_open']
+    return ledger
+
+def trade_statistics(ledger: np.ndarray) -> Dict[str, float]:
+    """
+    Statistiques des transactions déduites du registre en O(nombre de transactions)
+
+    Parameters
+    ----------
+    ledger: ndarray
+        registre des transactions (voir trade_ledger)
+
+    Returns
+    ----------
+    dict
+        nombre de transactions, taux de transactions gagnantes (P&L net positif), profit factor
+        (somme des gains sur somme des pertes), durée moyenne de détention en périodes et espérance
+        (P&L net moyen par transaction)
+    """
+    net_pnl = ledger['net_pnl']
+    n_trades = len(ledger)
+    if n_trades == 0:
+        return {
+            'Number of Trades': 0,
+            'Win Rate (%)': 0.0,
+            'Profit Factor': np.nan,
+            'Average Holding Period': np.nan,
+            'Expectancy': np.nan
+        }
+
+    gains = net_pnl[net_pnl > 0].sum()
+    losses = -net_pnl[net_pnl < 0].sum()
+
+    return {
+        'Number of Trades': n_trades,
+        'Win Rate (%)': np.mean(net_pnl > 0) * 100,
+        'Profit Factor': gains / losses if losses != 0 else np.inf,
+        'Average Holding Period': ledger['holding_period'].mean(),
+        'Expectancy': net_pnl.mean()
+    }
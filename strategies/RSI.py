@@ -1,7 +1,47 @@
-from strategies.strategy_constructor import strategy
+from strategies.strategy_constructor import Strategy, strategy
+from strategies.indicators import RollingRSI
+from strategies.compiled import CompiledStrategy, MEAN_STATE_SIZE, njit, rolling_mean_update
+from dataclasses import dataclass
 import pandas as pd
+import numpy as np
 
-@strategy(name="RSI")
+def rsi_positions(data: pd.DataFrame, rsi_period: int = 14, overbought: float = 70, 
+                  oversold: float = 30) -> pd.Series:
+    """
+    Version vectorisée de rsi_strategy : calcule les positions sur tout l'historique en une passe.
+    
+    Parameters
+    ----------
+    data: DataFrame 
+        série de données historiques complète
+    rsi_period: int
+        période pour le calcul du RSI (par défaut à 14)
+    overbought: float
+        début de la zone de surachat (par défaut à 70)
+    oversold: float
+        début de la zone de survente (par défaut à 30)
+        
+    Returns
+    ----------
+    Series
+        position à chaque date (-1.0, 0.0, ou 1.0)
+    """
+    close_prices = data['close']
+    abs_return = close_prices.diff()
+    
+    gains = (abs_return.where(abs_return > 0, 0)).rolling(window=rsi_period).mean()
+    losses = (-abs_return.where(abs_return < 0, 0)).rolling(window=rsi_period).mean()
+    
+    rsi = 100 - (100 / (1 + gains / losses))
+    
+    # NaN => RSI hors des zones, la position courante est conservée
+    signals = pd.Series(np.select([rsi < oversold, rsi > overbought], [1.0, -1.0], default=np.nan), 
+                        index=data.index)
+    signals.iloc[:rsi_period - 1] = 0.0
+    
+    return signals.ffill().fillna(0.0)
+
+@strategy(name="RSI", vectorized=rsi_positions)
 def rsi_strategy(historical_data: pd.DataFrame, current_position: float,
                 rsi_period: int = 14, overbought: float = 70, oversold: float = 30) -> float:
     """
@@ -44,4 +84,152 @@ def rsi_strategy(historical_data: pd.DataFrame, current_position: float,
     elif rsi.iloc[-1] > overbought:
         return -1.0
     
-    return float(current_position)
\ No newline at end of file
+    return float(current_position)
+
+@dataclass
+class StreamingRSI(Strategy):
+    """
+    Version incrémentale de rsi_strategy : les moyennes des gains et des pertes sont mises à jour
+    en O(1) à chaque nouvelle barre au lieu d'être recalculées sur tout l'historique.
+    Donne les mêmes positions que rsi_strategy et peut être utilisée barre par barre en direct via update()
+    """
+    rsi_period: int = 14
+    overbought: float = 70
+    oversold: float = 30
+    
+    def __post_init__(self):
+        self.reset()
+    
+    def reset(self) -> None:
+        """
+        Réinitialise l'état de l'indicateur
+        """
+        self.rsi = RollingRSI(self.rsi_period)
+        self.n_bars = 0
+        self.last_timestamp = None
+    
+    def fit(self, data: pd.DataFrame) -> None:
+        """
+        Réinitialise l'état avant un nouveau passage sur les données
+
+        Parameters
+        ----------
+        data: DataFrame
+            série de données historiques
+        """
+        self.reset()
+    
+    def _decide(self, current_position: float) -> float:
+        if self.n_bars < self.rsi_period:
+            return 0.0
+        
+        if self.rsi.value < self.oversold:
+            return 1.0
+        elif self.rsi.value > self.overbought:
+            return -1.0
+        
+        return float(current_position)
+    
+    def update(self, price: float, current_position: float) -> float:
+        """
+        Intègre un nouveau prix et renvoie la position associée
+
+        Parameters
+        ----------
+        price: float
+            nouveau prix de clôture
+        current_position: float
+            position actuelle (-1.0, 0 ou 1.0)
+
+        Returns
+        ----------
+        float
+            nouvelle position (-1.0, 0.0, ou 1.0)
+        """
+        self.rsi.update(price)
+        self.n_bars += 1
+        self.last_timestamp = None
+        return self._decide(current_position)
+    
+    def get_position(self, historical_data: pd.DataFrame, current_position: float) -> float:
+        """
+        Intègre uniquement les barres non encore vues de l'historique puis détermine la position.
+        La date de la dernière barre intégrée est conservée : un historique qui ne la contient pas
+        à la même place (autres données) réinitialise l'état.
+
+        Parameters
+        ----------
+        historical_data: DataFrame 
+            série de données historiques
+        current_position: float
+            position actuelle (-1.0, 0 ou 1.0)
+
+        Returns
+        ----------
+        float
+            nouvelle position (-1.0, 0.0, ou 1.0)
+        """
+        # L'historique doit prolonger les barres déjà intégrées, sinon l'état est reconstruit
+        if len(historical_data) < self.n_bars or (
+                self.n_bars > 0 and historical_data.index[self.n_bars - 1] != self.last_timestamp):
+            self.reset()
+        
+        for price in historical_data['close'].values[self.n_bars:]:
+            self.rsi.update(price)
+            self.n_bars += 1
+        if self.n_bars > 0:
+            self.last_timestamp = historical_data.index[-1]
+        
+        return self._decide(current_position)
+
+@njit(cache=True)
+def rsi_kernel(i: int, prices: np.ndarray, params: np.ndarray, state: np.ndarray,
+               current_position: float) -> float:
+    """
+    Noyau compilable de rsi_strategy : met à jour les moyennes des gains et des pertes avec le prix
+    de la date i et décide de la position. L'état contient les accumulateurs des deux moyennes.
+    """
+    rsi_period = int(params[0])
+    overbought, oversold = params[1], params[2]
+    
+    abs_return = prices[i] - prices[i - 1] if i > 0 else np.nan
+    old_return = prices[i - rsi_period] - prices[i - rsi_period - 1] if i > rsi_period else np.nan
+    
+    gain = rolling_mean_update(state, 0, abs_return if abs_return > 0 else 0.0,
+                               old_return if old_return > 0 else 0.0, i, rsi_period)
+    loss = rolling_mean_update(state, MEAN_STATE_SIZE, -abs_return if abs_return < 0 else -0.0,
+                               -old_return if old_return < 0 else -0.0, i, rsi_period)
+    
+    if i + 1 < rsi_period:
+        return 0.0
+    
+    # Division par zéro traitée comme avec NumPy : RSI à 100 sans perte, indéfini sans variation
+    if loss == 0:
+        rsi = 100.0 if gain > 0 else np.nan
+    else:
+        rsi = 100 - (100 / (1 + gain / loss))
+    
+    if rsi < oversold:
+        return 1.0
+    elif rsi > overbought:
+        return -1.0
+    
+    return current_position
+
+@dataclass
+class CompiledRSI(CompiledStrategy):
+    """
+    Version compilée de rsi_strategy : la logique barre par barre est exécutée par rsi_kernel,
+    compilé par numba lorsqu'il est installé. Donne les mêmes positions que rsi_strategy.
+    """
+    rsi_period: int = 14
+    overbought: float = 70
+    oversold: float = 30
+    
+    kernel = staticmethod(rsi_kernel)
+    
+    def kernel_params(self) -> np.ndarray:
+        return np.array([self.rsi_period, self.overbought, self.oversold], dtype=np.float64)
+    
+    def initial_state(self) -> np.ndarray:
+        return np.zeros(2 * MEAN_STATE_SIZE)
@@ -1,14 +1,24 @@
-from strategies.strategy_constructor import Strategy, strategy
-from strategies.moving_average import ma_crossover as MovingAverageCrossover
-from strategies.RSI import rsi_strategy as RSIStrategy
+from strategies.strategy_constructor import Strategy, PortfolioStrategy, strategy
+from strategies.compiled import CompiledStrategy
+from strategies.moving_average import ma_crossover as MovingAverageCrossover, StreamingMACrossover, CompiledMACrossover
+from strategies.RSI import rsi_strategy as RSIStrategy, StreamingRSI, CompiledRSI
 from strategies.arima import ARIMAStrategy
 from strategies.linear_trend import LinearTrendStrategy
+from strategies.portfolio import EqualWeight, CrossSectionalMomentum
 
 __all__ = [
             'Strategy', 
             'strategy', 
             'MovingAverageCrossover', 
             'RSIStrategy', 
+            'StreamingMACrossover',
+            'StreamingRSI',
+            'CompiledStrategy',
+            'CompiledMACrossover',
+            'CompiledRSI',
             'ARIMAStrategy', 
-            'LinearTrendStrategy'
+            'LinearTrendStrategy',
+            'PortfolioStrategy',
+            'EqualWeight',
+            'CrossSectionalMomentum'
             ]
@@ -3,28 +3,109 @@ import pandas as pd
 import numpy as np
 from statsmodels.tsa.arima.model import ARIMA
 from dataclasses import dataclass
-from typing import Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+import hashlib
 import itertools
+import json
+import os
 import warnings
 
 NumericArray = Union[np.ndarray,pd.DataFrame]
 
+ORDER_SEARCH_SPACE = {
+    'p': range(0, 3),
+    'd': range(0, 2),
+    'q': range(0, 3)
+}
+
+def _fit_candidate(data: np.ndarray, order: Tuple[int, int, int], require_convergence: bool = False) -> Optional[float]:
+    """
+    Estime un modèle ARIMA candidat et renvoie son BIC, ou None si l'estimation échoue
+    (ou ne converge pas si require_convergence)
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore')
+        try:
+            results = ARIMA(data, order=order).fit()
+        except Exception:
+            return None
+    
+    if require_convergence and not results.mle_retvals.get('converged', True):
+        return None
+    if not np.isfinite(results.bic):
+        return None
+    return results.bic
+
 @dataclass
 class ARIMAStrategy(Strategy):
     """
-    Stratégie basée sur les prédictions d'un modèle ARIMA
+    Stratégie basée sur les prédictions d'un modèle ARIMA.
+    Par défaut le modèle est ré-estimé à chaque date ; si refit_interval est renseigné, le modèle
+    estimé est mis à jour avec les nouvelles observations et n'est ré-estimé que tous les
+    refit_interval pas (ou dès que l'erreur de prévision absolue moyenne dépasse error_tolerance).
+    Entre deux ré-estimations les paramètres sont figés : les prévisions s'écartent de celles de la
+    ré-estimation à chaque date, d'autant plus que refit_interval est grand (voir benchmarks.bench_arima).
+    Le défaut (None) reste exact ; un petit refit_interval ou un error_tolerance de l'ordre de
+    l'écart-type des prévisions limite cet écart.
+    La sélection des ordres peut utiliser n_jobs processus (None pour tous les cœurs) et un cache disque
+    dans order_cache_dir ; les deux sont désactivés par défaut. Avec prune_orders, les estimations qui
+    échouent ou ne convergent pas sont écartées et éliminent les ordres plus complexes, ce qui accélère
+    la recherche mais peut changer l'ordre retenu.
     """
     window_size: int = 252
     threshold: float = 0.05
+    refit_interval: Optional[int] = None
+    error_tolerance: Optional[float] = None
+    n_jobs: Optional[int] = 1
+    order_cache_dir: Optional[str] = None
+    prune_orders: bool = False
     
     def __post_init__(self):
         self.model = None
         self.is_fitted = False
         self.best_order = None
+        self._reset_incremental_state()
+    
+    def _reset_incremental_state(self) -> None:
+        self._n_seen = 0
+        self._last_timestamp = None
+        self._bars_since_refit = 0
+        self._last_forecast = np.nan
+        self._forecast_errors: List[float] = []
+        self._incremental_model = None
+    
+    @property
+    def last_forecast(self) -> float:
+        """
+        Dernier rendement logarithmique prévu par get_position (NaN avant la première prévision)
+        """
+        return self._last_forecast
+    
+    def _order_cache_path(self, data: np.ndarray) -> Optional[str]:
+        if self.order_cache_dir is None:
+            return None
+        key = hashlib.sha256()
+        key.update(np.ascontiguousarray(data, dtype=np.float64).tobytes())
+        key.update(repr({name: list(values) for name, values in ORDER_SEARCH_SPACE.items()}).encode())
+        key.update(repr(self.prune_orders).encode())
+        return os.path.join(self.order_cache_dir, f"{key.hexdigest()}.json")
+    
+    def _evaluate_orders(self, data: np.ndarray, orders: List[Tuple[int, int, int]], 
+                         executor: Optional[ProcessPoolExecutor]) -> Dict[Tuple[int, int, int], Optional[float]]:
+        if executor is None:
+            return {order: _fit_candidate(data, order, self.prune_orders) for order in orders}
+        return dict(zip(orders, executor.map(_fit_candidate, itertools.repeat(data), orders,
+                                             itertools.repeat(self.prune_orders))))
     
     def select_order(self, data: NumericArray)->set:
         """
-        Sélectionne les meilleurs ordres (p,d,q) selon le critère BIC
+        Sélectionne les meilleurs ordres (p,d,q) selon le critère BIC.
+        Les candidats sont estimés (en parallèle si n_jobs le permet) par complexité croissante (p+q).
+        Avec prune_orders, un ordre dont l'estimation échoue ou ne converge pas élimine les ordres plus
+        complexes (p et q supérieurs, même d) ; sinon tous les ordres sont estimés et les modèles non
+        convergés restent candidats. L'ordre retenu est mis en cache sur disque si order_cache_dir est renseigné.
+        
         Parameters
         ----------
         data: NumericArray
@@ -35,27 +116,48 @@ class ARIMAStrategy(Strategy):
         best_order: set
             meilleurs ordres (p,d,q)
         """
-        best_bic = np.inf
-        best_order = None
+        data = np.asarray(data, dtype=float)
         
-        p = range(0, 3)
-        d = range(0, 2)
-        q = range(0, 3)
+        cache_path = self._order_cache_path(data)
+        if cache_path is not None and os.path.exists(cache_path):
+            with open(cache_path) as file:
+                return tuple(json.load(file)['order'])
         
-        with warnings.catch_warnings():
-            warnings.filterwarnings('ignore')
-            
-            for order in itertools.product(p, d, q):
-                try:
-                    model = ARIMA(data, order=order)
-                    results = model.fit()
-                    if results.bic < best_bic:
-                        best_bic = results.bic
-                        best_order = order
-                except:
-                    continue
-                    
-        return best_order if best_order is not None else (1, 0, 1)
+        candidates = list(itertools.product(*ORDER_SEARCH_SPACE.values()))
+        failed = []
+        bics = {}
+        
+        executor = ProcessPoolExecutor(max_workers=self.n_jobs) if self.n_jobs != 1 else None
+        try:
+            for complexity in sorted({p + q for p, _, q in candidates}):
+                orders = [
+                    (p, d, q) for p, d, q in candidates
+                    if p + q == complexity and not any(
+                        d == fd and p >= fp and q >= fq for fp, fd, fq in failed
+                    )
+                ]
+                for order, bic in self._evaluate_orders(data, orders, executor).items():
+                    if bic is None:
+                        if self.prune_orders:
+                            failed.append(order)
+                    else:
+                        bics[order] = bic
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        if not bics:
+            return (1, 0, 1)
+        
+        # En cas d'égalité, le premier ordre de l'espace de recherche est retenu
+        best_order = min(bics, key=lambda order: (bics[order], candidates.index(order)))
+        
+        if cache_path is not None:
+            os.makedirs(self.order_cache_dir, exist_ok=True)
+            with open(cache_path, 'w') as file:
+                json.dump({'order': list(best_order), 'bic': bics[best_order]}, file)
+        
+        return best_order
 
     def fit(self, data: pd.DataFrame) -> None:
         """
@@ -67,6 +169,7 @@ class ARIMAStrategy(Strategy):
             série de données historiques
         """
         returns = np.log(data['close']).diff().dropna()
+        self._reset_incremental_state()
         
         if len(returns) >= self.window_size:
             try:
@@ -82,6 +185,66 @@ class ARIMAStrategy(Strategy):
                 print(f"ARIMA fitting error: {e}")
                 self.is_fitted = False
     
+    def _continues_history(self, returns: pd.Series) -> bool:
+        """
+        Indique si returns prolonge l'historique déjà intégré au modèle (même date pour le dernier rendement vu)
+        """
+        if self._n_seen == 0:
+            return True
+        return len(returns) >= self._n_seen and returns.index[self._n_seen - 1] == self._last_timestamp
+    
+    def _needs_refit(self) -> bool:
+        if self._incremental_model is None:
+            return True
+        if self._bars_since_refit >= self.refit_interval:
+            return True
+        if self.error_tolerance is not None and self._forecast_errors:
+            return np.mean(np.abs(self._forecast_errors)) > self.error_tolerance
+        return False
+    
+    def _update_model(self, returns: pd.Series):
+        """
+        Met à jour le modèle de manière incrémentale : les nouvelles observations sont intégrées
+        au filtre de Kalman avec les paramètres estimés (extend), et le modèle n'est ré-estimé
+        que tous les refit_interval pas ou lorsque l'erreur de prévision moyenne dépasse error_tolerance.
+        Si returns ne prolonge pas l'historique déjà intégré, l'état incrémental est reconstruit
+        
+        Parameters
+        ----------
+        returns: Series
+            rendements logarithmiques historiques
+        
+        Returns
+        ----------
+        ARIMAResults
+            résultats du modèle à jour
+        """
+        if not self._continues_history(returns):
+            self._reset_incremental_state()
+        
+        values = returns.values
+        new_returns = values[self._n_seen:]
+        
+        if len(new_returns) > 0 and not np.isnan(self._last_forecast):
+            self._forecast_errors.append(new_returns[0] - self._last_forecast)
+        
+        if self._needs_refit():
+            with warnings.catch_warnings():
+                warnings.filterwarnings('ignore')
+                self._incremental_model = ARIMA(
+                    values[-self.window_size:],
+                    order=self.best_order
+                ).fit()
+            self._bars_since_refit = 0
+            self._forecast_errors = []
+        elif len(new_returns) > 0:
+            self._incremental_model = self._incremental_model.extend(new_returns)
+            self._bars_since_refit += len(new_returns)
+        
+        self._n_seen = len(values)
+        self._last_timestamp = returns.index[-1]
+        return self._incremental_model
+    
     def get_position(self, historical_data: pd.DataFrame, current_position: float) -> float:
         """
         Détermine la position en fonction de la prédiction du modèle ARIMA.
@@ -105,12 +268,16 @@ class ARIMAStrategy(Strategy):
         try:
             returns = np.log(historical_data['close']).diff().dropna()
             
-            self.model = ARIMA(
-                returns[-self.window_size:],
-                order=self.best_order
-            ).fit()
+            if self.refit_interval is None:
+                self.model = ARIMA(
+                    returns.values[-self.window_size:],
+                    order=self.best_order
+                ).fit()
+            else:
+                self.model = self._update_model(returns)
             
             predicted_return = self.model.forecast(steps=1)[0]
+            self._last_forecast = predicted_return
             
             if predicted_return > self.threshold:
                 return 1.0 
@@ -0,0 +1,241 @@
+from strategies.strategy_constructor import Strategy
+from abc import abstractmethod
+from typing import Callable, Optional
+import math
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit #type: ignore
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        Remplace numba.njit lorsque numba n'est pas installé : les fonctions restent en Python pur
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Disposition de l'état d'une moyenne mobile dans un tableau (voir RollingMean)
+_NOBS, _SUM, _NEG_CT, _COMPENSATION_ADD, _COMPENSATION_REMOVE, _SAME_VALUE_COUNT, _PREV_VALUE = range(7)
+MEAN_STATE_SIZE = 7
+
+@njit(cache=True)
+def rolling_mean_update(state: np.ndarray, offset: int, value: float, old_value: float,
+                        n_values: int, window: int) -> float:
+    """
+    Met à jour une moyenne mobile stockée dans state[offset:offset + MEAN_STATE_SIZE].
+    Accumulateur unique de RollingMean et des noyaux compilés, qui reproduit exactement celui de pandas.
+
+    Parameters
+    ----------
+    state: ndarray
+        état de la stratégie
+    offset: int
+        position de l'accumulateur dans state
+    value: float
+        nouvelle observation
+    old_value: float
+        observation qui sort de la fenêtre (ignorée tant que la fenêtre n'est pas remplie)
+    n_values: int
+        nombre d'observations déjà intégrées
+    window: int
+        taille de la fenêtre
+
+    Returns
+    ----------
+    float
+        moyenne sur la fenêtre (NaN tant que la fenêtre n'est pas remplie)
+    """
+    if n_values == 0 or window == 1:
+        for k in range(MEAN_STATE_SIZE):
+            state[offset + k] = 0.0
+        state[offset + _PREV_VALUE] = value
+    elif n_values >= window and old_value == old_value:
+        state[offset + _NOBS] -= 1
+        y = -old_value - state[offset + _COMPENSATION_REMOVE]
+        t = state[offset + _SUM] + y
+        state[offset + _COMPENSATION_REMOVE] = t - state[offset + _SUM] - y
+        state[offset + _SUM] = t
+        if math.copysign(1.0, old_value) < 0:
+            state[offset + _NEG_CT] -= 1
+
+    if value == value:
+        state[offset + _NOBS] += 1
+        y = value - state[offset + _COMPENSATION_ADD]
+        t = state[offset + _SUM] + y
+        state[offset + _COMPENSATION_ADD] = t - state[offset + _SUM] - y
+        state[offset + _SUM] = t
+        if math.copysign(1.0, value) < 0:
+            state[offset + _NEG_CT] += 1
+        if value == state[offset + _PREV_VALUE]:
+            state[offset + _SAME_VALUE_COUNT] += 1
+        else:
+            state[offset + _SAME_VALUE_COUNT] = 1
+        state[offset + _PREV_VALUE] = value
+
+    nobs = state[offset + _NOBS]
+    if nobs < window:
+        return np.nan
+
+    result = state[offset + _SUM] / nobs
+    if state[offset + _SAME_VALUE_COUNT] >= nobs:
+        result = state[offset + _PREV_VALUE]
+    elif state[offset + _NEG_CT] == 0 and result < 0:
+        result = 0.0
+    elif state[offset + _NEG_CT] == nobs and result > 0:
+        result = 0.0
+    return result
+
+# Pas de cache disque : l'index du cache référence le noyau reçu en argument et devient invalide
+# dès que le module du noyau est modifié
+@njit
+def run_kernel(kernel: Callable, prices: np.ndarray, params: np.ndarray, state: np.ndarray) -> np.ndarray:
+    """
+    Exécute le noyau d'une stratégie compilée sur tout l'historique en partant d'une position nulle
+
+    Parameters
+    ----------
+    kernel: Callable
+        noyau (i, prices, params, state, current_position) -> position
+    prices: ndarray
+        prix de clôture
+    params: ndarray
+        paramètres de la stratégie
+    state: ndarray
+        état initial, mis à jour en place
+
+    Returns
+    ----------
+    ndarray
+        position à chaque date
+    """
+    positions = np.zeros(len(prices))
+    position = 0.0
+    for i in range(len(prices)):
+        position = kernel(i, prices, params, state, position)
+        positions[i] = position
+    return positions
+
+@njit
+def advance_kernel(kernel: Callable, prices: np.ndarray, params: np.ndarray, state: np.ndarray,
+                   start: int, current_position: float) -> float:
+    """
+    Intègre dans l'état les dates start à len(prices) - 2 puis décide de la position de la dernière date
+    à partir de current_position. Les positions des dates intermédiaires ne sont pas utilisées :
+    l'état du noyau ne dépend que des prix.
+    """
+    for i in range(start, len(prices) - 1):
+        kernel(i, prices, params, state, 0.0)
+    return kernel(len(prices) - 1, prices, params, state, current_position)
+
+def _same_price(price: float, other: float) -> bool:
+    return price == other or (math.isnan(price) and math.isnan(other))
+
+class CompiledStrategy(Strategy):
+    """
+    Classe abstraite des stratégies dont la logique barre par barre est écrite sur des tableaux NumPy
+    avec un état explicite, afin d'être compilée par numba (ou exécutée en Python pur sans numba).
+    Le noyau kernel(i, prices, params, state, current_position) -> float décide de la position
+    à la date i à partir des prix jusqu'à i, des paramètres et de l'état qu'il met à jour ; l'état
+    ne doit dépendre que des prix, pas de current_position. get_position conserve l'état entre deux appels
+    sur des historiques qui s'allongent et n'intègre que les nouvelles dates.
+    """
+    kernel: Callable[[int, np.ndarray, np.ndarray, np.ndarray, float], float]
+
+    # État du noyau conservé entre deux appels de get_position
+    _kernel_state = None
+    _kernel_bars = 0
+    _kernel_buffer = 0
+    _kernel_last_price = np.nan
+
+    @abstractmethod
+    def kernel_params(self) -> np.ndarray:
+        """
+        Paramètres de la stratégie passés au noyau
+
+        Returns
+        ----------
+        ndarray
+            paramètres sous forme de tableau de flottants
+        """
+        pass
+
+    @abstractmethod
+    def initial_state(self) -> np.ndarray:
+        """
+        État initial du noyau, avant la première barre
+
+        Returns
+        ----------
+        ndarray
+            état sous forme de tableau de flottants
+        """
+        pass
+
+    def fit(self, data: pd.DataFrame) -> None:
+        self._reset_kernel()
+
+    def _reset_kernel(self) -> None:
+        self._kernel_state = None
+        self._kernel_bars = 0
+        self._kernel_buffer = 0
+        self._kernel_last_price = np.nan
+
+    def get_position(self, historical_data: pd.DataFrame, current_position: float) -> float:
+        """
+        Fait avancer le noyau sur les dates ajoutées depuis l'appel précédent et renvoie la position
+        de la dernière date. L'état est réinitialisé si l'historique n'est pas le prolongement du
+        précédent (données différentes ou historique plus court).
+
+        Parameters
+        ----------
+        historical_data: DataFrame
+            série de données historiques
+        current_position: float
+            position actuelle (-1.0, 0 ou 1.0)
+
+        Returns
+        ----------
+        float
+            nouvelle position (-1.0, 0.0, ou 1.0)
+        """
+        prices = np.ascontiguousarray(historical_data['close'].values, dtype=np.float64)
+        if len(prices) == 0:
+            return current_position
+
+        # Les historiques successifs du Backtester sont des tranches du même tableau de prix
+        buffer = prices.__array_interface__['data'][0]
+        bars = self._kernel_bars
+        if (self._kernel_state is None or buffer != self._kernel_buffer or len(prices) <= bars
+                or not _same_price(prices[bars - 1], self._kernel_last_price)):
+            self._kernel_state = self.initial_state()
+            bars = 0
+
+        position = advance_kernel(type(self).kernel, prices, self.kernel_params(), self._kernel_state,
+                                  bars, float(current_position))
+        self._kernel_bars = len(prices)
+        self._kernel_buffer = buffer
+        self._kernel_last_price = prices[-1]
+        return float(position)
+
+    def generate_positions(self, data: pd.DataFrame) -> Optional[pd.Series]:
+        """
+        Calcule toutes les positions en un seul passage du noyau
+
+        Parameters
+        ----------
+        data: DataFrame
+            série de données historiques complète
+
+        Returns
+        ----------
+        Series
+            position à chaque date
+        """
+        prices = np.ascontiguousarray(data['close'].values, dtype=np.float64)
+        positions = run_kernel(type(self).kernel, prices, self.kernel_params(), self.initial_state())
+        return pd.Series(positions, index=data.index)
@@ -0,0 +1,89 @@
+from collections import deque
+import numpy as np
+from strategies.compiled import MEAN_STATE_SIZE, rolling_mean_update
+
+class RollingMean:
+    """
+    Moyenne mobile incrémentale mise à jour en O(1) à chaque nouvelle valeur.
+    L'accumulateur est celui des stratégies compilées (rolling_mean_update), qui reproduit celui
+    de pandas (somme compensée de Kahan, gestion des NaN, des signes et des valeurs répétées) afin
+    de donner exactement les mêmes valeurs que Series.rolling(window).mean()
+    """
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("window must be a positive integer")
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Réinitialise l'état de l'indicateur
+        """
+        self._values = deque()
+        self._state = np.zeros(MEAN_STATE_SIZE)
+        self.value = np.nan
+
+    def update(self, value: float) -> float:
+        """
+        Ajoute une nouvelle valeur et met à jour la moyenne
+
+        Parameters
+        ----------
+        value: float
+            nouvelle observation
+
+        Returns
+        ----------
+        float
+            moyenne sur la fenêtre (NaN tant que la fenêtre n'est pas remplie)
+        """
+        value = float(value)
+        n_values = len(self._values)
+        old_value = self._values.popleft() if n_values == self.window else np.nan
+        self._values.append(value)
+
+        self.value = float(rolling_mean_update(self._state, 0, value, old_value, n_values, self.window))
+        return self.value
+
+class RollingRSI:
+    """
+    Relative Strength Index incrémental : moyennes mobiles des gains et des pertes mises à jour
+    en O(1) à chaque nouveau prix, identiques au calcul par rolling().mean() de rsi_strategy
+    """
+    def __init__(self, period: int):
+        self.period = period
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Réinitialise l'état de l'indicateur
+        """
+        self.gains = RollingMean(self.period)
+        self.losses = RollingMean(self.period)
+        self._prev_price = np.nan
+        self.value = np.nan
+
+    def update(self, price: float) -> float:
+        """
+        Ajoute un nouveau prix et met à jour le RSI
+
+        Parameters
+        ----------
+        price: float
+            nouveau prix de clôture
+
+        Returns
+        ----------
+        float
+            valeur du RSI (NaN tant que la période n'est pas remplie ou sans variation de prix)
+        """
+        price = float(price)
+        abs_return = price - self._prev_price
+        self._prev_price = price
+
+        gain = self.gains.update(abs_return if abs_return > 0 else 0.0)
+        loss = self.losses.update(-abs_return if abs_return < 0 else -0.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.value = float(100 - (100 / (1 + np.float64(gain) / np.float64(loss))))
+        return self.value
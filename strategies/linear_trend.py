@@ -1,10 +1,37 @@
 from dataclasses import dataclass
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
 from typing import Optional
 from strategies.strategy_constructor import Strategy
 
+def rolling_slope(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Compute the OLS slope of every rolling window at once.
+    With an evenly spaced x-axis, the slope is a fixed linear combination of the window's
+    values, so all the windows are obtained with a single convolution
+    
+    Parameters
+    ----------
+    values: np.ndarray
+        série de données historiques
+    window: int
+        taille de la fenêtre de régression
+        
+    Returns
+    ----------
+    np.ndarray
+        pente de chaque fenêtre complète (len(values) - window + 1 valeurs)
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) < window:
+        return np.empty(0)
+    if window == 1:
+        return np.zeros(len(values))
+    
+    x = np.arange(window) - (window - 1) / 2
+    kernel = x / np.sum(x ** 2)
+    return np.convolve(values, kernel[::-1], mode='valid')
+
 @dataclass
 class LinearTrendStrategy(Strategy):
     """
@@ -14,7 +41,6 @@ class LinearTrendStrategy(Strategy):
     trend_threshold: float = 0.001
     
     def __post_init__(self):
-        self.model = LinearRegression()
         self.is_fitted = False
         self.optimal_threshold: Optional[float] = None
     
@@ -27,11 +53,7 @@ class LinearTrendStrategy(Strategy):
         data: pd.Series
             série de données historiques
         """
-        n = len(prices)
-        X = np.arange(n).reshape(-1, 1)
-        y = prices.values.reshape(-1, 1)
-        self.model.fit(X, y)
-        return self.model.coef_[0][0]
+        return rolling_slope(prices.values, len(prices))[0]
     
     def fit(self, data: pd.DataFrame) -> None:
         """
@@ -47,14 +69,7 @@ class LinearTrendStrategy(Strategy):
             return
             
         prices = data['close'].copy()
-        slopes = []
-        
-        for i in range(len(data) - self.window_size + 1):
-            window = prices.iloc[i:i+self.window_size]
-            slope = self._calculate_slope(window)
-            slopes.append(slope)
-        
-        slopes = pd.Series(slopes, index=prices.index[self.window_size-1:])
+        slopes = pd.Series(rolling_slope(prices.values, self.window_size), index=prices.index[self.window_size-1:])
         returns = np.log(prices).diff().dropna()
         
         aligned_data = pd.concat([slopes, returns], axis=1, join='inner')
@@ -112,4 +127,26 @@ class LinearTrendStrategy(Strategy):
                 
         except Exception as e:
             print(f"Linear trend error: {e}")
-            return current_position
\ No newline at end of file
+            return current_position
+    
+    def generate_positions(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Identify the position at every date in a single pass with the rolling slope kernel
+
+        Parameters
+        ----------
+        data: DataFrame 
+            série de données historiques complète
+
+        Returns
+        ----------
+        Series
+            position à chaque date (-1.0, 0.0, ou 1.0)
+        """
+        threshold = self.optimal_threshold if self.is_fitted else self.trend_threshold
+        
+        slopes = np.full(len(data), np.nan)
+        slopes[self.window_size-1:] = rolling_slope(data['close'].values, self.window_size)
+        
+        positions = np.select([slopes > threshold, slopes < -threshold], [1.0, -1.0], default=0.0)
+        return pd.Series(positions, index=data.index)
@@ -1,7 +1,44 @@
-from strategies.strategy_constructor import strategy
+from strategies.strategy_constructor import Strategy, strategy
+from strategies.indicators import RollingMean
+from strategies.compiled import CompiledStrategy, MEAN_STATE_SIZE, njit, rolling_mean_update
+from dataclasses import dataclass
 import pandas as pd
+import numpy as np
 
-@strategy(name="MA Crossover")
+def ma_crossover_positions(data: pd.DataFrame, short_window: int = 20, long_window: int = 50) -> pd.Series:
+    """
+    Version vectorisée de ma_crossover : calcule les positions sur tout l'historique en une passe.
+    
+    Parameters
+    ----------
+    data: DataFrame 
+        série des données historiques complète
+    short_window: int
+        fenêtre de la moyenne mobile courte (par défaut à 20)
+    long_window: int
+        fenêtre de la moyenne mobile longue (par défaut à 50)
+        
+    Returns
+    ----------
+    Series
+        position à chaque date (-1.0, 0.0, ou 1.0)
+    """
+    prices = data['close']
+    short_ma = prices.rolling(window=short_window).mean()
+    long_ma = prices.rolling(window=long_window).mean()
+    prev_short_ma = short_ma.shift(1)
+    prev_long_ma = long_ma.shift(1)
+    
+    buy = (short_ma > long_ma) & (prev_short_ma <= prev_long_ma)
+    sell = (short_ma < long_ma) & (prev_short_ma >= prev_long_ma)
+    
+    # NaN => pas de croisement, la position courante est conservée
+    signals = pd.Series(np.select([buy, sell], [1.0, -1.0], default=np.nan), index=data.index)
+    signals.iloc[:long_window - 1] = 0.0
+    
+    return signals.ffill().fillna(0.0)
+
+@strategy(name="MA Crossover", vectorized=ma_crossover_positions)
 def ma_crossover(historical_data: pd.DataFrame, current_position: float, 
                 short_window: int = 20, long_window: int = 50) -> float:
     """
@@ -37,4 +74,240 @@ def ma_crossover(historical_data: pd.DataFrame, current_position: float,
     elif short_ma.iloc[-1] < long_ma.iloc[-1] and short_ma.iloc[-2] >= long_ma.iloc[-2]:
         return -1.0
     
-    return float(current_position)
\ No newline at end of file
+    return float(current_position)
+
+@dataclass
+class StreamingMACrossover(Strategy):
+    """
+    Version incrémentale de ma_crossover : les moyennes mobiles sont mises à jour en O(1)
+    à chaque nouvelle barre au lieu d'être recalculées sur tout l'historique.
+    Donne les mêmes positions que ma_crossover et peut être utilisée barre par barre en direct via update()
+    """
+    short_window: int = 20
+    long_window: int = 50
+    
+    def __post_init__(self):
+        self.reset()
+    
+    def reset(self) -> None:
+        """
+        Réinitialise l'état des indicateurs
+        """
+        self.short_ma = RollingMean(self.short_window)
+        self.long_ma = RollingMean(self.long_window)
+        self.prev_short_ma = np.nan
+        self.prev_long_ma = np.nan
+        self.n_bars = 0
+        self.last_timestamp = None
+    
+    def fit(self, data: pd.DataFrame) -> None:
+        """
+        Réinitialise l'état avant un nouveau passage sur les données
+
+        Parameters
+        ----------
+        data: DataFrame
+            série de données historiques
+        """
+        self.reset()
+    
+    def _update_indicators(self, price: float) -> None:
+        self.prev_short_ma = self.short_ma.value
+        self.prev_long_ma = self.long_ma.value
+        self.short_ma.update(price)
+        self.long_ma.update(price)
+        self.n_bars += 1
+    
+    def _decide(self, current_position: float) -> float:
+        if self.n_bars < self.long_window:
+            return 0.0
+        
+        short_ma, long_ma = self.short_ma.value, self.long_ma.value
+        
+        # MA courte > MA longue => ACHAT
+        if short_ma > long_ma and self.prev_short_ma <= self.prev_long_ma:
+            return 1.0
+        # MA courte < MA longue => VENTE
+        elif short_ma < long_ma and self.prev_short_ma >= self.prev_long_ma:
+            return -1.0
+        
+        return float(current_position)
+    
+    def update(self, price: float, current_position: float) -> float:
+        """
+        Intègre un nouveau prix et renvoie la position associée
+
+        Parameters
+        ----------
+        price: float
+            nouveau prix de clôture
+        current_position: float
+            position actuelle (-1.0, 0 ou 1.0)
+
+        Returns
+        ----------
+        float
+            nouvelle position (-1.0, 0.0, ou 1.0)
+        """
+        self._update_indicators(price)
+        self.last_timestamp = None
+        return self._decide(current_position)
+    
+    def get_position(self, historical_data: pd.DataFrame, current_position: float) -> float:
+        """
+        Intègre uniquement les barres non encore vues de l'historique puis détermine la position.
+        La date de la dernière barre intégrée est conservée : un historique qui ne la contient pas
+        à la même place (autres données) réinitialise l'état.
+
+        Parameters
+        ----------
+        historical_data: DataFrame 
+            série des données historiques
+        current_position: float
+            position actuelle (-1.0, 0 ou 1.0)
+
+        Returns
+        ----------
+        float
+            nouvelle position (-1.0, 0.0, ou 1.0)
+        """
+        # L'historique doit prolonger les barres déjà intégrées, sinon l'état est reconstruit
+        if len(historical_data) < self.n_bars or (
+                self.n_bars > 0 and historical_data.index[self.n_bars - 1] != self.last_timestamp):
+            self.reset()
+        
+        for price in historical_data['close'].values[self.n_bars:]:
+            self._update_indicators(price)
+        if self.n_bars > 0:
+            self.last_timestamp = historical_data.index[-1]
+        
+        return self._decide(current_position)
+
+@njit(cache=True)
+def ma_crossover_kernel(i: int, prices: np.ndarray, params: np.ndarray, state: np.ndarray,
+                        current_position: float) -> float:
+    """
+    Noyau compilable de ma_crossover : met à jour les deux moyennes mobiles avec le prix de la date i
+    et décide de la position. L'état contient les accumulateurs des moyennes courte et longue
+    suivis de leurs dernières valeurs.
+    """
+    short_window, long_window = int(params[0]), int(params[1])
+    long_offset = MEAN_STATE_SIZE
+    values_offset = 2 * MEAN_STATE_SIZE
+    
+    prev_short_ma = state[values_offset]
+    prev_long_ma = state[values_offset + 1]
+    old_short = prices[i - short_window] if i >= short_window else np.nan
+    old_long = prices[i - long_window] if i >= long_window else np.nan
+    short_ma = rolling_mean_update(state, 0, prices[i], old_short, i, short_window)
+    long_ma = rolling_mean_update(state, long_offset, prices[i], old_long, i, long_window)
+    state[values_offset] = short_ma
+    state[values_offset + 1] = long_ma
+    
+    if i + 1 < long_window:
+        return 0.0
+    
+    # MA courte > MA longue => ACHAT
+    if short_ma > long_ma and prev_short_ma <= prev_long_ma:
+        return 1.0
+    # MA courte < MA longue => VENTE
+    elif short_ma < long_ma and prev_short_ma >= prev_long_ma:
+        return -1.0
+    
+    return current_position
+
+@dataclass
+class CompiledMACrossover(CompiledStrategy):
+    """
+    Version compilée de ma_crossover : la logique barre par barre est exécutée par ma_crossover_kernel,
+    compilé par numba lorsqu'il est installé. Donne les mêmes positions que ma_crossover.
+    """
+    short_window: int = 20
+    long_window: int = 50
+    
+    kernel = staticmethod(ma_crossover_kernel)
+    
+    def kernel_params(self) -> np.ndarray:
+        return np.array([self.short_window, self.long_window], dtype=np.float64)
+    
+    def initial_state(self) -> np.ndarray:
+        state = np.zeros(2 * MEAN_STATE_SIZE + 2)
+        state[2 * MEAN_STATE_SIZE:] = np.nan
+        return state
+
+def ma_crossover_position_matrix(prices: np.ndarray, short_windows: np.ndarray, 
+                                 long_windows: np.ndarray) -> np.ndarray:
+    """
+    Calcule les positions de ma_crossover pour plusieurs couples de fenêtres en une seule passe.
+    Chaque moyenne mobile distincte est calculée une seule fois à partir d'une somme cumulée ;
+    les écarts entre moyennes inférieurs à la borne de l'erreur d'arrondi de cette somme sont
+    considérés comme nuls pour que les périodes de prix constants ne génèrent pas de faux croisements.
+    Comme avec rolling().mean(), une moyenne dont la fenêtre contient un prix manquant est NaN
+    et n'émet pas de signal.
+    
+    Parameters
+    ----------
+    prices: ndarray 
+        prix de clôture (n_dates,), éventuellement manquants
+    short_windows: ndarray
+        fenêtres des moyennes mobiles courtes (n_combinaisons,)
+    long_windows: ndarray
+        fenêtres des moyennes mobiles longues (n_combinaisons,)
+        
+    Returns
+    ----------
+    ndarray
+        matrice des positions (n_dates, n_combinaisons) avec des valeurs -1.0, 0.0 ou 1.0
+    """
+    prices = np.asarray(prices, dtype=float)
+    short_windows = np.asarray(short_windows, dtype=int)
+    long_windows = np.asarray(long_windows, dtype=int)
+    
+    if len(short_windows) != len(long_windows):
+        raise ValueError("short_windows and long_windows must share the same length")
+    
+    n = len(prices)
+    windows, inverse = np.unique(np.concatenate([short_windows, long_windows]), return_inverse=True)
+    short_idx, long_idx = inverse[:len(short_windows)], inverse[len(short_windows):]
+    
+    # Prix centrés pour limiter l'erreur d'arrondi de la somme cumulée ; les moyennes restent centrées
+    # puisque seul leur écart est utilisé
+    missing = np.isnan(prices)
+    reference = prices[~missing].mean() if not missing.all() else 0.0
+    centered = np.concatenate([[0.0], np.where(missing, 0.0, prices - reference)])
+    cumsum = np.cumsum(centered)
+    # Nombre cumulé de prix manquants : une fenêtre qui en contient un a une moyenne NaN
+    missing_count = np.concatenate([[0], np.cumsum(missing)])
+    # Borne de l'erreur d'arrondi de chaque somme cumulée : eps fois la somme des sommes partielles
+    # et des termes en valeur absolue
+    eps = np.finfo(np.float64).eps
+    cumsum_error = eps * (np.cumsum(np.abs(cumsum)) + np.cumsum(np.abs(centered)))
+    
+    means = np.full((len(windows), n), np.nan)
+    errors = np.full((len(windows), n), np.nan)
+    for k, window in enumerate(windows):
+        if window <= n:
+            means[k, window - 1:] = (cumsum[window:] - cumsum[:n - window + 1]) / window
+            means[k, window - 1:][missing_count[window:] > missing_count[:n - window + 1]] = np.nan
+            errors[k, window - 1:] = ((cumsum_error[window:] + cumsum_error[:n - window + 1]) / window
+                                      + eps * np.abs(means[k, window - 1:]))
+    
+    # Les écarts inférieurs à l'erreur d'arrondi des deux moyennes sont nuls, comme ceux de pandas
+    # sur des prix constants
+    spread = means[short_idx].T - means[long_idx].T
+    tolerance = 2 * (errors[short_idx].T + errors[long_idx].T)
+    spread[np.abs(spread) <= tolerance] = 0.0
+    prev_spread = np.full_like(spread, np.nan)
+    prev_spread[1:] = spread[:-1]
+    
+    signals = np.full(spread.shape, np.nan)
+    signals[(spread > 0) & (prev_spread <= 0)] = 1.0
+    signals[(spread < 0) & (prev_spread >= 0)] = -1.0
+    signals[np.arange(n)[:, np.newaxis] < long_windows - 1] = 0.0
+    
+    # Propagation de la dernière position connue (ffill vectorisé colonne par colonne)
+    last_valid = np.where(np.isnan(signals), 0, np.arange(n)[:, np.newaxis])
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    positions = signals[last_valid, np.arange(signals.shape[1])]
+    
+    return np.nan_to_num(positions, nan=0.0)
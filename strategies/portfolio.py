@@ -0,0 +1,76 @@
+from strategies.strategy_constructor import PortfolioStrategy
+from dataclasses import dataclass
+import pandas as pd
+import numpy as np
+
+def _normalize(selection: pd.DataFrame) -> pd.DataFrame:
+    """
+    Répartit uniformément le poids entre les actifs sélectionnés à chaque date
+    """
+    counts = selection.sum(axis=1)
+    return selection.div(counts.where(counts > 0), axis=0).fillna(0.0)
+
+@dataclass
+class EqualWeight(PortfolioStrategy):
+    """
+    Stratégie équipondérée : le capital est réparti uniformément entre les actifs cotés à chaque date
+    """
+
+    def get_weights(self, prices: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcule les poids équipondérés des actifs cotés
+
+        Parameters
+        ----------
+        prices: DataFrame
+            matrice des prix de clôture (dates en lignes, actifs en colonnes)
+
+        Returns
+        ----------
+        DataFrame
+            poids de chaque actif à chaque date
+        """
+        return _normalize(prices.notna().astype(float))
+
+@dataclass
+class CrossSectionalMomentum(PortfolioStrategy):
+    """
+    Stratégie de momentum en coupe transversale : achète à poids égaux la fraction top_fraction
+    des actifs ayant le meilleur rendement sur lookback périodes, et vend à découvert la même
+    fraction des moins bons si long_short vaut True (exposition brute de 1)
+    """
+    lookback: int = 126
+    top_fraction: float = 0.3
+    long_short: bool = False
+
+    def __post_init__(self):
+        if self.lookback < 1:
+            raise ValueError("lookback must be a positive integer")
+        if not 0 < self.top_fraction <= 1:
+            raise ValueError("top_fraction must belong to ]0,1]")
+
+    def get_weights(self, prices: pd.DataFrame) -> pd.DataFrame:
+        """
+        Classe les actifs selon leur rendement passé et calcule les poids du portefeuille
+
+        Parameters
+        ----------
+        prices: DataFrame
+            matrice des prix de clôture (dates en lignes, actifs en colonnes)
+
+        Returns
+        ----------
+        DataFrame
+            poids de chaque actif à chaque date
+        """
+        momentum = prices / prices.shift(self.lookback) - 1
+        ranks = momentum.rank(axis=1, pct=True)
+
+        longs = _normalize((ranks > 1 - self.top_fraction).astype(float))
+        if not self.long_short:
+            return longs
+
+        shorts = _normalize((ranks <= self.top_fraction).astype(float))
+        # Un actif à la fois dans les deux jambes (peu d'actifs classés) n'est pas détenu
+        both = (longs > 0) & (shorts > 0)
+        return (longs - shorts).mask(both, 0.0) / 2
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Callable
+from typing import Any, Callable, Dict, Optional
+from dataclasses import fields, is_dataclass
 import pandas as pd
 import inspect
 
@@ -38,7 +39,61 @@ class Strategy(ABC):
         """
         pass
 
-def strategy(*, name: str) -> Callable:
+    def generate_positions(self, data: pd.DataFrame) -> Optional[pd.Series]:
+        """
+        Méthode optionnelle pour calculer en une seule passe les positions sur tout l'historique.
+        Si elle est implémentée, le Backtester l'appelle une seule fois au lieu d'appeler
+        get_position à chaque date ; elle doit alors renvoyer exactement les mêmes positions
+        que la boucle sur get_position (avec une position initiale nulle).
+        
+        Parameters
+        ----------
+        data: DataFrame 
+            série de données historiques complète
+            
+        Returns
+        ----------
+        Series ou None
+            position à chaque date de data, ou None si la stratégie n'a pas de version vectorisée
+        """
+        return None
+
+class PortfolioStrategy(ABC):
+    """
+    Classe abstraite utilisée pour set up l'interface pour les stratégies multi-actifs,
+    qui décident en une passe des poids de chaque actif à chaque date
+    """
+    
+    @abstractmethod
+    def get_weights(self, prices: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcule les poids du portefeuille sur tout l'historique. Le poids décidé à une date
+        ne doit dépendre que des prix connus à cette date.
+        
+        Parameters
+        ----------
+        prices: DataFrame 
+            matrice des prix de clôture (dates en lignes, actifs en colonnes), NaN avant la cotation d'un actif
+            
+        Returns
+        ----------
+        DataFrame 
+            poids de chaque actif à chaque date, de même forme que prices
+        """
+        pass
+        
+    def fit(self, prices: pd.DataFrame) -> None:
+        """
+        Méthode optionnelle pour optimiser les paramètres de la stratégie.
+        
+        Parameters
+        ----------
+        prices: DataFrame 
+            matrice des prix d'entraînement
+        """
+        pass
+
+def strategy(*, name: str, vectorized: Optional[Callable[..., pd.Series]] = None) -> Callable:
     """
     Décorateur pour créer une stratégie simple à partir d'une fonction.
     
@@ -46,6 +101,9 @@ def strategy(*, name: str) -> Callable:
     ----------
     name: str 
         nom de la stratégie
+    vectorized: Callable
+        fonction optionnelle (data, **params) -> Series calculant toutes les positions
+        en une seule passe, utilisée par generate_positions
     """
     def decorator(func: Callable[[pd.DataFrame, float], float]) -> Strategy:
         sig = inspect.signature(func)
@@ -53,6 +111,8 @@ def strategy(*, name: str) -> Callable:
         param_defaults = {param: sig.parameters[param].default for param in strategy_params}
 
         class SimpleStrategy(Strategy):
+            parameters = dict(param_defaults)
+            
             def __init__(self, **kwargs):
                 for param in strategy_params:
                     setattr(self, param, kwargs.get(param, param_defaults[param]))
@@ -60,8 +120,40 @@ def strategy(*, name: str) -> Callable:
             def get_position(self, historical_data: pd.DataFrame, current_position: float) -> float:
                 params = {param: getattr(self, param) for param in strategy_params}
                 return func(historical_data, current_position, **params)
+
+            def generate_positions(self, data: pd.DataFrame) -> Optional[pd.Series]:
+                if vectorized is None:
+                    return None
+                params = {param: getattr(self, param) for param in strategy_params}
+                return vectorized(data, **params)
         
         SimpleStrategy.__name__ = name
+        # Permet de retrouver la classe par son nom de module (pickle, pools de processus)
+        SimpleStrategy.__qualname__ = func.__name__
+        SimpleStrategy.__module__ = func.__module__
         return SimpleStrategy
         
-    return decorator
\ No newline at end of file
+    return decorator
+
+def get_strategy_parameters(strategy_class: type) -> Dict[str, Any]:
+    """
+    Retourne les paramètres d'une classe de stratégie et leurs valeurs par défaut.
+    
+    Parameters
+    ----------
+    strategy_class: type 
+        classe créée par le décorateur strategy ou dataclass héritant de Strategy
+        
+    Returns
+    ----------
+    dict
+        nom des paramètres en clé et valeurs par défaut en valeurs
+    """
+    if hasattr(strategy_class, 'parameters'):
+        return dict(strategy_class.parameters)
+    if is_dataclass(strategy_class):
+        return {field.name: field.default for field in fields(strategy_class) if field.init}
+    
+    sig = inspect.signature(strategy_class.__init__)
+    return {name: param.default for name, param in sig.parameters.items() 
+            if name != 'self' and param.kind == param.POSITIONAL_OR_KEYWORD}
@@ -6,7 +6,11 @@ from tests.test_metrics import (
     test_sharpe_ratio,
     test_max_drawdown,
     test_count_trades,
-    test_winning_trades_percentage
+    test_winning_trades_percentage,
+    test_metrics_engine_matches_stats,
+    test_drawdown_episodes,
+    test_trade_ledger,
+    test_rolling_moments_flat_window
 )
 
 from tests.test_strategy import (
@@ -14,7 +18,11 @@ from tests.test_strategy import (
     test_strategy_decorator,
     test_moving_average_crossover,
     test_strategy_position_bounds,
-    test_custom_strategy
+    test_custom_strategy,
+    test_streaming_strategies_match_batch,
+    test_arima_incremental_updates,
+    test_arima_order_selection_cache,
+    test_linear_trend_rolling_slope
 )
 
 from tests.test_backtester import (
@@ -28,14 +36,23 @@ from tests.test_backtester import (
     test_backtester_invalid_frequency,
     test_backtester_frequency_validation,
     test_backtester_with_costs,
-    test_backtester_with_real_data
+    test_backtester_with_real_data,
+    test_backtester_vectorized_positions,
+    test_backtester_walk_forward,
+    test_backtester_run_compiled,
+    test_backtester_profiling,
+    test_profiler_stage_peaks,
+    test_rebalancing_scheduler,
+    test_causal_resampling,
+    test_streaming_backtester
 )
 
 from tests.test_data_utils import (
     sample_data,
     test_csv_loading,
     test_data_format,
-    test_data_continuity
+    test_data_continuity,
+    test_market_data_loader
 )
 
 from tests.test_result import (
@@ -45,9 +62,37 @@ from tests.test_result import (
     test_essential_metrics,
     test_all_metrics,
     test_nav_calculation,
+    test_nav_matches_loop,
+    test_rolling_metrics,
+    test_bootstrap_metrics,
     test_plotting_functions,
     test_compare_results,
-    test_error_handling
+    test_error_handling,
+    test_compact_result
+)
+
+from tests.test_sweep import (
+    sweep_data,
+    test_sweep_grid,
+    test_sweep_random_and_cancel,
+    test_ma_crossover_batch,
+    test_ma_crossover_matrix_tiny_spreads,
+    test_ma_crossover_batch_missing_prices
+)
+
+from tests.test_portfolio import (
+    universe_data,
+    test_portfolio_single_asset_matches_backtester,
+    test_portfolio_weights_and_rebalancing
+)
+
+from tests.test_dash_interface import (
+    market_frames,
+    test_dataset_store_round_trip,
+    test_dataset_store_eviction,
+    test_result_cache_eviction,
+    test_result_cache_get_or_compute,
+    test_expired_dataset_status
 )
 
 __all__ = [
@@ -61,6 +106,9 @@ __all__ = [
     'sample_data',
     'sample_result',
     'multiple_results',
+    'sweep_data',
+    'universe_data',
+    'market_frames',
 
     # Metric tests
     'test_annualized_return',
@@ -69,12 +117,20 @@ __all__ = [
     'test_max_drawdown',
     'test_count_trades',
     'test_winning_trades_percentage',
+    'test_metrics_engine_matches_stats',
+    'test_drawdown_episodes',
+    'test_trade_ledger',
+    'test_rolling_moments_flat_window',
 
     # Strategy tests
     'test_strategy_decorator',
     'test_moving_average_crossover',
     'test_strategy_position_bounds',
     'test_custom_strategy',
+    'test_streaming_strategies_match_batch',
+    'test_arima_incremental_updates',
+    'test_arima_order_selection_cache',
+    'test_linear_trend_rolling_slope',
 
     # Backtester tests
     'test_backtester_initialization',
@@ -85,18 +141,49 @@ __all__ = [
     'test_backtester_frequency_validation',
     'test_backtester_with_costs',
     'test_backtester_with_real_data',
+    'test_backtester_vectorized_positions',
+    'test_backtester_walk_forward',
+    'test_backtester_run_compiled',
+    'test_backtester_profiling',
+    'test_profiler_stage_peaks',
+    'test_rebalancing_scheduler',
+    'test_causal_resampling',
+    'test_streaming_backtester',
 
     # Data utility tests
     'test_csv_loading',
     'test_data_format',
     'test_data_continuity',
+    'test_market_data_loader',
 
     # Result tests
     'test_result_initialization',
     'test_essential_metrics',
     'test_all_metrics',
     'test_nav_calculation',
+    'test_nav_matches_loop',
+    'test_rolling_metrics',
+    'test_bootstrap_metrics',
     'test_plotting_functions',
     'test_compare_results',
-    'test_error_handling'
+    'test_error_handling',
+    'test_compact_result',
+
+    # Parameter sweep tests
+    'test_sweep_grid',
+    'test_sweep_random_and_cancel',
+    'test_ma_crossover_batch',
+    'test_ma_crossover_matrix_tiny_spreads',
+    'test_ma_crossover_batch_missing_prices',
+
+    # Portfolio tests
+    'test_portfolio_single_asset_matches_backtester',
+    'test_portfolio_weights_and_rebalancing',
+
+    # Dash interface tests
+    'test_dataset_store_round_trip',
+    'test_dataset_store_eviction',
+    'test_result_cache_eviction',
+    'test_result_cache_get_or_compute',
+    'test_expired_dataset_status'
 ]
\ No newline at end of file
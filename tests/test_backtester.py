@@ -1,8 +1,17 @@
 import pytest #type: ignore
 import pandas as pd
 import numpy as np
+from data.loader import load_market_data
 from main.backtester import Backtester
-from strategies.moving_average import ma_crossover
+from main.jit import run_event_loop
+from main.profiling import Profiler, profile_run
+from main.scheduler import rebalancing_points
+from main import resampling
+from main.resampling import causal_resample, cached_causal_resample, clear_resample_cache
+from main.streaming import StreamingBacktester
+from strategies.moving_average import ma_crossover, CompiledMACrossover, StreamingMACrossover, ma_crossover_kernel
+from strategies.RSI import rsi_strategy, CompiledRSI, StreamingRSI
+from strategies.linear_trend import LinearTrendStrategy
 
 @pytest.fixture
 def daily_data():
@@ -22,7 +31,7 @@ def intraday_data():
 def btc_data():
     """Load a dataset for tests"""
     try:
-        return pd.read_csv("data/test_BTC_daily.csv", index_col=0, parse_dates=True)
+        return load_market_data("data/test_BTC_daily.csv")
     except FileNotFoundError:
         pytest.skip("Le fichier de données BTC n'est pas disponible")
 
@@ -104,4 +113,199 @@ def test_backtester_with_real_data(btc_data):
     
     assert not result.nav.isnull().any()
     assert len(result.nav) == len(btc_data)
-    assert all(-1 <= pos <= 1 for pos in result.positions['position'])
\ No newline at end of file
+    assert all(-1 <= pos <= 1 for pos in result.positions['position'])
+
+def test_backtester_vectorized_positions(btc_data):
+    """Vectorized positions must match the bar-by-bar get_position loop"""
+    for strategy in [ma_crossover(short_window=5, long_window=20), rsi_strategy(rsi_period=14)]:
+        loop_positions = []
+        current_position = 0.0
+        for timestamp in btc_data.index:
+            current_position = strategy.get_position(btc_data.loc[:timestamp], current_position)
+            loop_positions.append(current_position)
+        
+        result = Backtester(btc_data).run(strategy)
+        
+        assert strategy.generate_positions(btc_data) is not None
+        assert result.positions['position'].tolist() == loop_positions
+
+def test_backtester_walk_forward(daily_data):
+    """Walk-forward folds refit on training windows and stitch out-of-sample positions"""
+    backtester = Backtester(daily_data)
+    strategy = LinearTrendStrategy(window_size=10)
+    
+    sequential = backtester.walk_forward(strategy, train_size=40, test_size=20, max_workers=1)
+    parallel = backtester.walk_forward(strategy, train_size=40, test_size=20, max_workers=2)
+    
+    assert len(sequential.nav) == len(daily_data) - 40
+    assert sequential.nav.index.equals(daily_data.index[40:])
+    assert np.array_equal(sequential.positions['position'].values, parallel.positions['position'].values)
+    assert not strategy.is_fitted
+    
+    anchored = backtester.walk_forward(strategy, train_size=40, test_size=20, anchored=True, max_workers=1)
+    assert len(anchored.positions) == len(daily_data) - 40
+    
+    with pytest.raises(ValueError):
+        backtester.walk_forward(strategy, train_size=len(daily_data), test_size=20)
+
+def test_backtester_run_compiled(btc_data):
+    """The compiled event loop reproduces the positions and NAV of the standard backtest"""
+    backtester = Backtester(btc_data, commission=0.001, slippage=0.0005)
+    
+    for compiled, reference in [(CompiledMACrossover(short_window=10, long_window=30), 
+                                 ma_crossover(short_window=10, long_window=30)),
+                                (CompiledRSI(rsi_period=10), rsi_strategy(rsi_period=10))]:
+        compiled_result = backtester.run_compiled(compiled)
+        reference_result = backtester.run(reference)
+        np.testing.assert_array_equal(compiled_result.positions['position'].values,
+                                      reference_result.positions['position'].values)
+        np.testing.assert_array_equal(compiled_result.nav.values, reference_result.nav.values)
+    
+    # Pure Python path, used when numba is not installed
+    loop = getattr(run_event_loop, 'py_func', run_event_loop)
+    kernel = getattr(ma_crossover_kernel, 'py_func', ma_crossover_kernel)
+    strategy = CompiledMACrossover(short_window=10, long_window=30)
+    positions, nav = loop(kernel, btc_data['close'].values, strategy.kernel_params(), strategy.initial_state(),
+                          10000.0, 0.001, 0.0005)
+    np.testing.assert_array_equal(nav, backtester.run_compiled(strategy).nav.values)
+    
+    with pytest.raises(ValueError):
+        Backtester(btc_data, rebalancing_frequency='W').run_compiled(strategy)
+    
+    # Rebalanced backtests call get_position, which only feeds the new bars to the kernel
+    weekly = Backtester(btc_data, rebalancing_frequency='W')
+    for compiled, reference in [(CompiledMACrossover(short_window=10, long_window=30), 
+                                 ma_crossover(short_window=10, long_window=30)),
+                                (CompiledRSI(rsi_period=10), rsi_strategy(rsi_period=10))]:
+        np.testing.assert_array_equal(weekly.run(compiled).positions['position'].values,
+                                      weekly.run(reference).positions['position'].values)
+    
+    # A history that does not extend the previous one restarts the kernel
+    reversed_data = btc_data.iloc[::-1].reset_index(drop=True)
+    for end in (200, 100, 150):
+        assert strategy.get_position(reversed_data.iloc[:end], 0.0) == \
+            CompiledMACrossover(short_window=10, long_window=30).get_position(reversed_data.iloc[:end], 0.0)
+
+def test_backtester_profiling(daily_data, tmp_path):
+    """Opt-in profiling exposes per-stage timings and get_position counters"""
+    assert Backtester(daily_data).run(ma_crossover()).timings == {}
+    
+    backtester = Backtester(daily_data, rebalancing_frequency='W', profile=True, trace_memory=True)
+    with profile_run(str(tmp_path), name='weekly'):
+        # Peak reached before the backtest: the stages must not reset it
+        buffer = np.ones(2_000_000)
+        del buffer
+        result = backtester.run(ma_crossover())
+        result.get_all_metrics()
+    
+    timings = result.timings
+    assert {'fit', 'resample', 'positions', 'calculate_nav', 'trades', 'metrics'} <= set(timings['stages'])
+    assert all(stage['wall_time'] >= 0 and stage['peak_memory'] > 0 for stage in timings['stages'].values())
+    
+    n_weeks = daily_data.index.to_period('W').nunique()
+    assert timings['counters']['get_position_calls'] == n_weeks
+    assert timings['observations']['history_rows']['max'] == len(daily_data)
+    
+    for suffix in ('.prof', '.txt', '.memory.txt'):
+        assert (tmp_path / f'weekly{suffix}').exists()
+    peak = int((tmp_path / 'weekly.memory.txt').read_text().splitlines()[1].split()[1])
+    assert peak >= 16_000_000
+
+def test_profiler_stage_peaks(tmp_path):
+    """Under profile_run each stage reports its own peak and the report keeps the peak of the whole block"""
+    profiler = Profiler(trace_memory=True)
+    with profile_run(str(tmp_path), name='stages'):
+        with profiler.stage('large'):
+            buffer = np.ones(5_000_000)
+            del buffer
+        with profiler.stage('small'):
+            buffer = np.ones(500_000)
+            del buffer
+    
+    stages = profiler.report()['stages']
+    assert stages['large']['peak_memory'] >= 40_000_000
+    assert 4_000_000 <= stages['small']['peak_memory'] < 40_000_000
+    peak = int((tmp_path / 'stages.memory.txt').read_text().splitlines()[1].split()[1])
+    assert peak >= 40_000_000
+
+def test_rebalancing_scheduler(daily_data):
+    """Decision points follow the calendar rules and the strategy is only called at those points"""
+    hourly = pd.date_range(start='2024-01-03 09:00:00', periods=24 * 21, freq='h')
+    weekly = rebalancing_points(hourly, 'W')
+    assert (hourly[weekly[1:]] == hourly[weekly[1:]].normalize()).all()
+    assert (hourly[weekly[1:]].dayofweek == 0).all()
+    assert len(weekly) == hourly.to_period('W').nunique()
+    
+    month_ends = rebalancing_points(daily_data.index, 'month_end')
+    assert daily_data.index[month_ends].tolist() == daily_data.index.to_series().groupby(
+        daily_data.index.to_period('M')).max().tolist()
+    
+    backtester = Backtester(daily_data, rebalancing_frequency='month_end', profile=True)
+    result = backtester.run(ma_crossover())
+    positions = result.positions['position'].values
+    
+    assert result.timings['counters']['get_position_calls'] == len(month_ends)
+    assert (positions[:month_ends[0]] == 0).all()
+    changes = np.flatnonzero(np.diff(positions)) + 1
+    assert set(changes) <= set(month_ends)
+
+def test_causal_resampling(intraday_data, monkeypatch):
+    """Partial-period aggregates only use bars up to the current one and are memoized"""
+    resampled = causal_resample(intraday_data, '1h')
+    hours = intraday_data.index.floor('h')
+    grouped = intraday_data.groupby(hours)
+    
+    assert resampled.index.equals(intraday_data.index)
+    assert np.allclose(resampled['volume'], grouped['volume'].cumsum())
+    assert (resampled['high'] == grouped['close'].cummax()).all()
+    assert (resampled['low'] == grouped['close'].cummin()).all()
+    assert (resampled['close'] == intraday_data['close']).all()
+    
+    # Changing a future bar leaves the aggregates of the earlier bars unchanged
+    modified = intraday_data.copy()
+    modified.iloc[50:, modified.columns.get_loc('close')] += 100
+    assert causal_resample(modified, '1h').iloc[:50].equals(resampled.iloc[:50])
+    
+    clear_resample_cache()
+    first = cached_causal_resample(intraday_data, '1h', 'key')
+    pd.testing.assert_frame_equal(first, resampled)
+    assert len(resampling._CACHE) == 1
+    
+    # Writing to a returned frame leaves the cached aggregates and the source data untouched
+    first['close'] = 0.0
+    first.iloc[0, first.columns.get_loc('high')] = -1.0
+    pd.testing.assert_frame_equal(cached_causal_resample(intraday_data, '1h', 'key'), resampled)
+    assert (intraday_data['close'] != 0).all()
+    
+    cached_causal_resample(intraday_data, '4h', 'key')
+    assert len(resampling._CACHE) == 2
+    
+    # The cache is bounded by memory as well as by entry count
+    cached_size = sum(values.nbytes for values in resampling._CACHE[('key', '1h')].values())
+    monkeypatch.setattr(resampling, 'MAX_CACHE_MEMORY_MB', 1.5 * cached_size / 1024 ** 2)
+    cached_causal_resample(intraday_data, '1D', 'key')
+    assert list(resampling._CACHE) == [('key', '1D')]
+    clear_resample_cache()
+
+def test_streaming_backtester(btc_data, tmp_path):
+    """Chunked streaming backtests reproduce the in-memory NAV and metrics from CSV and Parquet files"""
+    parquet_path = tmp_path / 'btc.parquet'
+    btc_data.to_parquet(parquet_path)
+    
+    for strategy in (StreamingMACrossover, StreamingRSI):
+        expected = Backtester(btc_data.copy(), commission=0.001, slippage=0.0005).run(strategy())
+        expected_metrics = expected.get_essential_metrics()
+        
+        for source in ("data/test_BTC_daily.csv", parquet_path):
+            streaming = StreamingBacktester(source, commission=0.001, slippage=0.0005, chunk_size=97)
+            result = streaming.run(strategy(), keep_series=True)
+            
+            assert result.n_bars == len(btc_data)
+            assert np.array_equal(result.positions.values, expected.positions['position'].values)
+            assert np.array_equal(result.nav.values, expected.nav.values)
+            for name, value in expected_metrics.items():
+                assert result.metrics[name] == pytest.approx(value, rel=1e-10)
+    
+    # Only incremental strategies can be streamed
+    with pytest.raises(TypeError):
+        StreamingBacktester("data/test_BTC_daily.csv").run(LinearTrendStrategy())
@@ -0,0 +1,133 @@
+import pytest #type: ignore
+import os
+import threading
+import time
+import pandas as pd
+import numpy as np
+from dash_interface.datastore import DatasetStore, DatasetExpiredError
+from dash_interface.cache import ResultCache, result_nbytes
+from main.result import Result
+
+@pytest.fixture
+def market_frames():
+    """Creates three small OHLCV datasets for the server-side stores"""
+    dates = pd.date_range(start='2023-01-01', periods=50, freq='D')
+    dates.name = 'timestamp'
+    rng = np.random.default_rng(0)
+    return [
+        pd.DataFrame({'close': 100 + np.cumsum(rng.normal(size=50)), 'volume': rng.integers(1, 100, 50)},
+                     index=dates)
+        for _ in range(3)
+    ]
+
+def test_dataset_store_round_trip(market_frames, tmp_path):
+    """Stored datasets are read back as frames, zero-copy arrays and index, and deduplicated by content"""
+    store = DatasetStore(str(tmp_path))
+    key = store.put(market_frames[0])
+    
+    assert store.put(market_frames[0].copy()) == key
+    assert len(store) == 1 and len(list(tmp_path.glob('*/*.arrow'))) == 1
+    assert key in store
+    
+    pd.testing.assert_frame_equal(store.get_frame(key), market_frames[0], check_freq=False)
+    arrays = store.get_arrays(key)
+    assert set(arrays) == {'close', 'volume'}
+    np.testing.assert_array_equal(arrays['close'], market_frames[0]['close'].values)
+    assert not arrays['close'].flags.writeable
+    assert list(store.get_arrays(key, ['close'])) == ['close']
+    assert store.get_index(key).equals(market_frames[0].index)
+    
+    with pytest.raises(KeyError):
+        store.get_arrays('unknown')
+
+def test_dataset_store_eviction(market_frames, tmp_path):
+    """The least recently used datasets are unmapped and deleted, and close removes the remaining files"""
+    store = DatasetStore(str(tmp_path), max_datasets=2)
+    first, second = store.put(market_frames[0]), store.put(market_frames[1])
+    store.get_arrays(first)
+    third = store.put(market_frames[2])
+    
+    assert len(store) == 2
+    assert first in store and third in store
+    assert second not in store
+    with pytest.raises(DatasetExpiredError, match='upload the file again'):
+        store.get_frame(second)
+    
+    # Each store has its own directory: closing one keeps the files another one is serving
+    other = DatasetStore(str(tmp_path))
+    assert other.directory != store.directory
+    other_key = other.put(market_frames[0])
+    assert other_key == first and first not in DatasetStore(str(tmp_path))
+    
+    store.close()
+    assert len(store) == 0
+    assert not os.path.exists(store.directory)
+    pd.testing.assert_frame_equal(other.get_frame(other_key), market_frames[0], check_freq=False)
+    other.close()
+
+def _result(frame):
+    return Result(positions=np.ones(len(frame)), data=frame, initial_capital=10000.0,
+                  commission=0.001, slippage=0.0)
+
+def test_result_cache_eviction(market_frames):
+    """Least recently used results are evicted by entry count and by memory"""
+    results = [_result(frame) for frame in market_frames]
+    cache = ResultCache(max_entries=2)
+    cache.put('a', results[0])
+    cache.put('b', results[1])
+    assert cache.get('a') is results[0]
+    cache.put('c', results[2])
+    
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') is results[0] and cache.get('c') is results[2]
+    
+    nbytes = result_nbytes(results[0])
+    cache = ResultCache(max_entries=10, max_memory_mb=2.5 * nbytes / 1024 ** 2)
+    for key, result in zip('abc', results):
+        cache.put(key, result)
+    assert len(cache) == 2 and cache.memory <= cache.max_memory
+    assert cache.get('a') is None
+
+def test_result_cache_get_or_compute(market_frames):
+    """Hits and misses are counted, per-key locks are released, and concurrent callers compute once"""
+    cache = ResultCache()
+    result = _result(market_frames[0])
+    calls = []
+    
+    def compute():
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return result
+    
+    threads = [threading.Thread(target=cache.get_or_compute, args=('key', compute)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (7, 1)
+    assert cache.get_or_compute('key', compute) is result
+    assert cache.hits == 8 and not cache._pending
+    
+    def failing():
+        raise RuntimeError("backtest failed")
+    
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('other', failing)
+    assert not cache._pending
+    assert cache.get_or_compute('other', compute) is result
+    assert len(calls) == 2
+
+def test_expired_dataset_status():
+    """Callbacks ask for a new upload when the dataset key is no longer in the store"""
+    dash_app = pytest.importorskip('dash_interface.app')
+    stored_data = {'filename': 'expired.csv', 'key': '0' * 64}
+    settings = (10000, 0.1, 0.0, 'D')
+    
+    table = dash_app.update_metrics_table(1, stored_data, 'essential', ['MA Crossover'], [20, 50], *settings)
+    assert 'upload the file again' in table.children
+    figure = dash_app.update_strategy_graph(1, 'nav', stored_data, ['MA Crossover'], [20, 50], *settings,
+                                            {'type': 'strategy-graph', 'strategy': 'MA Crossover'})
+    assert 'upload the file again' in figure.layout.title.text
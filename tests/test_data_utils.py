@@ -2,6 +2,7 @@ import pytest #type: ignore
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from data.loader import load_market_data, cache_path, pyarrow
 
 @pytest.fixture
 def sample_data():
@@ -19,7 +20,7 @@ def btc_data():
     data_path = Path("data/test_BTC_daily.csv")
     if not data_path.exists():
         pytest.skip("Le fichier de données BTC n'est pas disponible")
-    return pd.read_csv(data_path, index_col=0, parse_dates=True)
+    return load_market_data(data_path)
 
 def test_csv_loading(btc_data):
     """Real data importation test (with .csv)"""
@@ -37,4 +38,32 @@ def test_data_continuity(sample_data):
     """Data continuity test"""
     assert sample_data.index.is_monotonic_increasing
     assert not sample_data.index.has_duplicates
-    assert not sample_data['close'].isnull().any()
\ No newline at end of file
+    assert not sample_data['close'].isnull().any()
+
+def test_market_data_loader(tmp_path, caplog):
+    """Schema normalization, explicit timestamp parsing and on-disk cache"""
+    csv_path = tmp_path / "prices.csv"
+    csv_path.write_text(
+        ",Open,High,Low,Close,Volume\n"
+        "2024-01-02 14:30:00,10.0,11.0,9.5,10.5,1000\n"
+        "2024-01-03 14:30:00,10.5,12.0,10.0,11.5,1500\n"
+    )
+
+    data = load_market_data(csv_path, dtype='float32')
+    assert list(data.columns) == ['open', 'high', 'low', 'close', 'volume']
+    assert isinstance(data.index, pd.DatetimeIndex)
+    assert data.index[0] == pd.Timestamp('2024-01-02 14:30:00')
+    assert (data.dtypes == np.float32).all()
+
+    cached = Path(cache_path(csv_path, dtype='float32'))
+    if pyarrow is not None:
+        assert cached.exists()
+        pd.testing.assert_frame_equal(load_market_data(csv_path, dtype='float32'), data)
+
+        # A corrupted cache is reported and the CSV is read again
+        cached.write_bytes(b'not a parquet file')
+        with caplog.at_level('WARNING', logger='data.loader'):
+            pd.testing.assert_frame_equal(load_market_data(csv_path, dtype='float32'), data)
+        assert 'unreadable cache' in caplog.text
+    else:
+        assert not cached.exists()
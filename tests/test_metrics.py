@@ -1,7 +1,9 @@
 import pytest #type: ignore
 import pandas as pd
 import numpy as np
-from stats import core_metrics, performance_metrics, tail_metrics
+from stats import core_metrics, performance_metrics, tail_metrics, drawdowns, trades, rolling
+from stats.metrics_engine import compute_metrics, ESSENTIAL_METRICS, ADDITIONAL_METRICS
+from main.nav import compute_nav
 
 @pytest.fixture
 def returns_data():
@@ -44,7 +46,8 @@ def test_count_trades(positions_data):
     """Number of trades test"""
     n_trades = core_metrics.count_trades(positions_data)
     assert isinstance(n_trades, int)
-    assert n_trades == 4
+    # Executed one bar later: a long trade then a short trade still open at the end
+    assert n_trades == 2
 
 def test_winning_trades_percentage():
     """WWin rate test"""
@@ -52,4 +55,106 @@ def test_winning_trades_percentage():
     returns = pd.Series([0.01, 0.02, -0.03, -0.02, 0.01, 0.01])
     result = core_metrics.winning_trades_percentage(positions, returns)
     assert isinstance(result, float)
-    assert 0 <= result <= 1
\ No newline at end of file
+    assert 0 <= result <= 1
+
+def test_metrics_engine_matches_stats():
+    """The single-pass metrics engine reproduces the stats functions"""
+    rng = np.random.default_rng(0)
+    nav = pd.Series(10000 * np.cumprod(1 + rng.normal(0.0005, 0.01, 1000)))
+    positions = pd.Series(np.sign(rng.normal(size=1000)))
+    asset_returns = pd.Series(rng.normal(0, 0.01, 1000))
+    nav_returns = nav.pct_change().fillna(0)
+    
+    metrics = compute_metrics(nav.values, positions.values, asset_returns.values, 10000, 252)
+    assert list(metrics) == ESSENTIAL_METRICS + ADDITIONAL_METRICS
+    
+    expected = {
+        'Volatility (%)': core_metrics.annualized_std(nav_returns, 252) * 100,
+        'Sharpe Ratio': performance_metrics.sharpe_ratio(nav_returns, 0, 252),
+        'Maximum Drawdown (%)': tail_metrics.max_drawdown(nav) * 100,
+        'Number of Trades': core_metrics.count_trades(positions),
+        'Winning Trades (%)': core_metrics.winning_trades_percentage(positions, asset_returns) * 100,
+        'Kurtosis': tail_metrics.kurtosis(nav_returns),
+        'Calmar Ratio': performance_metrics.calmar_ratio(nav_returns, nav, 252),
+        'Pain Ratio': performance_metrics.pain_ratio(nav_returns, nav, 252),
+        'CVaR Ratio': performance_metrics.cvar_ratio(nav_returns, 252)
+    }
+    for name, value in expected.items():
+        assert metrics[name] == pytest.approx(value, rel=1e-10)
+    
+    essential = compute_metrics(nav.values, positions.values, asset_returns.values, 10000, 252, essential=True)
+    assert list(essential) == ESSENTIAL_METRICS
+
+def test_drawdown_episodes():
+    """Drawdown episodes are found with their peak, trough, recovery and depth"""
+    nav = pd.Series([100, 95, 90, 95, 100, 85, 90, 101, 100, 99],
+                    index=pd.date_range(start='2023-01-01', periods=10, freq='D'))
+    episodes = drawdowns.drawdown_episodes(nav)
+    
+    assert len(episodes) == 3
+    assert episodes['peak'].tolist() == list(nav.index[[0, 4, 7]])
+    assert episodes['trough'].tolist() == list(nav.index[[2, 5, 9]])
+    assert episodes['recovery'].iloc[:2].tolist() == list(nav.index[[4, 7]])
+    assert pd.isna(episodes['recovery'].iloc[2])
+    assert episodes['depth'].tolist() == pytest.approx([-0.10, -0.15, 99 / 101 - 1])
+    assert episodes['length'].tolist() == [4, 3, 2]
+    
+    worst = drawdowns.worst_drawdowns(nav, 2)
+    assert worst['depth'].tolist() == pytest.approx([-0.15, -0.10])
+    assert drawdowns.max_drawdown_duration(nav) == 4
+    assert tail_metrics.drawdown_duration(nav) == pytest.approx(2 / 252)
+    assert episodes['depth'].min() == pytest.approx(tail_metrics.max_drawdown(nav))
+
+def test_trade_ledger():
+    """Trades are entered and exited one bar after the decision and their P&L adds up to the NAV"""
+    index = pd.date_range(start='2023-01-01', periods=10, freq='D')
+    close = np.array([100, 101, 103, 102, 104, 106, 105, 103, 104, 102], dtype=float)
+    positions = np.array([0, 1, 1, 1, 0, -1, -1, 0, 0, 1], dtype=float)
+    nav = compute_nav(pd.Series(close).pct_change().fillna(0).values, positions, 10000, 0, 0)
+    
+    ledger = trades.trade_ledger(positions, close, nav, index, 0, 0)
+    assert ledger.dtype == trades.TRADE_DTYPE
+    assert ledger['side'].tolist() == [1, -1]
+    assert (ledger['entry_time'] == index[[2, 6]].values).all()
+    assert (ledger['exit_time'] == index[[5, 8]].values).all()
+    assert ledger['entry_price'].tolist() == [103, 105]
+    assert ledger['exit_price'].tolist() == [106, 104]
+    assert ledger['holding_period'].tolist() == [3, 2]
+    assert not ledger['is_open'].any()
+    assert ledger['net_pnl'].sum() == pytest.approx(nav[-1] - nav[0])
+    
+    stats = trades.trade_statistics(ledger)
+    assert stats['Number of Trades'] == 2
+    assert stats['Win Rate (%)'] == 100
+    assert stats['Average Holding Period'] == 2.5
+    
+    with_costs = trades.trade_ledger(positions, close, nav, index, 0.001, 0.001)
+    assert with_costs['costs'] == pytest.approx(with_costs['gross_pnl'] - with_costs['net_pnl'])
+    assert (with_costs['costs'] > 0).all()
+    
+    # A size change within a trade only pays for the size delta, as in compute_nav
+    flat_close = np.full(6, 100.0)
+    resized = np.array([0, 1, 0.5, 0.5, 0, 0])
+    flat_nav = compute_nav(np.zeros(6), resized, 10000, 0.001, 0.001)
+    resized_ledger = trades.trade_ledger(resized, flat_close, flat_nav, index[:6], 0.001, 0.001)
+    assert len(resized_ledger) == 1
+    assert resized_ledger['net_pnl'][0] == pytest.approx(flat_nav[-1] - flat_nav[0], rel=1e-12)
+    
+    # Trade count and win rate describe the same trades
+    metrics = compute_metrics(nav, positions, pd.Series(close).pct_change().fillna(0).values, 10000, 252,
+                              essential=True, trade_stats=stats)
+    assert metrics['Number of Trades'] == len(ledger)
+    assert core_metrics.count_trades(pd.Series(positions)) == len(ledger)
+
+def test_rolling_moments_flat_window():
+    """Rolling moments match pandas on windows that contain flat stretches"""
+    rng = np.random.default_rng(0)
+    returns = pd.Series(np.concatenate([np.zeros(60), rng.normal(0.001, 0.01, 200), np.zeros(40)]))
+    moments = rolling.rolling_moments(returns, 20)
+    expected = returns.rolling(20)
+    
+    np.testing.assert_allclose(moments['std'], expected.std(), rtol=1e-6, atol=1e-12)
+    np.testing.assert_allclose(moments['skewness'], expected.skew(), rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(moments['kurtosis'], expected.kurt(), rtol=1e-6, atol=1e-8)
+    assert (moments['std'].iloc[19:60] == 0).all()
+    assert (moments['std'].iloc[-1] == 0)
@@ -0,0 +1,52 @@
+import pytest #type: ignore
+import pandas as pd
+import numpy as np
+from main.portfolio import PortfolioBacktester, align_prices
+from main.backtester import Backtester
+from strategies.moving_average import ma_crossover
+from strategies.portfolio import EqualWeight, CrossSectionalMomentum
+
+@pytest.fixture
+def universe_data():
+    """Creates simulated daily data for several assets, one of them listed later"""
+    dates = pd.date_range(start='2023-01-02', periods=120, freq='D')
+    rng = np.random.default_rng(0)
+    universe = {}
+    for i, asset in enumerate(['A', 'B', 'C', 'D']):
+        prices = 100 * np.exp(np.cumsum(rng.normal(0.0005 * i, 0.01, len(dates))))
+        universe[asset] = pd.DataFrame({'close': prices}, index=dates)
+    universe['D'] = universe['D'].iloc[30:]
+    return universe
+
+def test_portfolio_single_asset_matches_backtester(universe_data):
+    """A one-asset portfolio reproduces the NAV of the single-asset Backtester"""
+    data = universe_data['A']
+    result = Backtester(data.copy()).run(ma_crossover(short_window=5, long_window=20))
+    
+    weights = pd.DataFrame({'A': result.positions['position'].values}, index=data.index)
+    portfolio = PortfolioBacktester({'A': data}).run(weights)
+    
+    np.testing.assert_array_equal(portfolio.nav.values, result.nav.values)
+
+def test_portfolio_weights_and_rebalancing(universe_data):
+    """Weights are aligned, rebalanced weekly and turnover drives the costs"""
+    prices = align_prices(universe_data)
+    assert prices.shape == (120, 4)
+    assert prices['D'].iloc[:30].isna().all()
+    
+    backtester = PortfolioBacktester(universe_data, commission=0.001, rebalancing_frequency='W')
+    result = backtester.run(EqualWeight())
+    
+    # D is not held before its listing and joins at the next rebalancing
+    assert (result.weights['D'].iloc[:30] == 0).all()
+    assert result.weights.iloc[-1].tolist() == pytest.approx([0.25] * 4)
+    assert result.weights.abs().sum(axis=1).max() <= 1 + 1e-12
+    assert result.turnover.iloc[1] == pytest.approx(1.0)
+    assert result.costs.sum() > 0
+    
+    momentum = backtester.run(CrossSectionalMomentum(lookback=10, top_fraction=0.5, long_short=True))
+    assert momentum.weights.abs().sum(axis=1).max() == pytest.approx(1.0)
+    assert np.isfinite(momentum.nav).all()
+    
+    with pytest.raises(ValueError):
+        backtester.run({'A': 0.8, 'B': 0.8})
@@ -2,6 +2,9 @@ import pytest #type: ignore
 import pandas as pd
 import numpy as np
 from main.result import Result
+from main.backtester import Backtester
+from strategies.moving_average import ma_crossover
+from stats import tail_metrics, bootstrap
 
 @pytest.fixture
 def sample_result():
@@ -153,4 +156,134 @@ def test_error_handling():
             initial_capital=10000,
             commission=0.001,
             slippage=0.001
-        )
\ No newline at end of file
+        )
+
+def _loop_nav(result):
+    """Reference implementation of the historical bar-by-bar NAV loop"""
+    nav = pd.Series(index=result.data.index, dtype=float)
+    nav.iloc[0] = result.initial_capital
+    prev_position = 0
+    for i in range(1, len(nav)):
+        current_position = result.positions['position'].iloc[i-1]
+        ret = result.returns.iloc[i] * prev_position
+        if current_position != prev_position:
+            transaction_cost = abs(current_position - prev_position) * (result.commission + result.slippage)
+        else:
+            transaction_cost = 0
+        nav.iloc[i] = nav.iloc[i-1] * (1 + ret - transaction_cost)
+        prev_position = current_position
+    return nav
+
+def test_nav_matches_loop(sample_result):
+    """Vectorized NAV must be bit-for-bit identical to the historical loop"""
+    assert np.array_equal(sample_result.nav.values, _loop_nav(sample_result).values)
+    
+    dates = pd.date_range(start='2023-01-01', periods=500, freq='h')
+    data = pd.DataFrame({'close': 100 * np.exp(np.cumsum(np.random.normal(0, 0.01, 500)))}, index=dates)
+    positions = pd.DataFrame({'position': np.round(np.random.uniform(-1, 1, 500), 2)}, index=dates)
+    result = Result(positions=positions, data=data, initial_capital=12345.6, commission=0.0007, slippage=0.0003)
+    assert np.array_equal(result.nav.values, _loop_nav(result).values)
+
+def test_rolling_metrics(sample_result):
+    """Rolling metrics match a brute-force computation over each window"""
+    window = 20
+    rolling_metrics = sample_result.rolling_metrics(window)
+    nav_returns = sample_result.nav.pct_change().fillna(0)
+    
+    assert list(rolling_metrics.columns) == ['Volatility (%)', 'Sharpe Ratio', 'Sortino Ratio',
+                                             'Skewness', 'Kurtosis', 'Drawdown (%)']
+    assert rolling_metrics.iloc[:window - 1].isna().all().all()
+    
+    expected_volatility = nav_returns.rolling(window).std() * np.sqrt(252) * 100
+    np.testing.assert_allclose(rolling_metrics['Volatility (%)'], expected_volatility, rtol=1e-8)
+    
+    expected_skewness = nav_returns.rolling(window).apply(tail_metrics.skewness, raw=False)
+    np.testing.assert_allclose(rolling_metrics['Skewness'], expected_skewness, rtol=1e-6, atol=1e-10)
+    
+    expected_drawdown = (sample_result.nav / sample_result.nav.rolling(window).max() - 1) * 100
+    np.testing.assert_allclose(rolling_metrics['Drawdown (%)'], expected_drawdown, rtol=1e-12)
+    assert (rolling_metrics['Drawdown (%)'].dropna() <= 0).all()
+
+def test_bootstrap_metrics(sample_result):
+    """Bootstrap confidence intervals are reproducible and bracket the resampled metrics"""
+    intervals = sample_result.bootstrap_metrics('stationary', n_paths=200, block_size=5, seed=0)
+    metrics = sample_result.get_all_metrics()
+    
+    assert list(intervals.columns) == ['observed', 'mean', 'std', 'lower', 'upper']
+    assert intervals.loc['Sharpe Ratio', 'observed'] == pytest.approx(metrics['Sharpe Ratio'])
+    for metric in ('Calmar Ratio', 'Sortino Ratio', 'Maximum Drawdown (%)', 'Volatility (%)'):
+        assert intervals.loc[metric, 'observed'] == pytest.approx(metrics[metric], rel=1e-10)
+    assert (intervals['lower'] <= intervals['upper']).all()
+    pd.testing.assert_frame_equal(
+        intervals, sample_result.bootstrap_metrics('stationary', n_paths=200, block_size=5, seed=0)
+    )
+    
+    # Chunks are sized by memory: a budget of two return columns still yields every path
+    returns = sample_result.nav.pct_change().fillna(0)
+    two_columns = 2 * len(returns) * 8 / 1024 ** 2
+    small_chunks = bootstrap.bootstrap_metrics(returns, 'block', n_paths=7, block_size=5, seed=0,
+                                               chunk_memory_mb=two_columns)
+    assert small_chunks.loc['Sharpe Ratio', 'observed'] == pytest.approx(metrics['Sharpe Ratio'])
+    assert np.isfinite(small_chunks.loc['Sharpe Ratio', 'std'])
+    
+    # Permuting whole trades keeps the total return but changes the path
+    permuted = sample_result.bootstrap_metrics('trades', n_paths=50, seed=0)
+    assert permuted.loc['Total Return (%)', 'std'] == pytest.approx(0, abs=1e-9)
+    
+    rng = np.random.default_rng(0)
+    indices = bootstrap.block_bootstrap_indices(100, 7, 10, rng)
+    assert indices.shape == (100, 7)
+    assert ((np.diff(indices[:10], axis=0) % 100) == 1).all()
+    indices = bootstrap.stationary_bootstrap_indices(100, 7, 10, rng)
+    assert indices.shape == (100, 7) and indices.min() >= 0 and indices.max() < 100
+
+def test_compact_result(sample_result):
+    """Results share the price data, store compact arrays and can keep only their metrics"""
+    # int8 positions, float64 NAV and asset returns, computed once
+    assert sample_result.nbytes == 100 * (1 + 8 + 8)
+    assert np.shares_memory(sample_result.returns.values, sample_result.returns.values)
+    assert list(sample_result.positions.columns) == ['position']
+    assert sample_result.positions.index.equals(sample_result.data.index)
+    
+    data = sample_result.data
+    compact = Result(positions=sample_result.positions, data=data, initial_capital=10000,
+                     commission=0.001, slippage=0.001, dtype='float32')
+    assert compact.data is data
+    assert compact.nav.dtype == np.float32
+    assert compact.nbytes < sample_result.nbytes
+    np.testing.assert_allclose(compact.nav.values, sample_result.nav.values, rtol=1e-6)
+    
+    # Recomputing the NAV with other costs also refreshes the memoized metrics
+    compact.get_all_metrics()
+    compact.commission = 0.01
+    compact.calculate_nav()
+    repriced = Result(positions=sample_result.positions, data=data, initial_capital=10000,
+                      commission=0.01, slippage=0.001, dtype='float32')
+    assert compact.get_all_metrics() == repriced.get_all_metrics()
+    assert compact.trade_statistics() == repriced.trade_statistics()
+    
+    metrics = sample_result.get_all_metrics()
+    statistics = sample_result.trade_statistics()
+    assert sample_result.release_arrays() is sample_result
+    assert sample_result.nbytes == 0
+    assert sample_result.get_all_metrics() == metrics
+    assert sample_result.trade_statistics() == statistics
+    assert Result.compare_results(sample_result).loc['Sharpe Ratio', 'Strategy 1'] == metrics['Sharpe Ratio']
+    with pytest.raises(ValueError):
+        sample_result.nav
+    for accessor in ('positions', 'returns', 'data'):
+        with pytest.raises(ValueError):
+            getattr(sample_result, accessor)
+    with pytest.raises(ValueError):
+        sample_result.trades()
+    
+    # Backtests that do not keep their arrays only carry metrics
+    backtester = Backtester(data, commission=0.001, slippage=0.001, keep_arrays=False)
+    light = backtester.run(ma_crossover(short_window=5, long_window=20))
+    full = Backtester(data, commission=0.001, slippage=0.001).run(ma_crossover(short_window=5, long_window=20))
+    assert light.nbytes == 0
+    assert light.get_all_metrics() == full.get_all_metrics()
+    assert light.trade_statistics() == full.trade_statistics()
+    for accessor in ('nav', 'positions', 'returns'):
+        with pytest.raises(ValueError):
+            getattr(light, accessor)
@@ -1,8 +1,12 @@
 import pytest #type: ignore
 import pandas as pd
 import numpy as np
+from data.loader import load_market_data
 from strategies.strategy_constructor import Strategy, strategy
-from strategies.moving_average import ma_crossover
+from strategies.moving_average import ma_crossover, StreamingMACrossover
+from strategies.RSI import rsi_strategy, StreamingRSI
+from strategies.arima import ARIMAStrategy
+from strategies.linear_trend import LinearTrendStrategy, rolling_slope
 
 @pytest.fixture
 def price_data():
@@ -48,4 +52,107 @@ def test_custom_strategy(price_data):
     strategy = TestStrategy()
     position = strategy.get_position(price_data, 0)
     assert isinstance(position, float)
-    assert -1.0 <= position <= 1.0
\ No newline at end of file
+    assert -1.0 <= position <= 1.0
+
+def test_streaming_strategies_match_batch():
+    """Incremental MA Crossover and RSI must match the rolling-window versions"""
+    data = load_market_data("data/test_BTC_daily.csv")
+    
+    pairs = [
+        (ma_crossover(short_window=5, long_window=20), StreamingMACrossover(short_window=5, long_window=20)),
+        (rsi_strategy(rsi_period=14), StreamingRSI(rsi_period=14))
+    ]
+    for batch_strategy, streaming_strategy in pairs:
+        expected = batch_strategy.generate_positions(data).tolist()
+        
+        streaming_strategy.fit(data)
+        positions = []
+        current_position = 0.0
+        for price in data['close']:
+            current_position = streaming_strategy.update(price, current_position)
+            positions.append(current_position)
+        assert positions == expected
+        
+        # fit() resets the state so that the same object can be replayed bar by bar through get_position
+        streaming_strategy.fit(data)
+        positions = []
+        current_position = 0.0
+        for end in range(1, len(data) + 1):
+            current_position = streaming_strategy.get_position(data.iloc[:end], current_position)
+            positions.append(current_position)
+        assert positions == expected
+        assert streaming_strategy.n_bars == len(data)
+        
+        # Without fit(), a longer history of other data is not mistaken for a continuation
+        other = pd.DataFrame({'close': data['close'].values[::-1]}, index=data.index + pd.Timedelta(days=1))
+        other_expected = batch_strategy.generate_positions(other).tolist()
+        streaming_strategy.fit(data)
+        for end in range(1, 101):
+            streaming_strategy.get_position(data.iloc[:end], 0.0)
+        positions = []
+        current_position = other_expected[99]
+        for end in range(101, len(other) + 1):
+            current_position = streaming_strategy.get_position(other.iloc[:end], current_position)
+            positions.append(current_position)
+        assert positions == other_expected[100:]
+
+def test_arima_incremental_updates():
+    """Incremental ARIMA only refits on schedule and extends the fitted model in between"""
+    dates = pd.date_range(start='2023-01-01', periods=120, freq='D')
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, 120)))
+    data = pd.DataFrame({'close': prices}, index=dates)
+    
+    strategy = ARIMAStrategy(window_size=60, threshold=0.0, refit_interval=10)
+    strategy.best_order = (1, 0, 0)
+    strategy.is_fitted = True
+    
+    refits = 0
+    for i in range(62, len(data) + 1):
+        position = strategy.get_position(data.iloc[:i], 0.0)
+        assert position in (-1.0, 0.0, 1.0)
+        refits += strategy._bars_since_refit == 0
+    
+    assert refits == 6
+    assert not np.isnan(strategy.last_forecast)
+    
+    # A history of the same length that does not extend the integrated bars triggers a refit
+    other = pd.DataFrame({'close': prices[::-1]}, index=dates + pd.Timedelta(days=365))
+    fresh = ARIMAStrategy(window_size=60, threshold=0.0, refit_interval=10)
+    fresh.best_order = (1, 0, 0)
+    fresh.is_fitted = True
+    fresh.get_position(other, 0.0)
+    strategy.get_position(other, 0.0)
+    assert strategy._bars_since_refit == 0
+    assert strategy.last_forecast == pytest.approx(fresh.last_forecast)
+
+def test_arima_order_selection_cache(tmp_path):
+    """Selected ARIMA orders are cached on disk and reused for the same training data"""
+    returns = np.random.default_rng(1).normal(0, 0.01, 150)
+    strategy = ARIMAStrategy(n_jobs=1, order_cache_dir=str(tmp_path))
+    
+    order = strategy.select_order(returns)
+    cache_files = list(tmp_path.glob('*.json'))
+    assert len(order) == 3
+    assert len(cache_files) == 1
+    
+    cache_files[0].write_text('{"order": [2, 0, 2], "bic": 0.0}')
+    assert strategy.select_order(returns) == (2, 0, 2)
+    
+    strategy.select_order(returns[1:])
+    assert len(list(tmp_path.glob('*.json'))) == 2
+
+def test_linear_trend_rolling_slope(price_data):
+    """Closed-form rolling slope matches per-window OLS and the per-bar positions"""
+    values = price_data['close'].values
+    slopes = rolling_slope(values, 20)
+    expected = [np.polyfit(np.arange(20), values[i:i+20], 1)[0] for i in range(len(values) - 19)]
+    assert np.allclose(slopes, expected)
+    
+    strategy = LinearTrendStrategy(window_size=20)
+    strategy.fit(price_data)
+    loop_positions = []
+    current_position = 0.0
+    for i in range(1, len(price_data) + 1):
+        current_position = strategy.get_position(price_data.iloc[:i], current_position)
+        loop_positions.append(current_position)
+    assert strategy.generate_positions(price_data).tolist() == loop_positions
@@ -0,0 +1,85 @@
+import pytest #type: ignore
+import pandas as pd
+import numpy as np
+from main.sweep import ParameterSweep
+from main.batch import ma_crossover_batch
+from main.backtester import Backtester
+from strategies.moving_average import ma_crossover, ma_crossover_position_matrix
+from strategies.RSI import rsi_strategy
+
+@pytest.fixture
+def sweep_data():
+    """Creates simulated daily data for parameter sweeps"""
+    dates = pd.date_range(start='2023-01-01', periods=200, freq='D')
+    prices = np.sin(np.linspace(0, 8*np.pi, 200)) * 10 + 100
+    return pd.DataFrame({'close': prices, 'volume': np.random.randint(1000, 10000, 200)}, index=dates)
+
+def test_sweep_grid(sweep_data):
+    """Grid sweep over a process pool matches individual backtests"""
+    sweep = ParameterSweep(sweep_data, ma_crossover, max_workers=2)
+    progress = []
+    results = sweep.run(param_grid={'short_window': [5, 10], 'long_window': [20, 40]},
+                        progress_callback=lambda done, total: progress.append((done, total)))
+    
+    assert len(results) == 4
+    assert progress[-1] == (4, 4)
+    assert {'short_window', 'long_window', 'Sharpe Ratio', 'Calmar Ratio'}.issubset(results.columns)
+    
+    expected = Backtester(sweep_data).run(ma_crossover(short_window=10, long_window=40)).get_all_metrics()
+    row = results[(results['short_window'] == 10) & (results['long_window'] == 40)].iloc[0]
+    assert row['Total Return (%)'] == pytest.approx(expected['Total Return (%)'])
+
+def test_sweep_random_and_cancel(sweep_data):
+    """Random search draws valid parameters and a sweep can be cancelled"""
+    sweep = ParameterSweep(sweep_data, rsi_strategy, max_workers=1)
+    results = sweep.run(param_distributions={'rsi_period': (5, 20), 'overbought': [70, 80]}, n_iter=5, seed=0)
+    assert len(results) == 5
+    assert results['rsi_period'].between(5, 20).all()
+    
+    cancelled = sweep.run(param_grid={'rsi_period': [5, 10, 15, 20]},
+                          progress_callback=lambda done, total: sweep.cancel())
+    assert len(cancelled) == 1
+    
+    with pytest.raises(ValueError):
+        sweep.grid({'unknown_param': [1, 2]})
+
+def test_ma_crossover_batch(sweep_data):
+    """Batched MA Crossover evaluation matches individual backtests column by column"""
+    batch = ma_crossover_batch(sweep_data, short_windows=[5, 10], long_windows=[20, 40])
+    
+    assert batch.positions.shape == (len(sweep_data), 4)
+    assert batch.nav.shape == (len(sweep_data), 4)
+    
+    for column, (short_window, long_window) in enumerate(batch.params.itertuples(index=False)):
+        result = Backtester(sweep_data).run(ma_crossover(short_window=short_window, long_window=long_window))
+        assert np.array_equal(batch.positions[:, column], result.positions['position'].values)
+        assert np.allclose(batch.nav[:, column], result.nav.values)
+    
+    metrics = batch.get_metrics(essential=True)
+    assert len(metrics) == 4
+    assert metrics['Total Return (%)'].values == pytest.approx(batch.total_returns().values)
+
+def test_ma_crossover_matrix_tiny_spreads():
+    """Spreads far below the price level but above rounding error still produce the reference crossings"""
+    rng = np.random.default_rng(1)
+    prices = 100 + 1e-9 * np.cumsum(rng.normal(size=400))
+    prices[150:220] = prices[149]
+    data = pd.DataFrame({'close': prices}, index=pd.date_range(start='2023-01-01', periods=400, freq='D'))
+    short_windows, long_windows = np.array([3, 5, 10]), np.array([10, 20, 30])
+    
+    matrix = ma_crossover_position_matrix(prices, short_windows, long_windows)
+    assert (np.diff(matrix, axis=0) != 0).sum() > 10
+    for column, (short_window, long_window) in enumerate(zip(short_windows, long_windows)):
+        expected = ma_crossover(short_window=short_window, long_window=long_window).generate_positions(data)
+        np.testing.assert_array_equal(matrix[:, column], expected.values)
+
+def test_ma_crossover_batch_missing_prices(sweep_data):
+    """Missing closes give no signal while they are in a window, as in the per-pair backtests"""
+    data = sweep_data.copy()
+    data.iloc[[30, 31, 90, 150], data.columns.get_loc('close')] = np.nan
+    batch = ma_crossover_batch(data, short_windows=[5, 10], long_windows=[20, 40])
+    
+    for column, (short_window, long_window) in enumerate(batch.params.itertuples(index=False)):
+        result = Backtester(data).run(ma_crossover(short_window=short_window, long_window=long_window))
+        np.testing.assert_array_equal(batch.positions[:, column], result.positions['position'].values)
+        np.testing.assert_allclose(batch.nav[:, column], result.nav.values)